@@ -2,13 +2,35 @@
 """
 Script to assign peer reviewers when the deadline arrives.
 This script is triggered by the GitHub Actions workflow at the deadline.
+
+Every student gets exactly k reviewers and reviews exactly k submissions. The
+roster is shuffled and k distinct shifts are drawn, each student being
+reviewed by the students that many places after them (wrapping around), which
+takes O(n*k) time and memory. Pass --seed to make the assignment
+reproducible and --exclusions with a JSON list of [student, student] pairs
+that must not review each other. --similarity reads the near-duplicate pairs
+found by similarity.py and flags them in reviews/assignments.json. They are
+kept from reviewing each other as far as possible: if they cannot all be
+kept apart, the most similar pairs are, and the others are only flagged
+instead of the assignment failing.
+
+Review issues are created concurrently within the API rate limits, and every
+created issue is recorded in reviews/issue_journal.jsonl. If issue creation
+fails partway, rerun with --resume: the saved reviews/assignments.json is
+reused and only the issues missing from the journal are created.
 """
 
+import argparse
 import json
 import os
 import random
 import datetime
-from github import Github
+
+from github_api import GitHubClient
+from review_issues import ISSUE_JOURNAL, ISSUE_WORKERS, IssueJournal, create_issues
+
+# Times the roster is reshuffled when the exclusions rule out too many shifts
+MAX_SHUFFLES = 100
 
 def load_review_pool():
     """Load the current review pool"""
@@ -19,47 +41,154 @@ def load_review_pool():
         print("Error: review_pool.json not found or invalid")
         return None
 
-def assign_reviewers(students, num_reviewers=3):
+def forbidden_shifts(position, exclusions, n):
+    """
+    Return the shifts that would pair an excluded student with their reviewer.
+    
+    Args:
+        position: Mapping of student name to roster position
+        exclusions: Pairs of students that must not review each other
+        n: Number of students
+    """
+    forbidden = set()
+    for a, b in exclusions:
+        if a in position and b in position and a != b:
+            forbidden.add((position[a] - position[b]) % n)
+            forbidden.add((position[b] - position[a]) % n)
+    return forbidden
+
+def choose_shifts(n, k, forbidden, rng):
+    """
+    Choose k distinct shifts in 1..n-1 that are not forbidden.
+    
+    Returns:
+        list: The shifts, or None if fewer than k are allowed
+    """
+    allowed = n - 1 - len(forbidden)
+    if allowed < k:
+        return None
+    if allowed >= 2 * k:
+        # Rejection sampling draws O(k) shifts when most are allowed
+        shifts = []
+        chosen = set()
+        while len(shifts) < k:
+            shift = rng.randrange(1, n)
+            if shift not in forbidden and shift not in chosen:
+                shifts.append(shift)
+                chosen.add(shift)
+        return shifts
+    return rng.sample([shift for shift in range(1, n) if shift not in forbidden], k)
+
+def assign_reviewers(students, num_reviewers=3, seed=None, exclusions=()):
     """
     Assign reviewers to each student
     
+    Each student is assigned exactly num_reviewers reviewers and reviews
+    exactly num_reviewers submissions, in O(n * num_reviewers) time.
+    
     Args:
         students: List of student names
         num_reviewers: Number of reviewers to assign per student
+        seed: Seed of the random assignment, None for a different one each run
+        exclusions: Pairs of students that must not review each other
     
     Returns:
         Dictionary mapping each student to their assigned reviewers
+    
+    Raises:
+        ValueError: If the exclusions leave no balanced assignment
+    """
+    roster = list(dict.fromkeys(students))
+    n = len(roster)
+    if n == 0:
+        return {}
+    
+    if n < num_reviewers + 1:
+        print(f"Warning: Not enough students ({n}) to assign {num_reviewers} reviewers")
+        num_reviewers = max(min(num_reviewers, n - 1), 0)
+    
+    rng = random.Random(seed)
+    exclusions = [tuple(pair) for pair in exclusions]
+    for _ in range(MAX_SHUFFLES):
+        rng.shuffle(roster)
+        position = {student: i for i, student in enumerate(roster)}
+        shifts = choose_shifts(n, num_reviewers, forbidden_shifts(position, exclusions, n), rng)
+        if shifts is not None:
+            break
+    else:
+        raise ValueError(f"Could not assign {num_reviewers} reviewers per student without an excluded pair")
+    
+    # Keep the students in their original order in the result
+    return {
+        student: [roster[(position[student] + shift) % n] for shift in shifts]
+        for student in dict.fromkeys(students)
+    }
+
+def assign_reviewers_avoiding(students, num_reviewers=3, seed=None, exclusions=(), avoid=()):
+    """
+    Assign reviewers, keeping as many of the pairs to avoid apart as possible.
+    
+    The exclusions are always kept. The pairs to avoid, most important
+    first, are excluded as well if a balanced assignment allows it;
+    otherwise the longest prefix of them that still allows one is found by
+    bisection and only those are excluded.
+    
+    Args:
+        students: List of student names
+        num_reviewers: Number of reviewers to assign per student
+        seed: Seed of the random assignment
+        exclusions: Pairs of students that must not review each other
+        avoid: Pairs of students that should not review each other
+    
+    Returns:
+        tuple: (assignments, number of pairs of avoid that were excluded)
+    
+    Raises:
+        ValueError: If the exclusions alone leave no balanced assignment
+    """
+    exclusions = list(exclusions)
+    avoid = list(avoid)
+    try:
+        return assign_reviewers(students, num_reviewers, seed, exclusions + avoid), len(avoid)
+    except ValueError:
+        if not avoid:
+            raise
+    
+    best = (assign_reviewers(students, num_reviewers, seed, exclusions), 0)
+    low, high = 1, len(avoid) - 1
+    while low <= high:
+        middle = (low + high) // 2
+        try:
+            best = (assign_reviewers(students, num_reviewers, seed, exclusions + avoid[:middle]), middle)
+            low = middle + 1
+        except ValueError:
+            high = middle - 1
+    return best
+
+def reviews_each_other(assignments, a, b):
+    """Return whether either of two students reviews the other"""
+    return a in assignments.get(b, ()) or b in assignments.get(a, ())
+
+def create_review_issues(assignments, workers=ISSUE_WORKERS, journal_path=ISSUE_JOURNAL):
+    """
+    Create GitHub issues for each review assignment
+    
+    Issues are created concurrently and recorded in a journal, so rerunning
+    after a failure only creates the missing ones.
+    
+    Args:
+        assignments: Dictionary mapping each student to their reviewers
+        workers: Number of issues created concurrently
+        journal_path: Journal of the issues already created
     """
-    assignments = {}
-    
-    if len(students) < num_reviewers + 1:
-        print(f"Warning: Not enough students ({len(students)}) to assign {num_reviewers} reviewers")
-        num_reviewers = min(num_reviewers, len(students) - 1)
-    
-    for student in students:
-        # Create a list of potential reviewers (everyone except the student)
-        potential_reviewers = [s for s in students if s != student]
-        
-        # Randomly select reviewers
-        if len(potential_reviewers) >= num_reviewers:
-            reviewers = random.sample(potential_reviewers, num_reviewers)
-        else:
-            reviewers = potential_reviewers
-        
-        assignments[student] = reviewers
-    
-    return assignments
-
-def create_review_issues(assignments):
-    """Create GitHub issues for each review assignment"""
     token = os.environ.get('GITHUB_TOKEN')
     if not token:
         print("Error: GITHUB_TOKEN not set")
         return False
     
-    g = Github(token)
-    repo = g.get_repo(os.environ.get('GITHUB_REPOSITORY'))
+    client = GitHubClient(token, os.environ.get('GITHUB_REPOSITORY'))
     
+    issues = []
     for student, reviewers in assignments.items():
         # Create an issue for each reviewer
         for reviewer in reviewers:
@@ -84,15 +213,20 @@ Please complete your review within one week.
 - Highlight good practices you observed
             """
             
-            repo.create_issue(
-                title=issue_title,
-                body=issue_body,
-                assignees=[reviewer]
-            )
+            issues.append({
+                "key": f"{reviewer}->{student}",
+                "title": issue_title,
+                "body": issue_body,
+                "assignees": [reviewer],
+            })
     
-    return True
+    summary = create_issues(issues, client, IssueJournal(journal_path), workers)
+    print(f"Created {summary['created']} review issues, {summary['skipped']} already existed")
+    for key, error in summary["failed"]:
+        print(f"Error: could not create issue {key}: {error}")
+    return not summary["failed"]
 
-def save_assignments(assignments):
+def save_assignments(assignments, similar_submissions=()):
     """Save the review assignments to a JSON file"""
     # Create reviews directory if it doesn't exist
     os.makedirs('reviews', exist_ok=True)
@@ -104,12 +238,60 @@ def save_assignments(assignments):
             "description": "Peer review assignments"
         }
     }
+    if similar_submissions:
+        assignment_data["similar_submissions"] = list(similar_submissions)
     
     with open('reviews/assignments.json', 'w') as f:
         json.dump(assignment_data, f, indent=2)
 
+def load_assignments():
+    """Load the saved review assignments"""
+    try:
+        with open('reviews/assignments.json', 'r') as f:
+            return json.load(f)["assignments"]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        print("Error: reviews/assignments.json not found or invalid")
+        return None
+
+def load_exclusions(path):
+    """Load a JSON list of [student, student] pairs"""
+    if not path:
+        return []
+    with open(path, 'r') as f:
+        return [tuple(pair) for pair in json.load(f)]
+
+def load_similar_pairs(path, students):
+    """
+    Load the similar pairs found by similarity.py between students in the pool
+    
+    Returns:
+        list: {"students": [a, b], "similarity"} entries
+    """
+    if not path:
+        return []
+    with open(path, 'r') as f:
+        pairs = json.load(f)["pairs"]
+    pool = set(students)
+    return [pair for pair in pairs if pair["students"][0] in pool and pair["students"][1] in pool]
+
 def main():
     """Main function to assign reviewers"""
+    parser = argparse.ArgumentParser(description="Assign peer reviewers to every student in the review pool")
+    parser.add_argument("--reviewers", type=int, default=3, help="reviewers per student")
+    parser.add_argument("--seed", type=int, help="seed for a reproducible assignment")
+    parser.add_argument("--exclusions", help="JSON file of student pairs that must not review each other")
+    parser.add_argument("--similarity", help="similar submissions found by similarity.py, kept apart where possible and flagged")
+    parser.add_argument("--resume", action="store_true",
+                        help="create the missing issues of the saved assignments instead of assigning again")
+    parser.add_argument("--workers", type=int, default=ISSUE_WORKERS, help="issues created concurrently")
+    args = parser.parse_args()
+    
+    if args.resume:
+        assignments = load_assignments()
+        if assignments is None:
+            return False
+        return create_review_issues(assignments, workers=args.workers)
+    
     review_pool = load_review_pool()
     if not review_pool:
         return False
@@ -119,16 +301,32 @@ def main():
         print("No students in review pool")
         return False
     
+    # Near-identical submissions should not review each other; the most
+    # similar pairs come first, and are kept apart first
+    similar = load_similar_pairs(args.similarity, students)
+    similar.sort(key=lambda pair: -pair["similarity"])
+    for pair in similar:
+        print(f"Flagged: {pair['students'][0]} and {pair['students'][1]} are {pair['similarity']:.0%} similar")
+    
     # Assign reviewers
-    assignments = assign_reviewers(students)
+    try:
+        assignments, kept_apart = assign_reviewers_avoiding(
+            students, args.reviewers, seed=args.seed, exclusions=load_exclusions(args.exclusions),
+            avoid=[tuple(pair["students"]) for pair in similar],
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return False
+    if kept_apart < len(similar):
+        print(f"Warning: only {kept_apart} of {len(similar)} similar pairs could be kept from reviewing each other")
+    for pair in similar:
+        pair["reviews_each_other"] = reviews_each_other(assignments, *pair["students"])
     
     # Save assignments
-    save_assignments(assignments)
+    save_assignments(assignments, similar)
     
     # Create GitHub issues
-    create_review_issues(assignments)
-    
-    return True
+    return create_review_issues(assignments, workers=args.workers)
 
 if __name__ == "__main__":
     success = main()
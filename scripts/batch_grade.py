@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Script to grade every student branch at once.
+
+Each dev-* branch is checked out into its own git worktree and the test suite
+of this checkout is run against it, with a bounded number of branches graded
+concurrently. Branches whose sources, tests and toolchain are unchanged since
+a previous run reuse the cached verdict instead of being tested again. The results are written to one consolidated file that
+update_review_pool.py can apply to review_pool.json in a single commit:
+
+    python scripts/batch_grade.py --workers 8
+    python scripts/update_review_pool.py --results grading_results.json
+
+With the benchmarks included a branch can take up to DEFAULT_BRANCH_TIMEOUT,
+so a whole cohort does not fit in one CI job. --shard INDEX/COUNT grades
+only every COUNT-th student (in name order) starting from INDEX, so COUNT
+jobs can grade the cohort side by side, and update_review_pool.py applies
+all of their results files at once:
+
+    python scripts/batch_grade.py --shard 0/8 --output grading_results-0.json
+    python scripts/update_review_pool.py --results grading_results-*.json
+
+Each shard then has its own .grading_cache; merge_grading_caches.py merges
+them so the next run reuses the verdicts and benchmarks of every shard.
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TESTS_DIR = os.path.join(REPO_ROOT, "tests")
+
+sys.path.insert(0, TESTS_DIR)
+from harness.results_cache import ResultsCache, selection_key, verdict_key  # noqa: E402
+
+# Results cache and benchmark database shared by every graded branch
+RESULTS_CACHE = os.environ.get("LL_RESULTS_CACHE", os.path.join(REPO_ROOT, ".grading_cache", "results.json"))
+RESULTS_DB = os.environ.get("LL_RESULTS_DB", os.path.join(REPO_ROOT, ".grading_cache", "benchmarks.sqlite"))
+
+DEFAULT_RESULTS_FILE = "grading_results.json"
+
+# Seconds allowed for grading one branch
+DEFAULT_BRANCH_TIMEOUT = 900
+
+# CPU this worker process pins its benchmarks to, set by _init_worker()
+_WORKER_CPU = None
+
+
+def git(*args, cwd=REPO_ROOT):
+    """Run a git command and return its standard output"""
+    result = subprocess.run(["git"] + list(args), cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def student_from_branch(branch):
+    """Extract the student name from a branch name (dev-student-name)"""
+    match = re.match(r'dev-(.*)', branch)
+    if match:
+        return match.group(1)
+    return None
+
+
+def list_student_branches():
+    """
+    List every student branch with the commit to grade.
+
+    Remote-tracking branches (origin/dev-*) take precedence over local
+    branches of the same name, since they hold the latest push.
+
+    Returns:
+        dict: Mapping of student name to {"branch", "ref", "commit"}
+    """
+    output = git(
+        "for-each-ref",
+        "--format=%(refname) %(objectname)",
+        "refs/heads/dev-*",
+        "refs/remotes/origin/dev-*",
+    )
+
+    branches = {}
+    for line in output.splitlines():
+        ref, commit = line.split()
+        branch = ref.rsplit("/", 1)[-1] if ref.startswith("refs/remotes/") else ref[len("refs/heads/"):]
+        student = student_from_branch(branch)
+        if not student:
+            continue
+        if student in branches and not ref.startswith("refs/remotes/"):
+            continue
+        branches[student] = {"branch": branch, "ref": ref, "commit": commit}
+    return branches
+
+
+def parse_junit(path):
+    """
+    Read per-test outcomes from a pytest JUnit XML report.
+
+    Returns:
+        dict: Mapping of test name to "passed", "failed", "error" or "skipped"
+    """
+    outcomes = {}
+    try:
+        tree = ET.parse(path)
+    except (FileNotFoundError, ET.ParseError):
+        return outcomes
+
+    for case in tree.iter("testcase"):
+        outcome = "passed"
+        for child in case:
+            if child.tag in ("failure", "error", "skipped"):
+                outcome = "failed" if child.tag == "failure" else child.tag
+        outcomes[case.get("name")] = outcome
+    return outcomes
+
+
+def worker_cpus(workers):
+    """
+    Return the CPUs the grading workers pin their benchmarks to.
+
+    Every test session would otherwise pin its benchmarks to the same CPU
+    (see harness.bench.default_cpu), so concurrent branches would time
+    their benchmarks one after the other on it. Each worker gets its own
+    CPU, starting from the last one, which usually handles fewer
+    interrupts.
+
+    Returns:
+        list: One CPU per worker, or an empty list to leave benchmarks
+        unpinned when there are fewer CPUs than workers
+    """
+    if not hasattr(os, "sched_getaffinity"):
+        return []
+    cpus = sorted(os.sched_getaffinity(0), reverse=True)
+    if len(cpus) < workers:
+        return []
+    return cpus[:workers]
+
+
+def _init_worker(counter, cpus):
+    """Give this worker process the next CPU of cpus"""
+    global _WORKER_CPU
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    _WORKER_CPU = cpus[index % len(cpus)] if cpus else None
+
+
+def grade_branch(student, info, work_root, timeout, pytest_args, selection=selection_key()):
+    """
+    Grade one branch in its own worktree.
+
+    Args:
+        student: Student name
+        info: Branch information from list_student_branches()
+        work_root: Directory holding the worktrees
+        timeout: Seconds allowed for the test run
+        pytest_args: Extra arguments for pytest
+        selection: selection_key() matching the -m/-k options in
+            pytest_args, under which the verdict is cached
+
+    Returns:
+        dict: Grading result for the student
+    """
+    worktree = os.path.join(work_root, student)
+    result = {
+        "branch": info["branch"],
+        "commit": info["commit"],
+        "passed": False,
+        "returncode": None,
+        "duration": 0.0,
+        "cached": False,
+        "tests": {},
+    }
+
+    start = time.monotonic()
+    try:
+        git("worktree", "add", "--detach", "--force", worktree, info["commit"])
+    except RuntimeError as e:
+        result["error"] = str(e)
+        return result
+
+    cached = ResultsCache(RESULTS_CACHE).verdict(verdict_key(worktree, selection))
+    if cached is not None:
+        result.update(passed=cached["passed"], returncode=0 if cached["passed"] else 1,
+                      cached=True, tests=cached["tests"], metrics=cached.get("metrics", {}))
+        git("worktree", "remove", "--force", worktree)
+        result["duration"] = round(time.monotonic() - start, 3)
+        return result
+
+    junit = os.path.join(worktree, ".junit.xml")
+    env = dict(os.environ)
+    env["LL_RESULTS_CACHE"] = RESULTS_CACHE
+    # Benchmarks of every branch go to one database for cohort comparisons;
+    # worktrees are detached, so name the branch explicitly
+    env["LL_RESULTS_DB"] = RESULTS_DB
+    env["LL_BRANCH"] = info["branch"]
+    # Branches are already graded in parallel, so each test session builds
+    # and runs on a single worker
+    env["LL_WORKERS"] = "1"
+    # Pin the benchmarks to this worker's own CPU, unless set explicitly
+    if "LL_BENCH_CPU" not in os.environ:
+        env["LL_BENCH_CPU"] = "none" if _WORKER_CPU is None else str(_WORKER_CPU)
+    # Share one object cache between all branches; objects are keyed by
+    # content, so only identical sources (such as the harness) are reused
+    env.setdefault("LL_BUILD_CACHE", os.path.join(REPO_ROOT, ".build_cache"))
+    cmd = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", f"--junitxml={junit}", TESTS_DIR,
+           "--ignore", os.path.join(TESTS_DIR, "scripts"), "--ignore", os.path.join(TESTS_DIR, "unit")]
+    try:
+        run = subprocess.run(cmd + list(pytest_args), cwd=worktree, env=env,
+                             capture_output=True, text=True, timeout=timeout)
+        result["returncode"] = run.returncode
+        result["passed"] = run.returncode == 0
+        result["tests"] = parse_junit(junit)
+        verdict = ResultsCache(RESULTS_CACHE).verdict(verdict_key(worktree, selection))
+        if verdict is not None:
+            result["metrics"] = verdict.get("metrics", {})
+    except subprocess.TimeoutExpired:
+        result["error"] = f"Timed out after {timeout} seconds"
+    finally:
+        result["duration"] = round(time.monotonic() - start, 3)
+        try:
+            git("worktree", "remove", "--force", worktree)
+        except RuntimeError:
+            shutil.rmtree(worktree, ignore_errors=True)
+
+    return result
+
+
+def grade_all(branches, workers, timeout=DEFAULT_BRANCH_TIMEOUT, pytest_args=(), selection=selection_key()):
+    """
+    Grade every branch, at most `workers` at a time.
+
+    Returns:
+        dict: Mapping of student name to grading result
+    """
+    results = {}
+    work_root = tempfile.mkdtemp(prefix="batch-grade-")
+    try:
+        counter = multiprocessing.Value("i", 0)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(counter, worker_cpus(workers))) as pool:
+            futures = {
+                pool.submit(grade_branch, student, info, work_root, timeout, pytest_args, selection): student
+                for student, info in branches.items()
+            }
+            for future in as_completed(futures):
+                student = futures[future]
+                results[student] = future.result()
+                status = "passed" if results[student]["passed"] else "failed"
+                if results[student]["cached"]:
+                    status += ", cached"
+                print(f"{student}: {status} ({results[student]['duration']}s)")
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
+        subprocess.run(["git", "worktree", "prune"], cwd=REPO_ROOT)
+    return results
+
+
+def parse_shard(value):
+    """Parse an INDEX/COUNT shard argument into (index, count)"""
+    match = re.fullmatch(r"(\d+)/(\d+)", value)
+    if not match or not 0 <= int(match.group(1)) < int(match.group(2)):
+        raise argparse.ArgumentTypeError(f"invalid shard {value!r}, expected INDEX/COUNT with 0 <= INDEX < COUNT")
+    return int(match.group(1)), int(match.group(2))
+
+
+def select_shard(branches, index, count):
+    """Return the branches of shard index out of count, by student name"""
+    students = sorted(branches)[index::count]
+    return {student: branches[student] for student in students}
+
+
+def save_results(results, path=DEFAULT_RESULTS_FILE):
+    """Write the consolidated grading results"""
+    data = {
+        "results": dict(sorted(results.items())),
+        "generated_at": datetime.datetime.now().isoformat(),
+        "metadata": {
+            "description": "Batch grading results for every dev-* branch",
+        }
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def main():
+    """Main function to grade all student branches"""
+    parser = argparse.ArgumentParser(description="Grade every dev-* branch")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of branches graded concurrently")
+    parser.add_argument("--output", default=DEFAULT_RESULTS_FILE, help="results file to write")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_BRANCH_TIMEOUT,
+                        help="seconds allowed per branch")
+    parser.add_argument("--skip-benchmarks", action="store_true",
+                        help="deselect the timing benchmarks")
+    parser.add_argument("--shard", type=parse_shard, metavar="INDEX/COUNT",
+                        help="only grade every COUNT-th student starting from INDEX")
+    parser.add_argument("students", nargs="*", help="only grade these students")
+    args = parser.parse_args()
+
+    try:
+        branches = list_student_branches()
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        return False
+
+    if args.students:
+        branches = {s: info for s, info in branches.items() if s in args.students}
+    if not branches:
+        print("No student branches found")
+        return False
+    if args.shard:
+        branches = select_shard(branches, *args.shard)
+        if not branches:
+            # More shards than students; an empty shard is not an error
+            print(f"No student branches in shard {args.shard[0]}/{args.shard[1]}")
+            save_results({}, args.output)
+            return True
+
+    pytest_args = ["-m", "not benchmark"] if args.skip_benchmarks else []
+    selection = selection_key("not benchmark" if args.skip_benchmarks else "")
+    print(f"Grading {len(branches)} branches with {args.workers} workers")
+    results = grade_all(branches, max(args.workers, 1), args.timeout, pytest_args, selection)
+    save_results(results, args.output)
+
+    passed = sum(1 for r in results.values() if r["passed"])
+    print(f"{passed} of {len(results)} students passed; results written to {args.output}")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    if not success:
+        exit(1)
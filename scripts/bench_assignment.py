@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Script to benchmark the reviewer assignment.
+
+Times assign_reviewers.assign_reviewers() against the previous assignment,
+which drew each student's reviewers with random.sample() from a list of every
+other student, over a range of cohort sizes, and reports how evenly the
+reviews are spread:
+
+    python scripts/bench_assignment.py
+    python scripts/bench_assignment.py --sizes 1000 10000 100000 --skip-baseline-above 20000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import Counter
+
+from assign_reviewers import assign_reviewers
+
+
+def baseline_assign_reviewers(students, num_reviewers=3):
+    """The previous assignment: independent random samples, O(n^2)"""
+    assignments = {}
+    for student in students:
+        potential_reviewers = [s for s in students if s != student]
+        assignments[student] = random.sample(potential_reviewers, min(num_reviewers, len(potential_reviewers)))
+    return assignments
+
+
+def review_load(assignments, students):
+    """Return the fewest and most reviews any student has to write"""
+    load = Counter(reviewer for reviewers in assignments.values() for reviewer in reviewers)
+    counts = [load.get(student, 0) for student in students]
+    return min(counts), max(counts)
+
+
+def measure(function, students, reviewers, repetitions):
+    """Return the best time of repeated calls and the last assignment"""
+    best = None
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        assignments = function(students, reviewers)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, assignments
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the reviewer assignment")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="cohort sizes")
+    parser.add_argument("--reviewers", type=int, default=3, help="reviewers per student")
+    parser.add_argument("--repetitions", type=int, default=3, help="timed calls per size, the best is kept")
+    parser.add_argument("--skip-baseline-above", type=int, default=10000,
+                        help="do not time the previous assignment for larger cohorts")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+
+    report = []
+    for size in args.sizes:
+        students = [f"student-{i}" for i in range(size)]
+        entry = {"size": size}
+        implementations = [("balanced", lambda s, k: assign_reviewers(s, k, seed=size))]
+        if size <= args.skip_baseline_above:
+            implementations.append(("baseline", baseline_assign_reviewers))
+        for name, function in implementations:
+            seconds, assignments = measure(function, students, args.reviewers, args.repetitions)
+            low, high = review_load(assignments, students)
+            entry[name] = {"seconds": seconds, "min_reviews": low, "max_reviews": high}
+        report.append(entry)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"{'students':>9}  {'balanced':>10}  {'reviews':>7}  {'baseline':>10}  {'reviews':>7}  {'speedup':>8}")
+    for entry in report:
+        balanced = entry["balanced"]
+        baseline = entry.get("baseline")
+        row = f"{entry['size']:>9}  {balanced['seconds']:>9.4f}s  "
+        row += f"{balanced['min_reviews']:>3}-{balanced['max_reviews']:<3}  "
+        if baseline:
+            row += f"{baseline['seconds']:>9.4f}s  {baseline['min_reviews']:>3}-{baseline['max_reviews']:<3}  "
+            row += f"{baseline['seconds'] / balanced['seconds']:>7.1f}x"
+        else:
+            row += f"{'skipped':>10}"
+        print(row.rstrip())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
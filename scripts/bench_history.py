@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Script to query the benchmark results database.
+
+Every benchmark run by the test suite is stored in a SQLite database (see
+tests/harness/results_db.py). This script reports on it:
+
+    python scripts/bench_history.py trend dev-alice --op sort
+    python scripts/bench_history.py cohort --op sort --size 100000
+    python scripts/bench_history.py regressions [dev-alice]
+    python scripts/bench_history.py list
+
+Use --db to read a database other than .grading_cache/benchmarks.sqlite, for
+example the one shared by batch_grade.py, and --json for machine-readable
+output.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+from harness.results_db import RESULTS_DB, ResultsDB  # noqa: E402
+
+
+def format_ns(ns):
+    """Format a duration in nanoseconds with a readable unit"""
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f}{unit}"
+    return f"{ns:.0f}ns"
+
+
+def format_time(timestamp):
+    return datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+
+
+def print_table(headers, rows):
+    """Print rows as aligned columns"""
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *rows)]
+    for row in [headers] + rows:
+        print("  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)).rstrip())
+
+
+def trend(db, args):
+    rows = db.history(args.branch, args.op, args.size, args.profile)
+    if args.json:
+        return [dict(row) for row in rows]
+    print_table(
+        ["recorded", "source", "op", "size", "profile", "median", "mad", "flag"],
+        [
+            [
+                format_time(row["recorded_at"]),
+                row["source_hash"][:10],
+                row["op"],
+                row["size"],
+                row["profile"],
+                format_ns(row["median_ns"]),
+                format_ns(row["mad_ns"]),
+                f"REGRESSION x{row['regression']:.1f}" if row["regression"] else "",
+            ]
+            for row in rows
+        ],
+    )
+    return None
+
+
+def cohort(db, args):
+    measurements = [
+        (op, size, profile)
+        for op, size, profile in db.measurements()
+        if (args.op is None or op == args.op)
+        and (args.size is None or size == args.size)
+        and (args.profile is None or profile == args.profile)
+    ]
+    summaries = {}
+    for op, size, profile in measurements:
+        summaries[f"{op}@{size}/{profile}"] = db.cohort(op, size, profile)
+    if args.json:
+        return summaries
+
+    rows = []
+    for name, summary in summaries.items():
+        percentiles = summary["percentiles"]
+        rows.append(
+            [name, summary["branches"]]
+            + [format_ns(percentiles[p]) for p in sorted(percentiles)]
+            + [summary["ranking"][0][0]]
+        )
+    print_table(["measurement", "branches", "p10", "p25", "p50", "p75", "p90", "fastest"], rows)
+    return None
+
+
+def regressions(db, args):
+    rows = db.regressions(args.branch)
+    if args.json:
+        return [dict(row) for row in rows]
+    print_table(
+        ["recorded", "branch", "op", "size", "profile", "median", "slowdown"],
+        [
+            [
+                format_time(row["recorded_at"]),
+                row["branch"],
+                row["op"],
+                row["size"],
+                row["profile"],
+                format_ns(row["median_ns"]),
+                f"x{row['regression']:.1f}",
+            ]
+            for row in rows
+        ],
+    )
+    return None
+
+
+def list_measurements(db, args):
+    measurements = db.measurements()
+    if args.json:
+        return [{"op": op, "size": size, "profile": profile} for op, size, profile in measurements]
+    print_table(["op", "size", "profile"], [list(m) for m in measurements])
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the benchmark results database")
+    parser.add_argument("--db", default=RESULTS_DB, help="Path of the database")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    trend_parser = commands.add_parser("trend", help="Results of one branch over time")
+    trend_parser.add_argument("branch")
+    cohort_parser = commands.add_parser("cohort", help="Percentiles of every branch's latest result")
+    for command in (trend_parser, cohort_parser):
+        command.add_argument("--op")
+        command.add_argument("--size", type=int)
+        command.add_argument("--profile")
+
+    regressions_parser = commands.add_parser("regressions", help="Results flagged as regressions")
+    regressions_parser.add_argument("branch", nargs="?")
+
+    commands.add_parser("list", help="Every measurement in the database")
+
+    args = parser.parse_args()
+    if not os.path.exists(args.db):
+        print(f"No benchmark database at {args.db}")
+        return 1
+
+    db = ResultsDB(args.db)
+    handlers = {
+        "trend": trend,
+        "cohort": cohort,
+        "regressions": regressions,
+        "list": list_measurements,
+    }
+    output = handlers[args.command](db, args)
+    db.close()
+    if output is not None:
+        print(json.dumps(output, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
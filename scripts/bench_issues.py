@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Script to benchmark review issue creation against a local fake GitHub API.
+
+Creates the issues of a balanced assignment through fake_github.py, with a
+simulated round-trip latency, for several numbers of workers, and reports
+the throughput. A small quota exercises the rate limit handling, and a rerun
+with the same journal checks that no issue is created twice:
+
+    python scripts/bench_issues.py --students 300 --workers 1 4 8 16
+    python scripts/bench_issues.py --students 50 --quota 100 --window 2
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from assign_reviewers import assign_reviewers
+from fake_github import FakeGitHub
+from github_api import GitHubClient
+from review_issues import IssueJournal, create_issues
+
+
+def make_issues(assignments):
+    return [
+        {
+            "key": f"{reviewer}->{student}",
+            "title": f"Review Assignment: {reviewer} to review {student}",
+            "body": f"@{reviewer} has been assigned to review @{student}'s submission.",
+            "assignees": [reviewer],
+        }
+        for student, reviewers in assignments.items()
+        for reviewer in reviewers
+    ]
+
+
+def run(issues, workers, args):
+    """Create every issue on a fresh server; return the measurement"""
+    with FakeGitHub(quota=args.quota, window=args.window, latency=args.latency) as server, \
+            tempfile.TemporaryDirectory() as scratch:
+        client = GitHubClient("token", "course/linked-lists", api_url=server.url)
+        journal_path = os.path.join(scratch, "journal.jsonl")
+
+        start = time.perf_counter()
+        summary = create_issues(issues, client, IssueJournal(journal_path), workers)
+        seconds = time.perf_counter() - start
+
+        # A rerun must find every issue in the journal
+        rerun = create_issues(issues, client, IssueJournal(journal_path), workers)
+        return {
+            "workers": workers,
+            "seconds": seconds,
+            "issues_per_second": summary["created"] / seconds if seconds else 0.0,
+            "created": summary["created"],
+            "failed": len(summary["failed"]),
+            "server_issues": len(server.issues),
+            "rate_limited": server.rate_limited,
+            "rate_limit_wait": client.rate_limiter.waited,
+            "rerun_created": rerun["created"],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark review issue creation against a fake GitHub API")
+    parser.add_argument("--students", type=int, default=300)
+    parser.add_argument("--reviewers", type=int, default=3, help="reviewers per student")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated seconds per request")
+    parser.add_argument("--quota", type=int, default=5000, help="requests per rate limit window")
+    parser.add_argument("--window", type=float, default=3600, help="rate limit window in seconds")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+
+    students = [f"student-{i}" for i in range(args.students)]
+    issues = make_issues(assign_reviewers(students, args.reviewers, seed=0))
+    report = [run(issues, workers, args) for workers in args.workers]
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{len(issues)} issues, {args.latency * 1000:.0f}ms per request")
+        print(f"{'workers':>7}  {'seconds':>8}  {'issues/s':>8}  {'created':>7}  {'limited':>7}  {'waited':>7}")
+        for entry in report:
+            print(f"{entry['workers']:>7}  {entry['seconds']:>8.2f}  {entry['issues_per_second']:>8.1f}  "
+                  f"{entry['created']:>7}  {entry['rate_limited']:>7}  {entry['rate_limit_wait']:>6.1f}s")
+
+    duplicated = [entry for entry in report if entry["server_issues"] != len(issues) or entry["rerun_created"]]
+    if duplicated:
+        print("Error: issues were missing or created twice")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
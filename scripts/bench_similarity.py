@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Script to benchmark the near-duplicate search.
+
+Builds synthetic cohorts of independent C++ sources, plants a copy of some of
+them with the identifiers renamed and the formatting changed, and times
+similarity.find_similar_pairs() against comparing the signatures of every
+pair, reporting how many of the planted copies each one finds:
+
+    python scripts/bench_similarity.py
+    python scripts/bench_similarity.py --sizes 100 1000 5000 --skip-pairwise-above 2000
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+
+from similarity import (
+    DEFAULT_THRESHOLD,
+    SignatureCache,
+    estimate_similarity,
+    find_similar_pairs,
+)
+
+OPERATORS = ["+", "-", "*", "/", "%", "<", ">", "<=", ">=", "==", "!=", "&&", "||", "&", "|", "^"]
+
+
+def random_expression(rng, names, depth=2):
+    """Return a random expression over names and small constants"""
+    if depth == 0 or rng.random() < 0.3:
+        return rng.choice(names + [str(rng.randrange(100)), "nullptr", f"{rng.choice(names)}->next"])
+    left = random_expression(rng, names, depth - 1)
+    right = random_expression(rng, names, depth - 1)
+    return f"({left} {rng.choice(OPERATORS)} {right})"
+
+
+def random_statement(rng, names, depth=2):
+    """Return a random statement, possibly with nested blocks"""
+    kind = rng.randrange(6 if depth else 3)
+    name = rng.choice(names)
+    if kind == 0:
+        return f"{name} = {random_expression(rng, names)};"
+    if kind == 1:
+        return f"return {random_expression(rng, names)};"
+    if kind == 2:
+        return f"std::cout << \"{name}\" << {random_expression(rng, names)} << std::endl;"
+    body = " ".join(random_statement(rng, names, depth - 1) for _ in range(rng.randrange(1, 4)))
+    if kind == 3:
+        return f"if {random_expression(rng, names)} {{ {body} }}"
+    if kind == 4:
+        return f"while {random_expression(rng, names)} {{ {body} }}"
+    return f"for (int {name} = 0; {name} < {rng.randrange(100)}; {name}++) {{ {body} }}"
+
+
+def random_source(rng, functions=25, statements=6):
+    """Return a random C++ source of several functions"""
+    names = [f"v{rng.randrange(1000)}" for _ in range(6)]
+    lines = []
+    for f in range(functions):
+        lines.append(f"void LinkedList::f{f}(int {rng.choice(names)}) {{")
+        for _ in range(statements):
+            lines.append("    " + random_statement(rng, names))
+        lines.append("}")
+    return "\n".join(lines)
+
+
+def disguise(source, rng):
+    """Return a copy of a source with renamed identifiers, new comments and different indentation"""
+    source = re.sub(r"\bv(\d+)\b", r"renamed\1", source)
+    lines = []
+    for line in source.splitlines():
+        lines.append("  " + line.strip())
+        if rng.random() < 0.1:
+            lines.append("// written by me")
+    return "\n".join(lines)
+
+
+def cohort(size, copies, seed):
+    """Return size sources, the last copies of them disguised copies, and the copied pairs"""
+    rng = random.Random(seed)
+    sources = {f"student-{i}": random_source(rng) for i in range(size - copies)}
+    planted = set()
+    for i in range(copies):
+        original = f"student-{rng.randrange(size - copies)}"
+        copy = f"copy-{i}"
+        sources[copy] = disguise(sources[original], rng)
+        planted.add(tuple(sorted((original, copy))))
+    return sources, planted
+
+
+def pairwise_similar_pairs(signatures, threshold=DEFAULT_THRESHOLD):
+    """Compare the signatures of every pair of students, O(n^2)"""
+    students = sorted(signatures)
+    pairs = []
+    for i, a in enumerate(students):
+        for b in students[i + 1:]:
+            similarity = estimate_similarity(signatures[a], signatures[b])
+            if similarity >= threshold:
+                pairs.append({"students": [a, b], "similarity": similarity})
+    return pairs
+
+
+def found(pairs, planted):
+    """Return how many planted pairs are among the pairs found"""
+    return len(planted & {tuple(pair["students"]) for pair in pairs})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the near-duplicate search")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000], help="cohort sizes")
+    parser.add_argument("--copies", type=float, default=0.05, help="fraction of the cohort that is a copy")
+    parser.add_argument("--skip-pairwise-above", type=int, default=2000,
+                        help="do not time the pairwise comparison for larger cohorts")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+
+    report = []
+    for size in args.sizes:
+        sources, planted = cohort(size, max(1, int(size * args.copies)), seed=size)
+        cache = SignatureCache(None)
+        start = time.perf_counter()
+        signatures = {student: cache.signature(source) for student, source in sources.items()}
+        entry = {"size": size, "planted": len(planted), "signatures_seconds": time.perf_counter() - start}
+
+        start = time.perf_counter()
+        pairs = find_similar_pairs(signatures)
+        entry["lsh"] = {"seconds": time.perf_counter() - start, "found": found(pairs, planted), "pairs": len(pairs)}
+        if size <= args.skip_pairwise_above:
+            start = time.perf_counter()
+            pairs = pairwise_similar_pairs(signatures)
+            entry["pairwise"] = {
+                "seconds": time.perf_counter() - start, "found": found(pairs, planted), "pairs": len(pairs),
+            }
+        report.append(entry)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"{'students':>9}  {'signatures':>10}  {'lsh':>9}  {'found':>9}  {'pairwise':>9}  {'found':>9}  {'speedup':>8}")
+    for entry in report:
+        lsh = entry["lsh"]
+        pairwise = entry.get("pairwise")
+        row = f"{entry['size']:>9}  {entry['signatures_seconds']:>9.3f}s  {lsh['seconds']:>8.4f}s  "
+        row += f"{lsh['found']:>4}/{entry['planted']:<4}  "
+        if pairwise:
+            row += f"{pairwise['seconds']:>8.4f}s  {pairwise['found']:>4}/{entry['planted']:<4}  "
+            row += f"{pairwise['seconds'] / lsh['seconds']:>7.1f}x"
+        else:
+            row += f"{'skipped':>9}"
+        print(row.rstrip())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
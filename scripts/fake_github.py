@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the parts of the GitHub REST API the review scripts use.
+
+It serves issue creation and listing and pull request files from memory,
+with a per-window request quota reported in the X-RateLimit-* headers,
+optional latency and optional injected server errors, so the scripts can be
+exercised and benchmarked offline:
+
+    python scripts/fake_github.py --port 8765 --quota 500 --window 10
+    GITHUB_API_URL=http://127.0.0.1:8765 GITHUB_REPOSITORY=course/linked-lists \\
+        GITHUB_TOKEN=x python scripts/assign_reviewers.py
+
+It can also be started in-process:
+
+    with FakeGitHub(latency=0.01) as server:
+        client = GitHubClient("token", "course/linked-lists", api_url=server.url)
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_ISSUES = re.compile(r"^/repos/([^/]+/[^/]+)/issues$")
+_PULL_FILES = re.compile(r"^/repos/([^/]+/[^/]+)/pulls/(\d+)/files$")
+
+
+class FakeGitHub:
+    """
+    In-memory GitHub API server.
+
+    Args:
+        host: Address to listen on
+        port: Port to listen on, 0 for any free port
+        quota: Requests allowed per rate limit window
+        window: Length of the rate limit window in seconds
+        latency: Seconds every request takes
+        fail_every: Answer every n-th request with a 502, 0 to never fail
+        fail_after_apply: Apply a request before answering it with an
+            injected 502, as a gateway timing out on a slow server does
+        secondary_limit_every: Answer every n-th request with a secondary
+            rate limit 403 (quota left, no Retry-After), 0 to never do so
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, quota=5000, window=3600, latency=0.0, fail_every=0,
+                 fail_after_apply=False, secondary_limit_every=0):
+        self.quota = quota
+        self.window = window
+        self.latency = latency
+        self.fail_every = fail_every
+        self.fail_after_apply = fail_after_apply
+        self.secondary_limit_every = secondary_limit_every
+        self.lock = threading.Lock()
+        self.issues = []
+        self.pulls = {}
+        self.requests = Counter()
+        self.rate_limited = 0
+        self._served = 0
+        self._window_start = time.time()
+        self._window_used = 0
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def add_pull(self, number, files):
+        """
+        Add a pull request.
+
+        Args:
+            number: Pull request number
+            files: Changed files, as paths (added) or (path, status) pairs
+        """
+        entries = []
+        for file in files:
+            path, status = (file, "added") if isinstance(file, str) else file
+            entries.append({"filename": path, "status": status, "additions": 1, "deletions": 0, "changes": 1})
+        self.pulls[number] = entries
+
+    def _rate_limit(self):
+        """Count a request against the quota; return (allowed, fail, secondary, headers)"""
+        with self.lock:
+            now = time.time()
+            if now - self._window_start >= self.window:
+                self._window_start = now
+                self._window_used = 0
+            reset = self._window_start + self.window
+            allowed = self._window_used < self.quota
+            if allowed:
+                self._window_used += 1
+            else:
+                self.rate_limited += 1
+            headers = {
+                "X-RateLimit-Limit": str(self.quota),
+                "X-RateLimit-Remaining": str(self.quota - self._window_used),
+                "X-RateLimit-Reset": f"{reset:.3f}",
+            }
+            self._served += 1
+            fail = self.fail_every and self._served % self.fail_every == 0
+            secondary = self.secondary_limit_every and self._served % self.secondary_limit_every == 0
+            if secondary:
+                self.rate_limited += 1
+        return allowed, fail, secondary, headers
+
+    def _handle(self, method, path, query, body):
+        """Return (status, payload) for one request"""
+        match = _ISSUES.match(path)
+        if match and method == "POST":
+            with self.lock:
+                number = len(self.issues) + 1
+                issue = {
+                    "number": number,
+                    "title": body.get("title", ""),
+                    "body": body.get("body", ""),
+                    "assignees": [{"login": login} for login in body.get("assignees", [])],
+                    "html_url": f"https://github.com/{match.group(1)}/issues/{number}",
+                }
+                self.issues.append(issue)
+            return 201, issue
+        if match and method == "GET":
+            return 200, self._page(self.issues, query)
+
+        match = _PULL_FILES.match(path)
+        if match and method == "GET":
+            files = self.pulls.get(int(match.group(2)))
+            if files is None:
+                return 404, {"message": "Not Found"}
+            return 200, self._page(files, query)
+
+        return 404, {"message": "Not Found"}
+
+    @staticmethod
+    def _page(items, query):
+        per_page = int(query.get("per_page", ["30"])[0])
+        page = int(query.get("page", ["1"])[0])
+        return items[(page - 1) * per_page:page * per_page]
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self, method):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else {}
+                if fake.latency:
+                    time.sleep(fake.latency)
+
+                allowed, fail, secondary, headers = fake._rate_limit()
+                with fake.lock:
+                    fake.requests[(method, url.path)] += 1
+                if not allowed:
+                    status, payload = 403, {"message": "API rate limit exceeded"}
+                elif secondary:
+                    status, payload = 403, {"message": "You have exceeded a secondary rate limit. "
+                                                       "Please wait a few minutes before you try again."}
+                elif fail:
+                    if fake.fail_after_apply:
+                        fake._handle(method, url.path, parse_qs(url.query), body)
+                    status, payload = 502, {"message": "Bad Gateway"}
+                else:
+                    status, payload = fake._handle(method, url.path, parse_qs(url.query), body)
+
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._respond("GET")
+
+            def do_POST(self):
+                self._respond("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the GitHub API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--quota", type=int, default=5000, help="requests per rate limit window")
+    parser.add_argument("--window", type=float, default=3600, help="rate limit window in seconds")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds every request takes")
+    parser.add_argument("--pulls", help="JSON file mapping pull request numbers to their changed files")
+    args = parser.parse_args()
+
+    server = FakeGitHub(port=args.port, quota=args.quota, window=args.window, latency=args.latency)
+    if args.pulls:
+        with open(args.pulls) as f:
+            for number, files in json.load(f).items():
+                server.add_pull(int(number), files)
+    print(f"Serving a fake GitHub API at {server.url}")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,268 @@
+"""
+Minimal GitHub REST API client for the review scripts.
+
+Only the standard library is used. Requests go to GITHUB_API_URL (default
+https://api.github.com), so the scripts can be pointed at a local stand-in
+such as fake_github.py. The client is safe to share between threads and
+keeps to the API's rate limits:
+
+- every response's X-RateLimit-Remaining and X-RateLimit-Reset headers are
+  tracked, and once the remaining quota drops to RATE_LIMIT_RESERVE all
+  threads wait for the reset instead of spending it
+- 403 and 429 responses that signal a rate limit (no remaining quota or a
+  Retry-After header) are retried after the indicated wait, and secondary
+  rate limits (a 403 or 429 whose message mentions one, typically hit by
+  concurrent requests) after at least SECONDARY_RATE_LIMIT_WAIT
+- connection errors and 5xx responses are retried with exponential backoff,
+  but only for idempotent methods: a POST that timed out or got a 502 may
+  still have been applied, so it is raised as a GitHubError with
+  maybe_applied set, and create_issue() looks for the issue before sending
+  the request again
+"""
+
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+
+# Requests left unspent when the quota runs low, for other jobs sharing it
+RATE_LIMIT_RESERVE = 10
+
+MAX_RETRIES = 5
+BACKOFF_SECONDS = 1.0
+
+# Longest wait for a rate limit reset before giving up
+MAX_RATE_LIMIT_WAIT = 3600
+
+# Shortest wait after a secondary rate limit that gives no Retry-After;
+# GitHub asks for at least a minute
+SECONDARY_RATE_LIMIT_WAIT = 60.0
+
+# Methods that can be sent again without changing the result
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+
+class GitHubError(Exception):
+    """
+    A request failed with an error status or could not be completed.
+
+    maybe_applied is set when a non-idempotent request failed in a way that
+    does not tell whether the server applied it (a timeout, a dropped
+    connection or a 5xx response).
+    """
+
+    def __init__(self, message, status=None, maybe_applied=False):
+        super().__init__(message)
+        self.status = status
+        self.maybe_applied = maybe_applied
+
+
+class RateLimiter:
+    """
+    Rate limit state shared by every thread using a client.
+
+    Args:
+        reserve: Remaining quota at which requests are paused until the reset
+        clock: Function returning the current time in seconds since the epoch
+        sleep: Function sleeping for a number of seconds
+    """
+
+    def __init__(self, reserve=RATE_LIMIT_RESERVE, clock=time.time, sleep=time.sleep):
+        self.reserve = reserve
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.paused_until = 0.0
+        self.remaining = None
+        self.waited = 0.0
+
+    def wait(self):
+        """Block while requests are paused"""
+        while True:
+            with self.lock:
+                delay = self.paused_until - self.clock()
+            if delay <= 0:
+                return
+            if delay > MAX_RATE_LIMIT_WAIT:
+                raise GitHubError(f"Rate limit resets in {delay:.0f}s")
+            self.sleep(delay)
+            with self.lock:
+                self.waited += delay
+
+    def pause(self, seconds):
+        """Pause every request for a number of seconds"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+
+    def update(self, headers):
+        """Record the quota reported by a response"""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None:
+            return
+        with self.lock:
+            self.remaining = int(remaining)
+            if self.remaining <= self.reserve and reset is not None:
+                self.paused_until = max(self.paused_until, float(reset))
+
+    def retry_delay(self, status, headers, message=""):
+        """
+        Return how long to wait before retrying a rate-limited response, or
+        None if the response is not a rate limit.
+
+        Args:
+            status: HTTP status of the response
+            headers: Response headers
+            message: Response body, which tells a secondary rate limit
+                apart from a permission error
+        """
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None:
+            return float(retry_after)
+        if status not in (403, 429):
+            return None
+        if headers.get("X-RateLimit-Remaining") == "0":
+            reset = headers.get("X-RateLimit-Reset")
+            return max(float(reset) - self.clock(), 1.0) if reset is not None else 60.0
+        if status == 429 or "secondary rate limit" in message.lower():
+            return SECONDARY_RATE_LIMIT_WAIT
+        return None
+
+
+class GitHubClient:
+    """
+    Client for one repository.
+
+    Args:
+        token: API token, None for unauthenticated requests
+        repository: "owner/name"
+        api_url: Base URL of the API
+        timeout: Seconds allowed per request
+        max_retries: Retries of a failed or rate-limited request
+        rate_limiter: RateLimiter to share, a new one by default
+    """
+
+    def __init__(self, token, repository, api_url=GITHUB_API_URL, timeout=30, max_retries=MAX_RETRIES,
+                 rate_limiter=None):
+        self.token = token
+        self.repository = repository
+        self.api_url = api_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter or RateLimiter()
+
+    def request(self, method, path, data=None, params=None):
+        """
+        Send one request, retrying rate limits and transient failures.
+
+        Args:
+            method: HTTP method
+            path: Path below the API URL, e.g. "/repos/owner/name/issues"
+            data: JSON body
+            params: Query parameters
+
+        Returns:
+            tuple: (decoded JSON body, response headers)
+
+        Raises:
+            GitHubError: If the request fails or keeps being rate limited
+        """
+        url = self.api_url + path
+        if params:
+            url += "?" + urllib.parse.urlencode(params)
+        body = json.dumps(data).encode() if data is not None else None
+        headers = {"Accept": "application/vnd.github+json", "User-Agent": "linked-list-review-scripts"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+
+        idempotent = method in IDEMPOTENT_METHODS
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait()
+            request = urllib.request.Request(url, data=body, headers=headers, method=method)
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    self.rate_limiter.update(response.headers)
+                    payload = response.read()
+                    return (json.loads(payload) if payload else None), response.headers
+            except urllib.error.HTTPError as e:
+                self.rate_limiter.update(e.headers)
+                message = e.read().decode(errors="replace")
+                delay = self.rate_limiter.retry_delay(e.code, e.headers, message)
+                if delay is None and e.code < 500:
+                    raise GitHubError(f"{method} {path} failed with {e.code}: {message}", e.code) from None
+                error = GitHubError(f"{method} {path} failed with {e.code}", e.code,
+                                    maybe_applied=delay is None and not idempotent)
+            except (urllib.error.URLError, OSError) as e:
+                delay = None
+                error = GitHubError(f"{method} {path} failed: {e}", maybe_applied=not idempotent)
+
+            # A rejected rate-limited request is safe to repeat, anything
+            # else is only repeated if the method is idempotent
+            if attempt == self.max_retries or error.maybe_applied:
+                raise error
+            if delay is not None:
+                self.rate_limiter.pause(delay)
+            else:
+                time.sleep(BACKOFF_SECONDS * 2 ** attempt)
+
+    def paginate(self, path, params=None, per_page=100):
+        """Return every item of a paginated list endpoint"""
+        items = []
+        page = 1
+        while True:
+            batch, _ = self.request("GET", path, params=dict(params or {}, per_page=per_page, page=page))
+            items.extend(batch)
+            if len(batch) < per_page:
+                return items
+            page += 1
+
+    def find_issue(self, title, assignees=(), since=None):
+        """
+        Return an issue with the given title and assignees, or None.
+
+        Args:
+            title: Exact title of the issue
+            assignees: Logins the issue must be assigned to
+            since: Only consider issues updated at or after this ISO 8601
+                time
+        """
+        params = {"state": "all"}
+        if assignees:
+            params["assignee"] = list(assignees)[0]
+        if since:
+            params["since"] = since
+        wanted = set(assignees)
+        for issue in self.paginate(f"/repos/{self.repository}/issues", params):
+            logins = {assignee["login"] for assignee in issue.get("assignees") or ()}
+            if issue.get("title") == title and wanted <= logins:
+                return issue
+        return None
+
+    def create_issue(self, title, body, assignees=()):
+        """
+        Create an issue and return it.
+
+        POST is not idempotent, so when a request fails in a way that may
+        have created the issue anyway, the issue is looked up by title and
+        assignees before the request is sent again.
+        """
+        since = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - 60))
+        data = {"title": title, "body": body, "assignees": list(assignees)}
+        for attempt in range(self.max_retries + 1):
+            try:
+                issue, _ = self.request("POST", f"/repos/{self.repository}/issues", data)
+                return issue
+            except GitHubError as e:
+                if not e.maybe_applied or attempt == self.max_retries:
+                    raise
+            existing = self.find_issue(title, assignees, since)
+            if existing is not None:
+                return existing
+            time.sleep(BACKOFF_SECONDS * 2 ** attempt)
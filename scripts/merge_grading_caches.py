@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Script to merge the grading caches of several batch_grade.py shards.
+
+Each shard of the "Batch Grade All Students" workflow grades its branches
+into its own .grading_cache. This script merges the results cache
+(results.json) and the benchmark database (benchmarks.sqlite) of each given
+shard directory into the ones of this checkout, so the next batch run reuses
+the verdicts of every shard and bench_history.py compares the whole cohort:
+
+    python scripts/merge_grading_caches.py shard-caches/*
+
+Directories without one of the files are skipped for that file.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+from batch_grade import RESULTS_CACHE, RESULTS_DB  # noqa: E402
+from harness.results_cache import ResultsCache  # noqa: E402
+from harness.results_db import ResultsDB  # noqa: E402
+
+
+def merge_grading_caches(directories, results_cache=RESULTS_CACHE, results_db=RESULTS_DB):
+    """
+    Merge the results cache and benchmark database of each directory.
+
+    Returns:
+        tuple: (number of caches merged, number of benchmark results merged)
+    """
+    caches = 0
+    benchmarks = 0
+    cache = ResultsCache(results_cache)
+    db = ResultsDB(results_db)
+    try:
+        for directory in directories:
+            path = os.path.join(directory, os.path.basename(results_cache))
+            if os.path.exists(path):
+                other = ResultsCache(path).data
+                cache.update(other["tests"], other["submissions"])
+                caches += 1
+            path = os.path.join(directory, os.path.basename(results_db))
+            if os.path.exists(path):
+                benchmarks += db.merge(path)
+    finally:
+        db.close()
+    return caches, benchmarks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge the grading caches of batch grading shards")
+    parser.add_argument("directories", nargs="+", help="Grading cache directories of the shards")
+    args = parser.parse_args()
+
+    missing = [directory for directory in args.directories if not os.path.isdir(directory)]
+    if missing:
+        print(f"Not a directory: {', '.join(missing)}")
+        return 1
+
+    caches, benchmarks = merge_grading_caches(args.directories)
+    print(f"Merged {caches} results caches and {benchmarks} benchmark results")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Store for review_pool.json that is safe to update concurrently.
+
+Every update is a read-merge-write under an exclusive lock on a sidecar lock
+file, and the new contents are written to a temporary file that is renamed
+over the pool, so readers (such as assign_reviewers.py) always see a complete
+file and concurrent writers never lose each other's additions. Membership is
+checked against a set built when the pool is read, and add() merges any
+number of students in one locked update, taking out any that are to be
+removed in the same update.
+
+The file format is unchanged: "students" stays a list in the order students
+were added. Performance records (tier, budget violations and metrics, see
+tests/harness/budget.py) are kept in a separate "performance" mapping keyed
+by student, which also holds students withheld from the pool.
+
+    pool = ReviewPool()
+    pool.add(["alice", "bob"])
+    "alice" in pool
+"""
+
+import contextlib
+import datetime
+import json
+import os
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+REVIEW_POOL = "review_pool.json"
+
+FORMAT_VERSION = "1.0"
+
+
+def empty_pool():
+    """Return the contents of a new review pool"""
+    return {
+        "students": [],
+        "last_updated": "",
+        "metadata": {
+            "description": "This file tracks students who have passed all tests and are eligible for peer review",
+            "format_version": FORMAT_VERSION,
+        },
+    }
+
+
+def read_pool(path=REVIEW_POOL):
+    """Read a review pool, returning an empty one if missing or invalid"""
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return empty_pool()
+    if not isinstance(data, dict) or not isinstance(data.get("students"), list):
+        return empty_pool()
+    data.setdefault("last_updated", "")
+    data.setdefault("metadata", empty_pool()["metadata"])
+    return data
+
+
+def write_pool(data, path=REVIEW_POOL):
+    """Write a review pool atomically through a temporary file and a rename"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".review_pool.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+class ReviewPool:
+    """
+    review_pool.json with locked, atomic updates.
+
+    Args:
+        path: Path of the pool file, created on the first update
+    """
+
+    def __init__(self, path=REVIEW_POOL):
+        self.path = path
+        self.data = read_pool(path)
+        self._members = set(self.data["students"])
+
+    def __contains__(self, student):
+        return student in self._members
+
+    def __len__(self):
+        return len(self._members)
+
+    @property
+    def students(self):
+        """Students in the order they were added"""
+        return list(self.data["students"])
+
+    def refresh(self):
+        """Re-read the pool from disk"""
+        self.data = read_pool(self.path)
+        self._members = set(self.data["students"])
+
+    @contextlib.contextmanager
+    def _lock(self):
+        """Hold an exclusive lock on the pool's lock file"""
+        with open(self.path + ".lock", "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def add(self, students, performance=None, remove=()):
+        """
+        Add students to the pool in one locked update.
+
+        The pool is re-read under the lock, so students added by concurrent
+        updates are kept. Nothing is written if every student is already in
+        the pool, none of the students to remove is in it and there are no
+        performance records.
+
+        Args:
+            students: Names of the students to add
+            performance: Mapping of student to performance record to store,
+                including students that are not added
+            remove: Names of students to take out of the pool, such as
+                members who are now withheld
+
+        Returns:
+            list: Names that were not already in the pool
+        """
+        added = self.missing(students)
+        if not added and not performance and not self._members.intersection(remove):
+            return []
+
+        with self._lock():
+            self.refresh()
+            added = self.missing(students)
+            removed = self._members.intersection(remove)
+            if added or performance or removed:
+                if removed:
+                    self.data["students"] = [s for s in self.data["students"] if s not in removed]
+                    self._members -= removed
+                self.data["students"].extend(added)
+                if performance:
+                    self.data.setdefault("performance", {}).update(performance)
+                self.data["last_updated"] = datetime.datetime.now().isoformat()
+                write_pool(self.data, self.path)
+                self._members.update(added)
+        return added
+
+    def performance(self, student):
+        """Return the performance record of a student, or None"""
+        return self.data.get("performance", {}).get(student)
+
+    def missing(self, students):
+        """Return the students not in the pool, without duplicates, in order"""
+        missing = []
+        seen = set()
+        for student in students:
+            if student not in self._members and student not in seen:
+                missing.append(student)
+                seen.add(student)
+        return missing
@@ -0,0 +1,93 @@
+"""
+Concurrent, resumable creation of GitHub issues.
+
+Issues are created through a bounded thread pool sharing one GitHubClient,
+whose rate limiter pauses every worker when the quota runs low. Each issue
+has a key, and every created issue is appended to a journal file (one JSON
+line per issue, flushed as it is written), so a rerun after a failure skips
+the issues that already exist instead of creating duplicates.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from github_api import GitHubError
+
+ISSUE_JOURNAL = os.path.join("reviews", "issue_journal.jsonl")
+
+ISSUE_WORKERS = int(os.environ.get("LL_ISSUE_WORKERS", 4))
+
+
+class IssueJournal:
+    """
+    Append-only record of created issues.
+
+    Args:
+        path: Journal file, created on the first record
+    """
+
+    def __init__(self, path=ISSUE_JOURNAL):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        try:
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line cut short by a crash
+                        continue
+                    self.entries[entry["key"]] = entry
+        except FileNotFoundError:
+            pass
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def record(self, key, number, url=None):
+        """Record that the issue with a key was created"""
+        entry = {"key": key, "number": number, "url": url}
+        with self.lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.entries[key] = entry
+
+
+def create_issues(issues, client, journal, workers=ISSUE_WORKERS):
+    """
+    Create the issues that are not yet in the journal.
+
+    Args:
+        issues: Dictionaries with "key", "title", "body" and "assignees"
+        client: GitHubClient of the repository
+        journal: IssueJournal of the issues already created
+        workers: Number of issues created concurrently
+
+    Returns:
+        dict: {"created": count, "skipped": count, "failed": [(key, error)]}
+    """
+    pending = [issue for issue in issues if issue["key"] not in journal]
+    summary = {"created": 0, "skipped": len(issues) - len(pending), "failed": []}
+
+    def create(issue):
+        created = client.create_issue(issue["title"], issue["body"], issue.get("assignees", ()))
+        journal.record(issue["key"], created.get("number"), created.get("html_url"))
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(create, issue): issue["key"] for issue in pending}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except GitHubError as e:
+                summary["failed"].append((futures[future], str(e)))
+            else:
+                summary["created"] += 1
+    return summary
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Script to find near-duplicate submissions before reviewers are assigned.
+
+Comparing every pair of submissions is quadratic in the cohort, so each
+student's src/linked_list.cpp is reduced to a MinHash signature instead:
+
+    1. The source is tokenized with comments and preprocessor lines removed,
+       every identifier replaced by ID and every string or character literal
+       by STR, so renaming variables or rewording messages does not hide a
+       copy. C++ keywords and the names every submission shares (the
+       required classes, members and methods, and common standard library
+       names) are kept, so shingles from different methods stay apart.
+    2. Every run of SHINGLE_SIZE consecutive tokens is a shingle, and the
+       signature of NUM_HASHES values is built from the shingle hashes by
+       one permutation hashing. The fraction of equal entries of two
+       signatures estimates the Jaccard similarity of their sets of
+       shingles.
+    3. Signatures are split into LSH_BANDS bands, and only submissions that
+       agree on a whole band share a bucket and are compared, which takes
+       roughly linear time in the cohort.
+
+Signatures are cached in .grading_cache/minhash.json under the SHA-256 of
+the source, so only new or changed submissions are hashed again. Pairs at
+or above the threshold are written to reviews/similarity.json, which
+assign_reviewers.py --similarity reads to keep those students from
+reviewing each other and to flag them in reviews/assignments.json:
+
+    python scripts/similarity.py --threshold 0.9
+    python scripts/assign_reviewers.py --similarity reviews/similarity.json
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import re
+import struct
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+from batch_grade import REPO_ROOT, list_student_branches
+from harness.signatures import REQUIRED_MEMBERS
+
+SOURCE_FILE = "src/linked_list.cpp"
+SIMILARITY_FILE = os.path.join("reviews", "similarity.json")
+SIGNATURE_CACHE = os.environ.get("LL_SIGNATURE_CACHE", os.path.join(".grading_cache", "minhash.json"))
+
+# Tokens per shingle, signature length and its split into bands; 16 bands of
+# 8 rows make pairs above a similarity of about 0.7 likely to share a bucket
+SHINGLE_SIZE = 5
+NUM_HASHES = 128
+LSH_BANDS = 16
+
+# Calibrated on the sample solutions in tests/data/submissions: independent
+# solutions of the assignment score at most about 0.35, two solutions from
+# the same textbook skeleton that differ in two methods 0.7 to 0.85, a
+# copy with renamed variables and new formatting 1.0, and one that also
+# rewrites two small methods about 0.93
+DEFAULT_THRESHOLD = 0.9
+
+# Seed of the shingle hash; signatures are only comparable under one seed
+MINHASH_SEED = 1
+
+# Version of tokenize(), part of the signature cache parameters so cached
+# signatures are recomputed when the normalization changes
+TOKENIZER_VERSION = 2
+
+# Added per bin of distance to values borrowed by empty bins, above any bin value
+_EMPTY_BIN_OFFSET = 1 << 64
+
+CPP_KEYWORDS = frozenset("""
+    alignas alignof and and_eq asm auto bitand bitor bool break case catch char char16_t char32_t class
+    compl const constexpr const_cast continue decltype default delete do double dynamic_cast else enum
+    explicit export extern false float for friend goto if inline int long mutable namespace new noexcept
+    not not_eq nullptr operator or or_eq private protected public register reinterpret_cast return short
+    signed sizeof static static_assert static_cast struct switch template this thread_local throw true try
+    typedef typeid typename union unsigned using virtual void volatile wchar_t while xor xor_eq NULL
+""".split())
+
+# Names fixed by the assignment or the standard library, which a copier
+# cannot rename: the required classes and members, the README's private
+# members and common standard library names
+FIXED_NAMES = frozenset(
+    [member.cls for member in REQUIRED_MEMBERS]
+    + [member.name for member in REQUIRED_MEMBERS]
+    + ["head", "size", "std", "cout", "cerr", "endl", "vector", "unordered_set", "set", "swap", "sort"]
+)
+
+_COMMENTS = re.compile(r'//[^\n]*|/\*.*?\*/', re.S)
+_PREPROCESSOR = re.compile(r'^[ \t]*#[^\n]*', re.M)
+_TOKENS = re.compile(r'''
+    "(?:\\.|[^"\\\n])*" | '(?:\\.|[^'\\\n])*'       # string and character literals
+    | [A-Za-z_]\w*                                  # identifiers and keywords
+    | \d[\w.]*                                      # numbers
+    | ::|->|<<|>>|\+\+|--|&&|\|\||[<>=!+\-*/%&|^]= # multi-character operators
+    | [^\s\w]                                       # everything else, one character at a time
+''', re.X)
+
+
+def tokenize(source):
+    """Return the normalized tokens of a C++ source"""
+    source = _PREPROCESSOR.sub("", _COMMENTS.sub(" ", source))
+    tokens = []
+    for token in _TOKENS.findall(source):
+        if token[0] in "\"'":
+            tokens.append("STR")
+        elif (token[0].isalpha() or token[0] == "_") and token not in CPP_KEYWORDS and token not in FIXED_NAMES:
+            tokens.append("ID")
+        else:
+            tokens.append(token)
+    return tokens
+
+
+def shingles(tokens, size=SHINGLE_SIZE):
+    """Return the set of every run of size consecutive tokens"""
+    return {" ".join(tokens[i:i + size]).encode() for i in range(len(tokens) - size + 1)}
+
+
+def minhash(shingle_set, num_hashes=NUM_HASHES, seed=MINHASH_SEED):
+    """
+    Return the MinHash signature of a set of shingles.
+
+    Uses one permutation hashing: each shingle is hashed once, the hash
+    picks one of num_hashes bins and each bin keeps its smallest value,
+    instead of evaluating num_hashes hash functions on every shingle. An
+    empty bin takes the value of the next non-empty one, offset by the
+    distance, so signatures of small sets still compare bin by bin.
+
+    Returns:
+        list: The value of each bin, or None if the set is empty
+    """
+    if not shingle_set:
+        return None
+    salt = struct.pack("<Q", seed)
+    bins = [None] * num_hashes
+    for shingle in shingle_set:
+        h = int.from_bytes(hashlib.blake2b(shingle, digest_size=8, key=salt).digest(), "little")
+        index, value = h % num_hashes, h // num_hashes
+        if bins[index] is None or value < bins[index]:
+            bins[index] = value
+
+    signature = list(bins)
+    for i in range(num_hashes):
+        distance = 1
+        while signature[i] is None:
+            value = bins[(i + distance) % num_hashes]
+            if value is not None:
+                signature[i] = value + distance * _EMPTY_BIN_OFFSET
+            distance += 1
+    return signature
+
+
+def estimate_similarity(first, second):
+    """Estimate the Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+
+def candidate_pairs(signatures, bands=LSH_BANDS):
+    """
+    Return the pairs of students whose signatures agree on at least one band.
+
+    Args:
+        signatures: Mapping of student to signature
+        bands: Number of bands the signatures are split into
+    """
+    buckets = defaultdict(list)
+    for student, signature in signatures.items():
+        rows = len(signature) // bands
+        for band in range(bands):
+            buckets[(band, tuple(signature[band * rows:(band + 1) * rows]))].append(student)
+
+    pairs = set()
+    for students in buckets.values():
+        for i, a in enumerate(students):
+            for b in students[i + 1:]:
+                pairs.add((a, b) if a < b else (b, a))
+    return pairs
+
+
+def find_similar_pairs(signatures, threshold=DEFAULT_THRESHOLD, bands=LSH_BANDS):
+    """
+    Find the pairs of submissions with an estimated similarity of at least threshold.
+
+    Returns:
+        list: {"students": [a, b], "similarity"} entries, most similar first
+    """
+    pairs = []
+    for a, b in candidate_pairs(signatures, bands):
+        similarity = estimate_similarity(signatures[a], signatures[b])
+        if similarity >= threshold:
+            pairs.append({"students": [a, b], "similarity": round(similarity, 3)})
+    pairs.sort(key=lambda pair: (-pair["similarity"], pair["students"]))
+    return pairs
+
+
+class SignatureCache:
+    """
+    Signatures keyed by the SHA-256 of the source they were computed from.
+
+    The cache is discarded when the tokenization or MinHash parameters it
+    was built with differ from the current ones.
+
+    Args:
+        path: Cache file, or None to keep the signatures in memory only
+    """
+
+    def __init__(self, path=SIGNATURE_CACHE, num_hashes=NUM_HASHES, shingle_size=SHINGLE_SIZE, seed=MINHASH_SEED):
+        self.path = path
+        self.params = {"scheme": "oph", "tokens": TOKENIZER_VERSION, "num_hashes": num_hashes,
+                       "shingle_size": shingle_size, "seed": seed}
+        self.signatures = {}
+        self.hits = 0
+        self.misses = 0
+        if path:
+            try:
+                with open(path, "r") as f:
+                    cached = json.load(f)
+                if cached.get("params") == self.params:
+                    self.signatures = cached["signatures"]
+            except (FileNotFoundError, json.JSONDecodeError, KeyError, AttributeError):
+                pass
+
+    def signature(self, source):
+        """Return the signature of a source, computing it if it is not cached"""
+        digest = hashlib.sha256(source.encode()).hexdigest()
+        if digest in self.signatures:
+            self.hits += 1
+            return self.signatures[digest]
+        self.misses += 1
+        signature = minhash(shingles(tokenize(source), self.params["shingle_size"]), self.params["num_hashes"],
+                            self.params["seed"])
+        self.signatures[digest] = signature
+        return signature
+
+    def save(self):
+        """Write the cache atomically"""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"params": self.params, "signatures": self.signatures}, f)
+        os.replace(tmp_path, self.path)
+
+
+def read_sources(branches, path=SOURCE_FILE):
+    """
+    Read one file from every student's branch with a single git process.
+
+    Args:
+        branches: Result of batch_grade.list_student_branches()
+        path: File to read, relative to the repository root
+
+    Returns:
+        dict: Mapping of student to the file's contents; students whose
+        branch lacks the file are left out
+    """
+    students = sorted(branches)
+    if not students:
+        return {}
+    request = "".join(f"{branches[student]['commit']}:{path}\n" for student in students).encode()
+    output = subprocess.run(["git", "cat-file", "--batch"], cwd=REPO_ROOT, input=request,
+                            capture_output=True, check=True).stdout
+
+    sources = {}
+    offset = 0
+    for student in students:
+        end = output.index(b"\n", offset)
+        header = output[offset:end].split()
+        offset = end + 1
+        if len(header) != 3:
+            # "<object> missing": the branch has no such file
+            continue
+        size = int(header[2])
+        if header[1] == b"blob":
+            sources[student] = output[offset:offset + size].decode("utf-8", errors="replace")
+        offset += size + 1
+    return sources
+
+
+def save_similarity(pairs, threshold, skipped, path=SIMILARITY_FILE):
+    """Save the similar pairs for assign_reviewers.py"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    report = {
+        "pairs": pairs,
+        "skipped": skipped,
+        "generated_at": datetime.datetime.now().isoformat(),
+        "metadata": {
+            "description": f"Submissions with an estimated similarity of at least {threshold}",
+            "source": SOURCE_FILE,
+            "threshold": threshold,
+        },
+    }
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def main():
+    """Main function to find similar submissions"""
+    parser = argparse.ArgumentParser(description="Find near-duplicate submissions across student branches")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="smallest estimated similarity reported, between 0 and 1")
+    parser.add_argument("--output", default=SIMILARITY_FILE, help="file the similar pairs are written to")
+    parser.add_argument("--cache", default=SIGNATURE_CACHE, help="signature cache file")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the signature cache")
+    args = parser.parse_args()
+
+    if not 0 < args.threshold <= 1:
+        print("Error: --threshold must be between 0 and 1")
+        return 1
+
+    branches = list_student_branches()
+    if not branches:
+        print("No student branches found")
+        return 1
+    sources = read_sources(branches)
+
+    cache = SignatureCache(None if args.no_cache else args.cache)
+    signatures = {}
+    skipped = sorted(student for student in branches if student not in sources)
+    for student, source in sources.items():
+        signature = cache.signature(source)
+        if signature is None:
+            skipped.append(student)
+        else:
+            signatures[student] = signature
+    cache.save()
+
+    pairs = find_similar_pairs(signatures, args.threshold)
+    save_similarity(pairs, args.threshold, sorted(skipped), args.output)
+
+    print(f"Compared {len(signatures)} submissions ({cache.hits} cached signatures, {cache.misses} computed)")
+    if skipped:
+        print(f"Skipped {len(skipped)} branches without a usable {SOURCE_FILE}: {', '.join(sorted(skipped))}")
+    for pair in pairs:
+        a, b = pair["students"]
+        print(f"{a} and {b}: {pair['similarity']:.0%} similar")
+    print(f"{len(pairs)} similar pairs written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,38 @@
 """
 Script to update the review_pool.json file when a student passes all tests.
 This script is triggered by the GitHub Actions workflow when tests pass.
+
+With --results, it instead adds every student who passed in one or more batch
+grading results files (see batch_grade.py, whose shards each write one) in a
+single update. With --from-cache, the
+student is only added if the results cache holds a passing verdict for the
+current checkout (sources, tests and toolchain unchanged since it was graded).
+
+Updates go through pool_store.ReviewPool, which locks the pool and replaces it
+atomically, so simultaneous updates do not overwrite each other.
+
+When the cached verdict or the batch results include the performance budget
+check (see tests/harness/budget.py), the student's tier, budget violations
+and per-operation metrics are recorded in the pool's "performance" entry.
+With --withhold-over-budget, students who exceed a hard budget are recorded
+but not added to the pool, and taken out of it if they were already in it.
+Withholding a student is a normal outcome and does not fail the script.
 """
 
+import argparse
 import json
 import os
-import datetime
 import re
+import sys
+
+from pool_store import ReviewPool
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+from harness.budget import describe_violation  # noqa: E402
+from harness.results_cache import ResultsCache, now, verdict_key  # noqa: E402
+
+# Test whose recorded properties hold the performance budget check
+BUDGET_TEST = "test_performance_budget"
 
 def get_student_name_from_branch():
     """Extract student name from branch name (dev-student-name)"""
@@ -17,44 +43,156 @@ def get_student_name_from_branch():
         return match.group(1)
     return None
 
-def update_review_pool():
-    """Update the review_pool.json file with the student who passed tests"""
+def cached_verdict():
+    """
+    Return the cached verdict for the current checkout, or None.
+    
+    The verdict is only found if the student's sources, the tests and the
+    toolchain are unchanged since the full suite was last run.
+    """
+    return ResultsCache().verdict(verdict_key("."))
+
+def performance_record(metrics):
+    """
+    Return the performance record to store from a verdict's metrics.
+    
+    Args:
+        metrics: Properties recorded by each test, keyed by test name
+    
+    Returns:
+        dict: {"tier", "violations", "metrics", "recorded_at"}, or None if
+        the budget check did not run
+    """
+    performance = (metrics or {}).get(BUDGET_TEST, {}).get("performance")
+    if not performance:
+        return None
+    return {
+        "tier": performance["tier"],
+        "violations": performance["violations"],
+        "metrics": performance["metrics"],
+        "recorded_at": now(),
+    }
+
+def admit(student_name, record, withhold_over_budget):
+    """
+    Decide whether a passing student is admitted, given their performance.
+    
+    Returns:
+        bool: False if the student is withheld for exceeding a hard budget
+    """
+    if record is None:
+        return True
+    for violation in record["violations"]:
+        kind = "hard" if violation["hard"] else "soft"
+        print(f"{student_name}: {kind} budget exceeded: {describe_violation(violation)}")
+    if withhold_over_budget and record["tier"] == "over-budget":
+        print(f"{student_name} exceeds a hard performance budget and is withheld from the review pool")
+        record["admitted"] = False
+        return False
+    record["admitted"] = True
+    return True
+
+def update_review_pool(from_cache=False, withhold_over_budget=False):
+    """
+    Update the review_pool.json file with the student who passed tests
+    
+    Args:
+        from_cache: Require a passing verdict in the results cache instead of
+            trusting the caller that the tests passed
+        withhold_over_budget: Do not add the student if they exceed a hard
+            performance budget
+    """
     student_name = get_student_name_from_branch()
     if not student_name:
         print("Could not extract student name from branch")
         return False
     
-    # Load current review pool
-    try:
-        with open('review_pool.json', 'r') as f:
-            review_pool = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        # Initialize if file doesn't exist or is invalid
-        review_pool = {
-            "students": [],
-            "last_updated": "",
-            "metadata": {
-                "description": "This file tracks students who have passed all tests and are eligible for peer review",
-                "format_version": "1.0"
-            }
-        }
-    
-    # Add student if not already in the pool
-    if student_name not in review_pool["students"]:
-        review_pool["students"].append(student_name)
-        review_pool["last_updated"] = datetime.datetime.now().isoformat()
-        
-        # Save updated review pool
-        with open('review_pool.json', 'w') as f:
-            json.dump(review_pool, f, indent=2)
-        
-        print(f"Added {student_name} to review pool")
-        return True
+    verdict = cached_verdict()
+    if from_cache:
+        if verdict is None:
+            print(f"No cached verdict for the current submission of {student_name}")
+            return False
+        if not verdict["passed"]:
+            print(f"{student_name} did not pass all tests (cached verdict)")
+            return False
+    
+    record = performance_record(verdict.get("metrics") if verdict else None)
+    admitted = admit(student_name, record, withhold_over_budget)
+    performance = {student_name: record} if record else None
+    if record:
+        print(f"{student_name} performance tier: {record['tier']}")
+    
+    # Add student if not already in the pool, or take them out if withheld
+    pool = ReviewPool()
+    was_member = student_name in pool
+    if admitted:
+        if pool.add([student_name], performance):
+            print(f"Added {student_name} to review pool")
+        else:
+            print(f"{student_name} is already in review pool")
     else:
-        print(f"{student_name} is already in review pool")
-        return True
+        pool.add([], performance, remove=[student_name])
+        if was_member:
+            print(f"Removed {student_name} from review pool")
+    return True
+
+def update_review_pool_from_results(results_paths, withhold_over_budget=False):
+    """
+    Add every student who passed in batch grading results files.
+    
+    Args:
+        results_paths: Paths of the files written by batch_grade.py, such
+            as one per shard
+        withhold_over_budget: Do not add students who exceed a hard
+            performance budget
+    """
+    results = {}
+    for results_path in results_paths:
+        try:
+            with open(results_path, 'r') as f:
+                results.update(json.load(f)["results"])
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            print(f"Error: {results_path} not found or invalid")
+            return False
+    
+    passed = sorted(student for student, result in results.items() if result.get("passed"))
+    
+    admitted = []
+    withheld = []
+    performance = {}
+    for student in passed:
+        record = performance_record(results[student].get("metrics"))
+        if record:
+            performance[student] = record
+        if admit(student, record, withhold_over_budget):
+            admitted.append(student)
+        else:
+            withheld.append(student)
+    
+    pool = ReviewPool()
+    removed = [student for student in withheld if student in pool]
+    added = pool.add(admitted, performance, remove=withheld)
+    
+    print(f"Added {len(added)} students to review pool ({len(passed)} passed, {len(withheld)} withheld)")
+    if removed:
+        print(f"Removed {len(removed)} withheld students from review pool: {', '.join(removed)}")
+    return True
+
+def main():
+    """Main function to update the review pool"""
+    parser = argparse.ArgumentParser(description="Add passing students to review_pool.json")
+    parser.add_argument("--results", nargs="+", help="batch grading results files to apply")
+    parser.add_argument("--from-cache", action="store_true",
+                        help="require a passing verdict in the results cache")
+    parser.add_argument("--withhold-over-budget", action="store_true",
+                        help="do not add students who exceed a hard performance budget")
+    args = parser.parse_args()
+    
+    if args.results:
+        return update_review_pool_from_results(args.results, args.withhold_over_budget)
+    return update_review_pool(from_cache=args.from_cache, withhold_over_budget=args.withhold_over_budget)
 
 if __name__ == "__main__":
-    success = update_review_pool()
+    success = main()
     if not success:
         exit(1)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Script to validate a review submission.
+This script is triggered by the GitHub Actions workflow when a pull request
+is opened against a dev-* branch.
+
+A valid review pull request targets dev-<student>, adds exactly one file,
+reviews/review-for-<student>.md, and is opened by a reviewer who was assigned
+to that student in reviews/assignments.json. Only the pull request's list of
+changed files is fetched from the API, never its diff.
+
+Assignments are looked up in a reviewer -> students index built from
+reviews/assignments.json and cached in .grading_cache/reviewer_index.json
+under the hash of the assignments file, so it is rebuilt only when the
+assignments change. The process_reviews workflow restores and saves that
+file with actions/cache under the same hash.
+
+The pull request is described by PR_NUMBER, BASE_BRANCH, HEAD_BRANCH and
+PR_AUTHOR (the author's login; the name in HEAD_BRANCH is used without it).
+GITHUB_API_URL points the script at a stand-in for the API such as
+fake_github.py.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+
+from github_api import GitHubClient, GitHubError
+
+ASSIGNMENTS_FILE = os.path.join("reviews", "assignments.json")
+INDEX_CACHE = os.environ.get("LL_REVIEWER_INDEX", os.path.join(".grading_cache", "reviewer_index.json"))
+
+
+def student_from_branch(branch):
+    """Extract the student name from a branch name (dev-student-name)"""
+    match = re.match(r'dev-(.*)', branch or "")
+    if match:
+        return match.group(1)
+    return None
+
+
+def file_hash(path):
+    """Return the SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def build_reviewer_index(assignments):
+    """
+    Invert the assignments into a mapping of reviewer to reviewed students.
+
+    Args:
+        assignments: Mapping of student to their reviewers
+    """
+    index = {}
+    for student, reviewers in assignments.items():
+        for reviewer in reviewers:
+            index.setdefault(reviewer, []).append(student)
+    return index
+
+
+def load_reviewer_index(assignments_path=ASSIGNMENTS_FILE, cache_path=INDEX_CACHE):
+    """
+    Return the reviewer -> students index of an assignments file.
+
+    The index is read from the cache if it was built from a file with the
+    same hash, and built and cached otherwise.
+
+    Returns:
+        dict: Mapping of reviewer to a set of students, or None if the
+        assignments file is missing or invalid
+    """
+    try:
+        digest = file_hash(assignments_path)
+    except FileNotFoundError:
+        return None
+
+    if cache_path:
+        try:
+            with open(cache_path, "r") as f:
+                cached = json.load(f)
+            if cached.get("hash") == digest:
+                return {reviewer: set(students) for reviewer, students in cached["index"].items()}
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, AttributeError):
+            pass
+
+    try:
+        with open(assignments_path, "r") as f:
+            assignments = json.load(f)["assignments"]
+    except (json.JSONDecodeError, KeyError):
+        return None
+    index = build_reviewer_index(assignments)
+
+    if cache_path:
+        directory = os.path.dirname(cache_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"hash": digest, "index": index}, f)
+        os.replace(tmp_path, cache_path)
+    return {reviewer: set(students) for reviewer, students in index.items()}
+
+
+def check_files(files, student):
+    """
+    Check the changed files of a review pull request.
+
+    Args:
+        files: Entries of the pull request files API ("filename", "status")
+        student: Student being reviewed
+
+    Returns:
+        list: Error messages, empty if the files are valid
+    """
+    expected = f"reviews/review-for-{student}.md"
+    errors = []
+    if not any(entry["filename"] == expected for entry in files):
+        errors.append(f"The pull request must add {expected}")
+    for entry in files:
+        if entry["filename"] == expected and entry.get("status") != "added":
+            errors.append(f"{expected} must be a new file, not {entry.get('status')}")
+        elif entry["filename"] != expected:
+            errors.append(f"Unexpected change to {entry['filename']}: a review may only add {expected}")
+    return errors
+
+
+def validate_review(client, pr_number, base_branch, reviewer, index):
+    """
+    Validate one review pull request.
+
+    Args:
+        client: GitHubClient of the repository
+        pr_number: Pull request number
+        base_branch: Branch the pull request targets
+        reviewer: Login of the pull request's author
+        index: Result of load_reviewer_index()
+
+    Returns:
+        list: Error messages, empty if the review is valid
+    """
+    student = student_from_branch(base_branch)
+    if not student:
+        return [f"Reviews must target a dev-<student> branch, not {base_branch}"]
+    if not reviewer:
+        return ["Could not tell who opened the pull request"]
+    if reviewer == student:
+        return ["Students cannot review their own submission"]
+
+    errors = []
+    if student not in index.get(reviewer, ()):
+        errors.append(f"{reviewer} is not assigned to review {student}")
+
+    files = client.paginate(f"/repos/{client.repository}/pulls/{pr_number}/files")
+    errors += check_files(files, student)
+    return errors
+
+
+def main():
+    """Main function to validate a review submission"""
+    parser = argparse.ArgumentParser(description="Validate a review pull request")
+    parser.add_argument("--assignments", default=ASSIGNMENTS_FILE, help="review assignments file")
+    args = parser.parse_args()
+
+    pr_number = os.environ.get("PR_NUMBER")
+    base_branch = os.environ.get("BASE_BRANCH")
+    reviewer = os.environ.get("PR_AUTHOR") or student_from_branch(os.environ.get("HEAD_BRANCH"))
+    if not pr_number or not base_branch:
+        print("Error: PR_NUMBER and BASE_BRANCH must be set")
+        return 1
+
+    index = load_reviewer_index(args.assignments)
+    if index is None:
+        print(f"Error: {args.assignments} not found or invalid")
+        return 1
+
+    client = GitHubClient(os.environ.get("GITHUB_TOKEN"), os.environ.get("GITHUB_REPOSITORY"))
+    try:
+        errors = validate_review(client, pr_number, base_branch, reviewer, index)
+    except GitHubError as e:
+        print(f"Error: could not inspect pull request #{pr_number}: {e}")
+        return 1
+
+    if errors:
+        print(f"Review in pull request #{pr_number} is invalid:")
+        for error in errors:
+            print(f"- {error}")
+        return 1
+    print(f"Valid review of {student_from_branch(base_branch)} by {reviewer}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
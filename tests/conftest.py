@@ -0,0 +1,107 @@
+"""
+Pytest configuration for the linked list test harness.
+
+Besides registering the markers used by the tests, this installs the results
+cache plugin (see harness.results_cache): tests whose inputs are unchanged
+since a previous pass are skipped, and the verdict of every full run is
+recorded together with the properties the tests report.
+"""
+
+import pytest
+
+from harness.results_cache import ResultsCache, base_key, key_for_test, now, selection_key, verdict_key
+
+# Markers of tests that check the tooling rather than the submission: they
+# are neither cached nor counted in a verdict
+UNGRADED_MARKERS = ("scripts", "unit")
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--no-results-cache",
+        action="store_true",
+        default=False,
+        help="run every test even if a cached pass exists",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: timing and scaling benchmarks (deselect with '-m \"not benchmark\"')"
+    )
+    config.addinivalue_line(
+        "markers", "scripts: unit tests of the automation scripts, not part of grading (see tests/scripts)"
+    )
+    config.addinivalue_line(
+        "markers", "unit: unit tests of the grading harness, not part of grading (see tests/unit)"
+    )
+    cache = ResultsCache()
+    if cache.enabled and not config.getoption("--no-results-cache"):
+        config.pluginmanager.register(ResultsCachePlugin(cache), "results-cache")
+
+
+def selection(config):
+    """Describe the subset of tests selected on the command line"""
+    return selection_key(config.getoption("markexpr") or "", config.getoption("keyword") or "")
+
+
+class ResultsCachePlugin:
+    """
+    Skip tests with a cached pass and record the outcomes of this session.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.base = base_key()
+        self.keys = {}
+        self.outcomes = {}
+        self.properties = {}
+        self.cached = set()
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, items):
+        for item in items:
+            function = getattr(item, "function", None)
+            if function is None or any(item.get_closest_marker(name) for name in UNGRADED_MARKERS):
+                continue
+            key = key_for_test(function, self.base, item.fixturenames)
+            self.keys[item.nodeid] = key
+
+            entry = self.cache.test_result(key)
+            if entry and entry["outcome"] == "passed":
+                item.add_marker(pytest.mark.skip(reason="unchanged since a previous pass"))
+                self.cached.add(item.nodeid)
+                self.outcomes[item.nodeid] = "passed"
+                self.properties[item.nodeid] = entry.get("properties", {})
+
+    def pytest_runtest_logreport(self, report):
+        if report.nodeid not in self.keys or report.nodeid in self.cached:
+            return
+        if report.when == "call" or report.failed or report.skipped:
+            if self.outcomes.get(report.nodeid) != "failed":
+                self.outcomes[report.nodeid] = report.outcome
+            self.properties.setdefault(report.nodeid, {}).update(dict(report.user_properties))
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        tests = {}
+        for nodeid, outcome in self.outcomes.items():
+            if nodeid in self.cached or outcome not in ("passed", "failed"):
+                continue
+            tests[self.keys[nodeid]] = {
+                "test": nodeid,
+                "outcome": outcome,
+                "properties": self.properties.get(nodeid, {}),
+                "recorded_at": now(),
+            }
+
+        submissions = {}
+        if self.keys and set(self.outcomes) == set(self.keys):
+            names = {nodeid: nodeid.split("::")[-1] for nodeid in self.keys}
+            submissions[verdict_key(".", selection(session.config))] = {
+                "passed": exitstatus == 0,
+                "tests": {names[n]: self.outcomes[n] for n in self.keys},
+                "metrics": {names[n]: self.properties[n] for n in self.keys if self.properties.get(n)},
+                "recorded_at": now(),
+            }
+
+        self.cache.update(tests, submissions)
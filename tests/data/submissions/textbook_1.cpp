@@ -0,0 +1,256 @@
+#include "linked_list.h"
+#include <iostream>
+using namespace std;
+
+LinkedList::LinkedList() {
+    head = nullptr;
+    size = 0;
+}
+
+LinkedList::~LinkedList() {
+    clear();
+}
+
+void LinkedList::insertAtBeginning(int value) {
+    Node* newNode = new Node(value);
+    newNode->next = head;
+    head = newNode;
+    size++;
+}
+
+void LinkedList::insertAtEnd(int value) {
+    Node* newNode = new Node(value);
+    if (head == nullptr) {
+        head = newNode;
+    } else {
+        Node* temp = head;
+        while (temp->next != nullptr) {
+            temp = temp->next;
+        }
+        temp->next = newNode;
+    }
+    size++;
+}
+
+void LinkedList::insertAtPosition(int value, int position) {
+    if (position <= 0 || head == nullptr) {
+        insertAtBeginning(value);
+        return;
+    }
+    if (position >= size) {
+        insertAtEnd(value);
+        return;
+    }
+    Node* newNode = new Node(value);
+    Node* temp = head;
+    for (int i = 0; i < position - 1; i++) {
+        temp = temp->next;
+    }
+    newNode->next = temp->next;
+    temp->next = newNode;
+    size++;
+}
+
+bool LinkedList::deleteFromBeginning() {
+    if (head == nullptr) {
+        return false;
+    }
+    Node* temp = head;
+    head = head->next;
+    delete temp;
+    size--;
+    return true;
+}
+
+bool LinkedList::deleteFromEnd() {
+    if (head == nullptr) {
+        return false;
+    }
+    if (head->next == nullptr) {
+        delete head;
+        head = nullptr;
+        size--;
+        return true;
+    }
+    Node* temp = head;
+    while (temp->next->next != nullptr) {
+        temp = temp->next;
+    }
+    delete temp->next;
+    temp->next = nullptr;
+    size--;
+    return true;
+}
+
+bool LinkedList::deleteFromPosition(int position) {
+    if (position < 0 || position >= size) {
+        return false;
+    }
+    if (position == 0) {
+        return deleteFromBeginning();
+    }
+    Node* temp = head;
+    for (int i = 0; i < position - 1; i++) {
+        temp = temp->next;
+    }
+    Node* toDelete = temp->next;
+    temp->next = toDelete->next;
+    delete toDelete;
+    size--;
+    return true;
+}
+
+bool LinkedList::deleteValue(int value) {
+    if (head == nullptr) {
+        return false;
+    }
+    if (head->data == value) {
+        return deleteFromBeginning();
+    }
+    Node* temp = head;
+    while (temp->next != nullptr && temp->next->data != value) {
+        temp = temp->next;
+    }
+    if (temp->next == nullptr) {
+        return false;
+    }
+    Node* toDelete = temp->next;
+    temp->next = toDelete->next;
+    delete toDelete;
+    size--;
+    return true;
+}
+
+int LinkedList::getSize() {
+    return size;
+}
+
+bool LinkedList::isEmpty() {
+    return head == nullptr;
+}
+
+void LinkedList::display() {
+    Node* temp = head;
+    while (temp != nullptr) {
+        cout << temp->data << " -> ";
+        temp = temp->next;
+    }
+    cout << "NULL" << endl;
+}
+
+Node* LinkedList::search(int value) {
+    Node* temp = head;
+    while (temp != nullptr) {
+        if (temp->data == value) {
+            return temp;
+        }
+        temp = temp->next;
+    }
+    return nullptr;
+}
+
+void LinkedList::reverse() {
+    Node* prev = nullptr;
+    Node* current = head;
+    Node* next = nullptr;
+    while (current != nullptr) {
+        next = current->next;
+        current->next = prev;
+        prev = current;
+        current = next;
+    }
+    head = prev;
+}
+
+static Node* merge(Node* a, Node* b) {
+    if (a == nullptr) return b;
+    if (b == nullptr) return a;
+    Node dummy(0);
+    Node* tail = &dummy;
+    while (a != nullptr && b != nullptr) {
+        if (a->data <= b->data) {
+            tail->next = a;
+            a = a->next;
+        } else {
+            tail->next = b;
+            b = b->next;
+        }
+        tail = tail->next;
+    }
+    tail->next = (a != nullptr) ? a : b;
+    return dummy.next;
+}
+
+static Node* mergeSort(Node* node) {
+    if (node == nullptr || node->next == nullptr) {
+        return node;
+    }
+    Node* slow = node;
+    Node* fast = node->next;
+    while (fast != nullptr && fast->next != nullptr) {
+        slow = slow->next;
+        fast = fast->next->next;
+    }
+    Node* second = slow->next;
+    slow->next = nullptr;
+    return merge(mergeSort(node), mergeSort(second));
+}
+
+void LinkedList::sort() {
+    head = mergeSort(head);
+}
+
+void LinkedList::removeDuplicates() {
+    Node* current = head;
+    while (current != nullptr) {
+        Node* runner = current;
+        while (runner->next != nullptr) {
+            if (runner->next->data == current->data) {
+                Node* duplicate = runner->next;
+                runner->next = duplicate->next;
+                delete duplicate;
+                size--;
+            } else {
+                runner = runner->next;
+            }
+        }
+        current = current->next;
+    }
+}
+
+Node* LinkedList::getMiddleNode() {
+    if (head == nullptr) {
+        return nullptr;
+    }
+    Node* slow = head;
+    Node* fast = head;
+    while (fast != nullptr && fast->next != nullptr) {
+        slow = slow->next;
+        fast = fast->next->next;
+    }
+    return slow;
+}
+
+bool LinkedList::detectLoop() {
+    Node* slow = head;
+    Node* fast = head;
+    while (fast != nullptr && fast->next != nullptr) {
+        slow = slow->next;
+        fast = fast->next->next;
+        if (slow == fast) {
+            return true;
+        }
+    }
+    return false;
+}
+
+void LinkedList::clear() {
+    Node* current = head;
+    while (current != nullptr) {
+        Node* next = current->next;
+        delete current;
+        current = next;
+    }
+    head = nullptr;
+    size = 0;
+}
@@ -0,0 +1,239 @@
+#include "linked_list.h"
+#include <iostream>
+#include <unordered_set>
+using namespace std;
+
+LinkedList::LinkedList() {
+    head = nullptr;
+    size = 0;
+}
+
+LinkedList::~LinkedList() {
+    clear();
+}
+
+void LinkedList::insertAtBeginning(int value) {
+    Node* node = new Node(value);
+    node->next = head;
+    head = node;
+    size++;
+}
+
+void LinkedList::insertAtEnd(int value) {
+    Node* node = new Node(value);
+    if (head == nullptr) {
+        head = node;
+    } else {
+        Node* curr = head;
+        while (curr->next != nullptr) {
+            curr = curr->next;
+        }
+        curr->next = node;
+    }
+    size++;
+}
+
+void LinkedList::insertAtPosition(int value, int position) {
+    if (position <= 0 || head == nullptr) {
+        insertAtBeginning(value);
+        return;
+    }
+    if (position >= size) {
+        insertAtEnd(value);
+        return;
+    }
+    Node* node = new Node(value);
+    Node* curr = head;
+    for (int i = 0; i < position - 1; i++) {
+        curr = curr->next;
+    }
+    node->next = curr->next;
+    curr->next = node;
+    size++;
+}
+
+bool LinkedList::deleteFromBeginning() {
+    if (head == nullptr) {
+        return false;
+    }
+    Node* curr = head;
+    head = head->next;
+    delete curr;
+    size--;
+    return true;
+}
+
+bool LinkedList::deleteFromEnd() {
+    if (head == nullptr) {
+        return false;
+    }
+    if (head->next == nullptr) {
+        delete head;
+        head = nullptr;
+        size--;
+        return true;
+    }
+    Node* curr = head;
+    while (curr->next->next != nullptr) {
+        curr = curr->next;
+    }
+    delete curr->next;
+    curr->next = nullptr;
+    size--;
+    return true;
+}
+
+bool LinkedList::deleteFromPosition(int position) {
+    if (position < 0 || position >= size) {
+        return false;
+    }
+    if (position == 0) {
+        return deleteFromBeginning();
+    }
+    Node* curr = head;
+    for (int i = 0; i < position - 1; i++) {
+        curr = curr->next;
+    }
+    Node* victim = curr->next;
+    curr->next = victim->next;
+    delete victim;
+    size--;
+    return true;
+}
+
+bool LinkedList::deleteValue(int value) {
+    if (head == nullptr) {
+        return false;
+    }
+    if (head->data == value) {
+        return deleteFromBeginning();
+    }
+    Node* curr = head;
+    while (curr->next != nullptr && curr->next->data != value) {
+        curr = curr->next;
+    }
+    if (curr->next == nullptr) {
+        return false;
+    }
+    Node* victim = curr->next;
+    curr->next = victim->next;
+    delete victim;
+    size--;
+    return true;
+}
+
+int LinkedList::getSize() {
+    return size;
+}
+
+bool LinkedList::isEmpty() {
+    return head == nullptr;
+}
+
+void LinkedList::display() {
+    Node* curr = head;
+    while (curr != nullptr) {
+        cout << curr->data << " -> ";
+        curr = curr->next;
+    }
+    cout << "NULL" << endl;
+}
+
+Node* LinkedList::search(int value) {
+    Node* curr = head;
+    while (curr != nullptr) {
+        if (curr->data == value) {
+            return curr;
+        }
+        curr = curr->next;
+    }
+    return nullptr;
+}
+
+void LinkedList::reverse() {
+    Node* prev = nullptr;
+    Node* current = head;
+    Node* next = nullptr;
+    while (current != nullptr) {
+        next = current->next;
+        current->next = prev;
+        prev = current;
+        current = next;
+    }
+    head = prev;
+}
+
+void LinkedList::sort() {
+    if (head == nullptr || head->next == nullptr) {
+        return;
+    }
+    bool swapped = true;
+    while (swapped) {
+        swapped = false;
+        Node* curr = head;
+        while (curr->next != nullptr) {
+            if (curr->data > curr->next->data) {
+                int value = curr->data;
+                curr->data = curr->next->data;
+                curr->next->data = value;
+                swapped = true;
+            }
+            curr = curr->next;
+        }
+    }
+}
+
+void LinkedList::removeDuplicates() {
+    unordered_set<int> seen;
+    Node* prev = nullptr;
+    Node* curr = head;
+    while (curr != nullptr) {
+        if (seen.count(curr->data)) {
+            prev->next = curr->next;
+            delete curr;
+            curr = prev->next;
+            size--;
+        } else {
+            seen.insert(curr->data);
+            prev = curr;
+            curr = curr->next;
+        }
+    }
+}
+
+Node* LinkedList::getMiddleNode() {
+    if (head == nullptr) {
+        return nullptr;
+    }
+    Node* slow = head;
+    Node* fast = head;
+    while (fast != nullptr && fast->next != nullptr) {
+        slow = slow->next;
+        fast = fast->next->next;
+    }
+    return slow;
+}
+
+bool LinkedList::detectLoop() {
+    Node* slow = head;
+    Node* fast = head;
+    while (fast != nullptr && fast->next != nullptr) {
+        slow = slow->next;
+        fast = fast->next->next;
+        if (slow == fast) {
+            return true;
+        }
+    }
+    return false;
+}
+
+void LinkedList::clear() {
+    Node* current = head;
+    while (current != nullptr) {
+        Node* next = current->next;
+        delete current;
+        current = next;
+    }
+    head = nullptr;
+    size = 0;
+}
@@ -0,0 +1,145 @@
+// Singly linked list implementation
+#include "linked_list.h"
+
+#include <algorithm>
+#include <iostream>
+#include <vector>
+
+LinkedList::LinkedList() : head(nullptr), size(0) {}
+
+LinkedList::~LinkedList() { clear(); }
+
+void LinkedList::insertAtBeginning(int value) {
+    Node* n = new Node(value);
+    n->next = head;
+    head = n;
+    ++size;
+}
+
+void LinkedList::insertAtEnd(int value) {
+    Node** link = &head;
+    while (*link) link = &(*link)->next;
+    *link = new Node(value);
+    ++size;
+}
+
+void LinkedList::insertAtPosition(int value, int position) {
+    if (position < 0) position = 0;
+    if (position > size) position = size;
+    Node** link = &head;
+    for (int i = 0; i < position; ++i) link = &(*link)->next;
+    Node* n = new Node(value);
+    n->next = *link;
+    *link = n;
+    ++size;
+}
+
+bool LinkedList::deleteFromBeginning() { return deleteFromPosition(0); }
+
+bool LinkedList::deleteFromEnd() { return deleteFromPosition(size - 1); }
+
+bool LinkedList::deleteFromPosition(int position) {
+    if (position < 0 || position >= size) return false;
+    Node** link = &head;
+    for (int i = 0; i < position; ++i) link = &(*link)->next;
+    Node* victim = *link;
+    *link = victim->next;
+    delete victim;
+    --size;
+    return true;
+}
+
+bool LinkedList::deleteValue(int value) {
+    for (Node** link = &head; *link; link = &(*link)->next) {
+        if ((*link)->data == value) {
+            Node* victim = *link;
+            *link = victim->next;
+            delete victim;
+            --size;
+            return true;
+        }
+    }
+    return false;
+}
+
+int LinkedList::getSize() const { return size; }
+
+bool LinkedList::isEmpty() const { return size == 0; }
+
+void LinkedList::display() {
+    std::cout << "[";
+    for (Node* n = head; n; n = n->next) {
+        std::cout << n->data;
+        if (n->next) std::cout << ", ";
+    }
+    std::cout << "]" << std::endl;
+}
+
+Node* LinkedList::search(int value) {
+    for (Node* n = head; n; n = n->next)
+        if (n->data == value) return n;
+    return nullptr;
+}
+
+static Node* reverseFrom(Node* node, Node* previous) {
+    if (!node) return previous;
+    Node* rest = node->next;
+    node->next = previous;
+    return reverseFrom(rest, node);
+}
+
+void LinkedList::reverse() { head = reverseFrom(head, nullptr); }
+
+void LinkedList::sort() {
+    std::vector<int> values;
+    values.reserve(size);
+    for (Node* n = head; n; n = n->next) values.push_back(n->data);
+    std::sort(values.begin(), values.end());
+    int i = 0;
+    for (Node* n = head; n; n = n->next) n->data = values[i++];
+}
+
+void LinkedList::removeDuplicates() {
+    std::vector<int> seen;
+    Node** link = &head;
+    while (*link) {
+        int value = (*link)->data;
+        if (std::find(seen.begin(), seen.end(), value) != seen.end()) {
+            Node* victim = *link;
+            *link = victim->next;
+            delete victim;
+            --size;
+        } else {
+            seen.push_back(value);
+            link = &(*link)->next;
+        }
+    }
+}
+
+Node* LinkedList::getMiddleNode() {
+    if (!head) return nullptr;
+    int steps = size / 2;
+    Node* n = head;
+    while (steps-- > 0) n = n->next;
+    return n;
+}
+
+bool LinkedList::detectLoop() {
+    Node* tortoise = head;
+    Node* hare = head;
+    while (hare && hare->next) {
+        tortoise = tortoise->next;
+        hare = hare->next->next;
+        if (tortoise == hare) return true;
+    }
+    return false;
+}
+
+void LinkedList::clear() {
+    while (head) {
+        Node* n = head;
+        head = head->next;
+        delete n;
+    }
+    size = 0;
+}
@@ -0,0 +1,282 @@
+#include <iostream>
+#include <unordered_set>
+#include "linked_list.h"
+
+/* Constructor: start with an empty list */
+LinkedList::LinkedList()
+{
+    head = NULL;
+    size = 0;
+}
+
+/* Destructor: free every node */
+LinkedList::~LinkedList()
+{
+    clear();
+}
+
+void LinkedList::insertAtBeginning(int value)
+{
+    Node *node = new Node(value);
+    node->next = head;
+    head = node;
+    size = size + 1;
+}
+
+void LinkedList::insertAtEnd(int value)
+{
+    if (isEmpty())
+    {
+        insertAtBeginning(value);
+        return;
+    }
+    Node *last = head;
+    while (last->next)
+    {
+        last = last->next;
+    }
+    last->next = new Node(value);
+    size = size + 1;
+}
+
+void LinkedList::insertAtPosition(int value, int position)
+{
+    if (position <= 0)
+    {
+        insertAtBeginning(value);
+    }
+    else if (position >= size)
+    {
+        insertAtEnd(value);
+    }
+    else
+    {
+        Node *before = head;
+        int index = 1;
+        while (index < position)
+        {
+            before = before->next;
+            index++;
+        }
+        Node *node = new Node(value);
+        node->next = before->next;
+        before->next = node;
+        size = size + 1;
+    }
+}
+
+bool LinkedList::deleteFromBeginning()
+{
+    if (isEmpty())
+        return false;
+    Node *old = head;
+    head = old->next;
+    delete old;
+    size = size - 1;
+    return true;
+}
+
+bool LinkedList::deleteFromEnd()
+{
+    if (isEmpty())
+        return false;
+    if (size == 1)
+        return deleteFromBeginning();
+    Node *before = head;
+    for (int i = 0; i < size - 2; i++)
+        before = before->next;
+    delete before->next;
+    before->next = NULL;
+    size = size - 1;
+    return true;
+}
+
+bool LinkedList::deleteFromPosition(int position)
+{
+    if (position < 0 || position >= size)
+        return false;
+    if (position == 0)
+        return deleteFromBeginning();
+    Node *before = head;
+    for (int i = 1; i < position; i++)
+        before = before->next;
+    Node *old = before->next;
+    before->next = old->next;
+    delete old;
+    size = size - 1;
+    return true;
+}
+
+bool LinkedList::deleteValue(int value)
+{
+    Node *before = NULL;
+    Node *node = head;
+    while (node && node->data != value)
+    {
+        before = node;
+        node = node->next;
+    }
+    if (!node)
+        return false;
+    if (before)
+        before->next = node->next;
+    else
+        head = node->next;
+    delete node;
+    size = size - 1;
+    return true;
+}
+
+int LinkedList::getSize()
+{
+    return size;
+}
+
+bool LinkedList::isEmpty()
+{
+    return size == 0;
+}
+
+void LinkedList::display()
+{
+    if (isEmpty())
+    {
+        std::cout << "List is empty" << std::endl;
+        return;
+    }
+    for (Node *node = head; node; node = node->next)
+    {
+        std::cout << node->data << " ";
+    }
+    std::cout << std::endl;
+}
+
+Node *LinkedList::search(int value)
+{
+    Node *node = head;
+    while (node && node->data != value)
+        node = node->next;
+    return node;
+}
+
+void LinkedList::reverse()
+{
+    Node *reversed = NULL;
+    while (head)
+    {
+        Node *rest = head->next;
+        head->next = reversed;
+        reversed = head;
+        head = rest;
+    }
+    head = reversed;
+}
+
+/* Cut the list after count nodes and return the rest */
+static Node *cut(Node *node, int count)
+{
+    for (int i = 1; node && i < count; i++)
+        node = node->next;
+    if (!node)
+        return NULL;
+    Node *rest = node->next;
+    node->next = NULL;
+    return rest;
+}
+
+/* Merge two sorted lists after out and return the last node */
+static Node *mergeAfter(Node *out, Node *left, Node *right)
+{
+    while (left && right)
+    {
+        if (left->data <= right->data)
+        {
+            out->next = left;
+            left = left->next;
+        }
+        else
+        {
+            out->next = right;
+            right = right->next;
+        }
+        out = out->next;
+    }
+    out->next = left ? left : right;
+    while (out->next)
+        out = out->next;
+    return out;
+}
+
+/* Bottom-up merge sort: merge runs of width 1, 2, 4, ... */
+void LinkedList::sort()
+{
+    Node dummy(0);
+    dummy.next = head;
+    for (int width = 1; width < size; width *= 2)
+    {
+        Node *out = &dummy;
+        Node *rest = dummy.next;
+        while (rest)
+        {
+            Node *left = rest;
+            Node *right = cut(left, width);
+            rest = cut(right, width);
+            out = mergeAfter(out, left, right);
+        }
+    }
+    head = dummy.next;
+}
+
+void LinkedList::removeDuplicates()
+{
+    std::unordered_set<int> seen;
+    Node *before = NULL;
+    Node *node = head;
+    while (node)
+    {
+        if (!seen.insert(node->data).second)
+        {
+            before->next = node->next;
+            delete node;
+            node = before->next;
+            size = size - 1;
+        }
+        else
+        {
+            before = node;
+            node = node->next;
+        }
+    }
+}
+
+Node *LinkedList::getMiddleNode()
+{
+    Node *slow = head;
+    Node *fast = head;
+    while (fast && fast->next)
+    {
+        slow = slow->next;
+        fast = fast->next->next;
+    }
+    return slow;
+}
+
+bool LinkedList::detectLoop()
+{
+    Node *slow = head;
+    Node *fast = head;
+    while (fast && fast->next)
+    {
+        slow = slow->next;
+        fast = fast->next->next;
+        if (slow == fast)
+            return true;
+    }
+    return false;
+}
+
+void LinkedList::clear()
+{
+    while (!isEmpty())
+        deleteFromBeginning();
+}
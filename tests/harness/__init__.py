@@ -0,0 +1,11 @@
+"""
+Support code for the linked list test harness.
+
+The modules in this package are used by tests/test_linked_list.py and by the
+grading scripts. They are not part of the assignment and students should not
+modify them.
+"""
+
+from harness.build import ObjectCache, compile_object
+
+__all__ = ["ObjectCache", "compile_object"]
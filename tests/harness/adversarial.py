@@ -0,0 +1,236 @@
+"""
+Worst-case input benchmark for sort, removeDuplicates and deleteValue.
+
+The functional tests use lists of a few elements, where an implementation
+that degrades on particular inputs (a quicksort pivoting on the head, which
+is quadratic on sorted or all-equal input) cannot be told apart from a
+correct one. This benchmark builds lists from input patterns known to trip
+such implementations:
+
+    sorted       0, 1, ..., n-1
+    reverse      n-1, ..., 1, 0
+    equal        the same value n times
+    few_unique   values drawn from 8 distinct ones
+    sawtooth     ascending runs of length sqrt(n)
+    random       uniformly random values, the baseline
+
+and times each operation on each pattern as "driver --run adversarial
+<operation> <size> <pattern> <warmup> <repetitions>". sort and
+removeDuplicates are timed over one call on the whole list. deleteValue is
+called repeatedly with the values of the list from the tail backwards, each
+deleting the first occurrence, and timed per call.
+
+For every operation the slowest pattern is compared with the random one at
+the largest size where the random pattern completed. An operation is flagged
+when that ratio is above ADVERSARIAL_MAX_RATIO, when a pattern fails or
+times out at a size the random pattern completes, or when the random pattern
+itself fails or times out before the largest size: an operation that is
+quadratic on every input, such as a removeDuplicates comparing every pair
+of nodes, is as slow on random input as on any other, so its ratio stays
+near 1 and only the size it gives up at shows it.
+"""
+
+import math
+import os
+
+from harness.driver import Scenario
+
+ADVERSARIAL_OPERATIONS = ["sort", "removeDuplicates", "deleteValue"]
+ADVERSARIAL_PATTERNS = ["sorted", "reverse", "equal", "few_unique", "sawtooth", "random"]
+
+ADVERSARIAL_MIN_SIZE = int(os.environ.get("LL_ADVERSARIAL_MIN_SIZE", 10 ** 4))
+ADVERSARIAL_MAX_SIZE = int(os.environ.get("LL_ADVERSARIAL_MAX_SIZE", 10 ** 6))
+
+# Slowest acceptable ratio of the worst pattern to the random one
+ADVERSARIAL_MAX_RATIO = float(os.environ.get("LL_ADVERSARIAL_MAX_RATIO", 10))
+
+# Seconds a single trial may take; a pattern that runs past it is flagged
+ADVERSARIAL_TIMEOUT = float(os.environ.get("LL_ADVERSARIAL_TIMEOUT", 5))
+
+ADVERSARIAL_WARMUP = int(os.environ.get("LL_ADVERSARIAL_WARMUP", 0))
+ADVERSARIAL_REPETITIONS = int(os.environ.get("LL_ADVERSARIAL_REPETITIONS", 3))
+
+ADVERSARIAL_SCENARIO = Scenario(
+    "adversarial",
+    r"""
+    if (argc < 3) {
+        std::cerr << "usage: adversarial <operation> <size> <pattern> [warmup] [repetitions]" << std::endl;
+        return 2;
+    }
+    const std::string op = argv[0];
+    const long n = std::atol(argv[1]);
+    const std::string pattern = argv[2];
+    const int warmup = argc > 3 ? std::atoi(argv[3]) : 0;
+    const int repetitions = argc > 4 ? std::atoi(argv[4]) : 1;
+    typedef std::chrono::steady_clock Clock;
+
+    if (op != "sort" && op != "removeDuplicates" && op != "deleteValue") {
+        std::cerr << "Unknown operation: " << op << std::endl;
+        return 2;
+    }
+
+    std::vector<int> values(n);
+    BenchRandom random(n);
+    long tooth = (long)std::sqrt((double)n);
+    if (tooth < 2) {
+        tooth = 2;
+    }
+    for (long i = 0; i < n; i++) {
+        if (pattern == "sorted") {
+            values[i] = (int)i;
+        } else if (pattern == "reverse") {
+            values[i] = (int)(n - 1 - i);
+        } else if (pattern == "equal") {
+            values[i] = 42;
+        } else if (pattern == "few_unique") {
+            values[i] = (int)(random.next() % 8);
+        } else if (pattern == "sawtooth") {
+            values[i] = (int)(i % tooth);
+        } else if (pattern == "random") {
+            values[i] = (int)(random.next() & 0x7FFFFFFF);
+        } else {
+            std::cerr << "Unknown pattern: " << pattern << std::endl;
+            return 2;
+        }
+    }
+
+    // One trial on a freshly built list, returning nanoseconds per call
+    auto trial = [&]() -> double {
+        LinkedList list;
+        for (long i = n - 1; i >= 0; i--) {
+            list.insertAtBeginning(values[i]);
+        }
+
+        long calls = 0;
+        long long elapsed = 0;
+        if (op == "sort" || op == "removeDuplicates") {
+            auto start = Clock::now();
+            if (op == "sort") {
+                list.sort();
+            } else {
+                list.removeDuplicates();
+            }
+            elapsed = std::chrono::duration_cast<std::chrono::nanoseconds>(Clock::now() - start).count();
+            calls = 1;
+        } else {
+            // Delete values from the tail backwards, so each call has to
+            // find the first occurrence of a value that may be far away
+            const long long target_ns = 2000000;
+            long cap = n < 1000 ? n : 1000;
+            while (elapsed < target_ns && calls < cap) {
+                int value = values[n - 1 - calls];
+                auto start = Clock::now();
+                list.deleteValue(value);
+                elapsed += std::chrono::duration_cast<std::chrono::nanoseconds>(Clock::now() - start).count();
+                calls++;
+            }
+        }
+        return (double)elapsed / (calls > 0 ? calls : 1);
+    };
+
+    for (int i = 0; i < warmup; i++) {
+        isolated_trial(trial);
+    }
+
+    std::vector<double> samples;
+    for (int i = 0; i < repetitions; i++) {
+        double ns = isolated_trial(trial);
+        if (ns < 0) {
+            std::cerr << "Benchmark trial failed" << std::endl;
+            return 1;
+        }
+        samples.push_back(ns);
+    }
+
+    std::cout << "{\"op\": \"" << op << "\", \"size\": " << n << ", \"pattern\": \"" << pattern
+              << "\", \"samples_ns\": [";
+    for (int i = 0; i < repetitions; i++) {
+        std::cout << (i ? ", " : "") << samples[i];
+    }
+    std::cout << "]}" << std::endl;
+    return 0;
+""",
+    includes=("<chrono>", "<cmath>", "<cstdlib>", "<string>", "<vector>", '"bench_support.h"'),
+    profile="bench",
+)
+
+
+def adversarial_sizes(min_size=ADVERSARIAL_MIN_SIZE, max_size=ADVERSARIAL_MAX_SIZE):
+    """Return the sizes to measure: powers of ten from min_size to max_size"""
+    sizes = []
+    size = min_size
+    while size <= max_size:
+        sizes.append(size)
+        size *= 10
+    return sizes
+
+
+def run_adversarial_benchmark(runner, sizes=None, operations=ADVERSARIAL_OPERATIONS,
+                              patterns=ADVERSARIAL_PATTERNS, max_ratio=ADVERSARIAL_MAX_RATIO):
+    """
+    Measure every operation on every input pattern over increasing sizes.
+
+    An operation is no longer measured at larger sizes once its random
+    pattern fails or times out, and is then flagged. A pattern that failed
+    is not measured again at larger sizes.
+
+    Args:
+        runner: BenchmarkRunner used for the measurements
+        sizes: List sizes, defaults to adversarial_sizes()
+        operations: Operations to measure
+        patterns: Input patterns, including "random"
+        max_ratio: Ratio of the worst pattern to random above which an
+            operation is flagged
+
+    Returns:
+        dict: Mapping of operation to {"points": {size: {pattern: median
+        ns or None}}, "size": size the ratio is taken at, "worst": slowest
+        pattern, "ratio": worst / random (inf if a pattern failed), "failed":
+        patterns that failed, "failed_at": size at which the random pattern
+        failed or None, "flagged"}
+    """
+    if sizes is None:
+        sizes = adversarial_sizes()
+
+    report = {}
+    for op in operations:
+        points = {}
+        failed = []
+        failed_at = None
+        for size in sizes:
+            random_result = runner.measure(op, size, case="adversarial", extra=["random"])
+            if random_result is None:
+                failed_at = size
+                break
+            point = {"random": random_result["stats"]["median"]}
+            for pattern in patterns:
+                if pattern == "random":
+                    continue
+                if pattern in failed:
+                    point[pattern] = None
+                    continue
+                result = runner.measure(op, size, case="adversarial", extra=[pattern])
+                if result is None:
+                    failed.append(pattern)
+                    point[pattern] = None
+                else:
+                    point[pattern] = result["stats"]["median"]
+            points[size] = point
+
+        entry = {"points": points, "size": None, "worst": None, "ratio": None, "failed": failed,
+                 "failed_at": failed_at}
+        if points:
+            size = max(points)
+            point = points[size]
+            measured = {pattern: ns for pattern, ns in point.items() if ns is not None}
+            entry["size"] = size
+            if failed:
+                entry["worst"] = failed[0]
+                entry["ratio"] = math.inf
+            else:
+                entry["worst"] = max(measured, key=measured.get)
+                entry["ratio"] = measured[entry["worst"]] / point["random"] if point["random"] > 0 else 1.0
+        entry["flagged"] = (bool(failed) or failed_at is not None
+                            or (entry["ratio"] is not None and entry["ratio"] > max_ratio))
+        report[op] = entry
+    return report
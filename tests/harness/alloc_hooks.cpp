@@ -0,0 +1,132 @@
+// Replacement global operator new/delete with allocation accounting.
+// See alloc_hooks.h for the reporting interface.
+//
+// Built with LL_NO_ALLOC_HOOKS (the "bench-nohooks" profile), operator new
+// and delete are left to the standard library and every counter reads zero,
+// so multi-threaded benchmarks do not contend on the shared counters.
+#include "alloc_hooks.h"
+
+#include <atomic>
+#include <cstddef>
+#include <cstdio>
+#include <cstdlib>
+#include <new>
+
+#ifndef LL_NO_ALLOC_HOOKS
+
+namespace {
+
+// Every block carries a header recording its size. The header is as large as
+// the strictest fundamental alignment, so the returned pointer keeps the
+// alignment malloc guarantees.
+const std::size_t HEADER = alignof(std::max_align_t);
+
+std::atomic<long long> g_allocations(0);
+std::atomic<long long> g_deallocations(0);
+std::atomic<long long> g_bytes(0);
+std::atomic<long long> g_live_bytes(0);
+std::atomic<long long> g_live_blocks(0);
+std::atomic<long long> g_peak_bytes(0);
+
+void* tracked_alloc(std::size_t size) {
+    char* block = static_cast<char*>(std::malloc(size + HEADER));
+    if (block == nullptr) {
+        return nullptr;
+    }
+    *reinterpret_cast<std::size_t*>(block) = size;
+
+    g_allocations.fetch_add(1, std::memory_order_relaxed);
+    g_bytes.fetch_add(size, std::memory_order_relaxed);
+    g_live_blocks.fetch_add(1, std::memory_order_relaxed);
+    long long live = g_live_bytes.fetch_add(size, std::memory_order_relaxed) + size;
+    long long peak = g_peak_bytes.load(std::memory_order_relaxed);
+    while (live > peak && !g_peak_bytes.compare_exchange_weak(peak, live, std::memory_order_relaxed)) {
+    }
+    return block + HEADER;
+}
+
+void tracked_free(void* ptr) {
+    if (ptr == nullptr) {
+        return;
+    }
+    char* block = static_cast<char*>(ptr) - HEADER;
+    std::size_t size = *reinterpret_cast<std::size_t*>(block);
+
+    g_deallocations.fetch_add(1, std::memory_order_relaxed);
+    g_live_blocks.fetch_sub(1, std::memory_order_relaxed);
+    g_live_bytes.fetch_sub(size, std::memory_order_relaxed);
+    std::free(block);
+}
+
+void* throwing_alloc(std::size_t size) {
+    void* ptr = tracked_alloc(size ? size : 1);
+    if (ptr == nullptr) {
+        throw std::bad_alloc();
+    }
+    return ptr;
+}
+
+}  // namespace
+
+void* operator new(std::size_t size) { return throwing_alloc(size); }
+void* operator new[](std::size_t size) { return throwing_alloc(size); }
+void* operator new(std::size_t size, const std::nothrow_t&) noexcept { return tracked_alloc(size ? size : 1); }
+void* operator new[](std::size_t size, const std::nothrow_t&) noexcept { return tracked_alloc(size ? size : 1); }
+
+void operator delete(void* ptr) noexcept { tracked_free(ptr); }
+void operator delete[](void* ptr) noexcept { tracked_free(ptr); }
+void operator delete(void* ptr, std::size_t) noexcept { tracked_free(ptr); }
+void operator delete[](void* ptr, std::size_t) noexcept { tracked_free(ptr); }
+void operator delete(void* ptr, const std::nothrow_t&) noexcept { tracked_free(ptr); }
+void operator delete[](void* ptr, const std::nothrow_t&) noexcept { tracked_free(ptr); }
+
+AllocStats alloc_stats() {
+    AllocStats stats;
+    stats.allocations = g_allocations.load(std::memory_order_relaxed);
+    stats.deallocations = g_deallocations.load(std::memory_order_relaxed);
+    stats.bytes = g_bytes.load(std::memory_order_relaxed);
+    stats.live_bytes = g_live_bytes.load(std::memory_order_relaxed);
+    stats.live_blocks = g_live_blocks.load(std::memory_order_relaxed);
+    stats.peak_bytes = g_peak_bytes.load(std::memory_order_relaxed);
+    return stats;
+}
+
+void alloc_reset_peak() {
+    g_peak_bytes.store(g_live_bytes.load(std::memory_order_relaxed), std::memory_order_relaxed);
+}
+
+#else
+
+AllocStats alloc_stats() {
+    AllocStats stats = {0, 0, 0, 0, 0, 0};
+    return stats;
+}
+
+void alloc_reset_peak() {}
+
+#endif
+
+void alloc_report(const char* label, const AllocStats& before, const AllocStats& after) {
+    // Written with stdio, which does not allocate through operator new
+    std::fflush(stdout);
+    std::printf(
+        "@@ALLOC {\"label\": \"%s\", \"allocations\": %lld, \"deallocations\": %lld, "
+        "\"bytes\": %lld, \"live_bytes\": %lld, \"live_blocks\": %lld, \"peak_bytes\": %lld}\n",
+        label,
+        after.allocations - before.allocations,
+        after.deallocations - before.deallocations,
+        after.bytes - before.bytes,
+        after.live_bytes - before.live_bytes,
+        after.live_blocks - before.live_blocks,
+        after.peak_bytes - before.live_bytes);
+    std::fflush(stdout);
+}
+
+AllocScope::AllocScope(const char* label) : label_(label) {
+    alloc_reset_peak();
+    before_ = alloc_stats();
+}
+
+AllocScope::~AllocScope() {
+    alloc_report(label_, before_, alloc_stats());
+}
@@ -0,0 +1,46 @@
+// Allocation accounting for the linked list test driver.
+//
+// alloc_hooks.cpp replaces the global operator new and operator delete so
+// that every heap allocation made by the student's implementation is
+// counted. Scenarios take snapshots with alloc_stats() or wrap operations in
+// an AllocScope, which prints one machine-readable report line:
+//
+//     @@ALLOC {"label": "...", "allocations": ..., ...}
+//
+// Scopes must not be nested, since each one tracks the peak from its start.
+// When alloc_hooks.cpp is built with LL_NO_ALLOC_HOOKS nothing is counted
+// and every snapshot is zero.
+#ifndef ALLOC_HOOKS_H
+#define ALLOC_HOOKS_H
+
+struct AllocStats {
+    long long allocations;    // Calls to operator new
+    long long deallocations;  // Calls to operator delete on tracked blocks
+    long long bytes;          // Total bytes requested
+    long long live_bytes;     // Bytes currently allocated
+    long long live_blocks;    // Blocks currently allocated
+    long long peak_bytes;     // Highest live_bytes since the last reset
+};
+
+// Current counters
+AllocStats alloc_stats();
+
+// Restart peak tracking from the current live bytes
+void alloc_reset_peak();
+
+// Print the difference between two snapshots as an @@ALLOC report line.
+// peak_bytes is reported relative to before.live_bytes.
+void alloc_report(const char* label, const AllocStats& before, const AllocStats& after);
+
+// Reports the allocations made during its lifetime
+class AllocScope {
+public:
+    explicit AllocScope(const char* label);
+    ~AllocScope();
+
+private:
+    const char* label_;
+    AllocStats before_;
+};
+
+#endif
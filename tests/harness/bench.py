@@ -0,0 +1,383 @@
+"""
+Benchmark runner and size-sweep scaling benchmark for the linked list
+operations.
+
+The benchmark is a case of the shared test driver, run once per operation and
+size as "driver --run bench <operation> <size> <warmup> <repetitions>". It
+runs the given number of discarded warm-up trials followed by timed trials,
+each on a freshly built list in a forked child, and prints one JSON line with
+every sample.
+BenchmarkRunner pins the driver to a CPU, summarizes the samples with robust
+statistics and reruns measurements that are too noisy. Per-element operations
+(inserts, search, getMiddleNode, deleteFromEnd) report the cost of a single
+call on a list of the given size; whole-list operations (sort, reverse,
+removeDuplicates) report the cost of one call over the whole list. Times are
+measured with std::chrono::steady_clock in nanoseconds and the growth of each
+operation is matched against the complexity classes in harness.complexity.
+"""
+
+import json
+import os
+
+from harness.complexity import exceeds, fit_complexity
+from harness.driver import Scenario
+from harness.limits import DEFAULT_LIMITS, run_limited
+from harness.stats import summarize
+
+BENCH_OPERATIONS = [
+    "insertAtBeginning",
+    "insertAtEnd",
+    "search",
+    "sort",
+    "reverse",
+    "removeDuplicates",
+    "getMiddleNode",
+    "deleteFromEnd",
+]
+
+BENCH_MAX_SIZE = int(os.environ.get("LL_BENCH_MAX_SIZE", 10 ** 6))
+BENCH_MIN_SIZE = int(os.environ.get("LL_BENCH_MIN_SIZE", 100))
+
+# Seconds a single trial may take before the sweep of that operation is
+# stopped
+BENCH_POINT_TIMEOUT = float(os.environ.get("LL_BENCH_POINT_TIMEOUT", 10))
+
+BENCH_WARMUP = int(os.environ.get("LL_BENCH_WARMUP", 1))
+BENCH_REPETITIONS = int(os.environ.get("LL_BENCH_REPETITIONS", 5))
+
+# A measurement whose relative median absolute deviation is above this is
+# considered noisy and is rerun up to BENCH_MAX_RERUNS times
+BENCH_NOISE_THRESHOLD = float(os.environ.get("LL_BENCH_NOISE_THRESHOLD", 0.1))
+BENCH_MAX_RERUNS = int(os.environ.get("LL_BENCH_MAX_RERUNS", 2))
+
+# CPU the benchmark is pinned to: a CPU number, "none" to disable pinning,
+# or unset to use the last CPU this process may run on. Concurrent sessions
+# must not share a CPU; scripts/batch_grade.py gives each worker its own
+BENCH_CPU = os.environ.get("LL_BENCH_CPU")
+
+# File the structured benchmark report is written to
+BENCH_REPORT = os.environ.get("LL_BENCH_REPORT", "bench_report.json")
+
+BENCH_SCENARIO = Scenario(
+    "bench",
+    r"""
+    if (argc < 2) {
+        std::cerr << "usage: bench <operation> <size> [warmup] [repetitions]" << std::endl;
+        return 2;
+    }
+    const std::string op = argv[0];
+    const long n = std::atol(argv[1]);
+    const int warmup = argc > 2 ? std::atoi(argv[2]) : 0;
+    const int repetitions = argc > 3 ? std::atoi(argv[3]) : 1;
+    typedef std::chrono::steady_clock Clock;
+
+    if (op != "insertAtBeginning" && op != "insertAtEnd" && op != "search" && op != "sort" &&
+        op != "reverse" && op != "removeDuplicates" && op != "getMiddleNode" && op != "deleteFromEnd") {
+        std::cerr << "Unknown operation: " << op << std::endl;
+        return 2;
+    }
+
+    // Deterministic pseudo-random values so every run sees the same input
+    std::vector<int> values(n);
+    BenchRandom random(n);
+    for (long i = 0; i < n; i++) {
+        int r = (int)random.next();
+        if (op == "sort") {
+            values[i] = r;
+        } else if (op == "removeDuplicates") {
+            values[i] = r % (n / 2 + 1);
+        } else {
+            values[i] = (int)i;
+        }
+    }
+
+    volatile long sink = 0;
+
+    // One trial on a freshly built list, returning nanoseconds per call
+    auto trial = [&]() -> double {
+        // Build the input with insertAtBeginning so that an expensive
+        // insertAtEnd does not dominate the setup of other operations
+        LinkedList list;
+        for (long i = n - 1; i >= 0; i--) {
+            list.insertAtBeginning(values[i]);
+        }
+
+        long calls = 0;
+        long long elapsed = 0;
+        if (op == "sort" || op == "reverse" || op == "removeDuplicates") {
+            auto start = Clock::now();
+            if (op == "sort") {
+                list.sort();
+            } else if (op == "reverse") {
+                list.reverse();
+            } else {
+                list.removeDuplicates();
+            }
+            elapsed = std::chrono::duration_cast<std::chrono::nanoseconds>(Clock::now() - start).count();
+            calls = 1;
+        } else {
+            // Time batches of doubling length until enough time has been
+            // measured, without letting the list size drift too far from n
+            const long long target_ns = 2000000;
+            long cap = 10000;
+            if (op == "insertAtBeginning" || op == "insertAtEnd") {
+                cap = n;
+            } else if (op == "deleteFromEnd") {
+                cap = n / 2;
+            }
+            if (cap < 1) {
+                cap = 1;
+            }
+
+            long batch = 1;
+            while (elapsed < target_ns && calls < cap) {
+                long count = batch < cap - calls ? batch : cap - calls;
+                auto start = Clock::now();
+                for (long i = 0; i < count; i++) {
+                    if (op == "insertAtBeginning") {
+                        list.insertAtBeginning((int)i);
+                    } else if (op == "insertAtEnd") {
+                        list.insertAtEnd((int)i);
+                    } else if (op == "search") {
+                        sink += list.search(-1) != nullptr;
+                    } else if (op == "getMiddleNode") {
+                        sink += list.getMiddleNode() != nullptr;
+                    } else {
+                        sink += list.deleteFromEnd();
+                    }
+                }
+                elapsed += std::chrono::duration_cast<std::chrono::nanoseconds>(Clock::now() - start).count();
+                calls += count;
+                batch *= 2;
+            }
+        }
+        return (double)elapsed / calls;
+    };
+
+    for (int i = 0; i < warmup; i++) {
+        isolated_trial(trial);
+    }
+
+    std::vector<double> samples;
+    for (int i = 0; i < repetitions; i++) {
+        double ns = isolated_trial(trial);
+        if (ns < 0) {
+            std::cerr << "Benchmark trial failed" << std::endl;
+            return 1;
+        }
+        samples.push_back(ns);
+    }
+
+    std::cout << "{\"op\": \"" << op << "\", \"size\": " << n << ", \"samples_ns\": [";
+    for (int i = 0; i < repetitions; i++) {
+        std::cout << (i ? ", " : "") << samples[i];
+    }
+    std::cout << "]}" << std::endl;
+    return 0;
+""",
+    includes=("<chrono>", "<cstdlib>", "<string>", "<vector>", '"bench_support.h"'),
+    profile="bench",
+)
+
+
+def geometric_sizes(min_size=BENCH_MIN_SIZE, max_size=BENCH_MAX_SIZE, steps_per_decade=2):
+    """Return a geometric range of sizes from min_size up to max_size"""
+    sizes = []
+    size = float(min_size)
+    factor = 10 ** (1.0 / steps_per_decade)
+    while round(size) <= max_size:
+        sizes.append(int(round(size)))
+        size *= factor
+    if sizes and sizes[-1] != max_size:
+        sizes.append(max_size)
+    return sizes
+
+
+def default_cpu():
+    """
+    Return the CPU benchmarks are pinned to, or None to leave them unpinned.
+    """
+    if BENCH_CPU is not None:
+        return None if BENCH_CPU.lower() == "none" else int(BENCH_CPU)
+    if not hasattr(os, "sched_getaffinity"):
+        return None
+    # CPU 0 usually handles most interrupts, so prefer the last one
+    return max(os.sched_getaffinity(0))
+
+
+class BenchmarkRunner:
+    """
+    Run benchmark trials with warm-up, repetitions and noise control.
+
+    Args:
+        executable: Path of the test driver
+        warmup: Number of discarded warm-up trials per measurement
+        repetitions: Number of timed trials per measurement
+        cpu: CPU to pin the driver to, None to leave it unpinned, or
+            "auto" for default_cpu()
+        noise_threshold: Relative MAD above which a measurement is rerun
+        max_reruns: Maximum number of reruns of a noisy measurement
+        timeout: Seconds allowed per trial
+    """
+
+    def __init__(
+        self,
+        executable,
+        warmup=BENCH_WARMUP,
+        repetitions=BENCH_REPETITIONS,
+        cpu="auto",
+        noise_threshold=BENCH_NOISE_THRESHOLD,
+        max_reruns=BENCH_MAX_RERUNS,
+        timeout=BENCH_POINT_TIMEOUT,
+    ):
+        self.executable = executable
+        self.warmup = warmup
+        self.repetitions = repetitions
+        self.cpu = default_cpu() if cpu == "auto" else cpu
+        self.noise_threshold = noise_threshold
+        self.max_reruns = max_reruns
+        self.timeout = timeout
+        self.results = []
+
+    def _pin(self):
+        os.sched_setaffinity(0, {self.cpu})
+
+    def run_trials(self, case, args):
+        """
+        Run one benchmark case and return its output.
+
+        Returns:
+            dict: The JSON line printed by the case, with the samples in
+            nanoseconds under "samples_ns", or None if the run failed or
+            timed out
+        """
+        cmd = [self.executable, "--run", case] + [str(arg) for arg in args]
+        cmd += [str(self.warmup), str(self.repetitions)]
+        preexec_fn = self._pin if self.cpu is not None else None
+        budget = self.timeout * (self.warmup + self.repetitions)
+        limits = DEFAULT_LIMITS._replace(wall_seconds=budget, cpu_seconds=budget)
+        result = run_limited(cmd, limits, preexec_fn=preexec_fn)
+        if result.outcome != "ok":
+            return None
+        # A case that exits cleanly without its JSON line (say, a student's
+        # destructor printing after it) counts as a failed run
+        try:
+            output = json.loads(result.stdout.strip().splitlines()[-1])
+        except (IndexError, json.JSONDecodeError):
+            return None
+        if not isinstance(output, dict) or "samples_ns" not in output:
+            return None
+        return output
+
+    def measure(self, op, size, case="bench", extra=()):
+        """
+        Measure one operation at one size.
+
+        The measurement is rerun while its relative MAD is above the noise
+        threshold, keeping the least noisy attempt.
+
+        Args:
+            op: Operation to measure
+            size: Size of the list
+            case: Benchmark case of the driver
+            extra: Further case arguments, passed after the size
+
+        Returns:
+            dict: {"op", "size", "samples_ns", "stats", "attempts", "noisy"}
+            plus any other fields of the case's output, or None if the run
+            failed or timed out
+        """
+        best = None
+        for attempt in range(1, self.max_reruns + 2):
+            output = self.run_trials(case, [op, size] + list(extra))
+            if output is None:
+                return None
+            stats = summarize(output["samples_ns"])
+            if best is None or stats["rel_mad"] < best["stats"]["rel_mad"]:
+                best = dict(output, op=op, size=size, stats=stats)
+            best["attempts"] = attempt
+            if stats["rel_mad"] <= self.noise_threshold:
+                break
+
+        best["noisy"] = best["stats"]["rel_mad"] > self.noise_threshold
+        self.results.append(best)
+        return best
+
+    def write_report(self, path=BENCH_REPORT, extra=None):
+        """
+        Write every measurement taken so far to a JSON file.
+
+        Args:
+            path: Output file
+            extra: Additional top-level entries for the report
+        """
+        report = {
+            "warmup": self.warmup,
+            "repetitions": self.repetitions,
+            "cpu": self.cpu,
+            "noise_threshold": self.noise_threshold,
+            "measurements": self.results,
+        }
+        report.update(extra or {})
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+def sweep(runner, op, sizes):
+    """
+    Measure one operation over increasing sizes and infer its growth.
+
+    The sweep stops at the first size that fails or runs past the timeout,
+    since every larger size would be slower still.
+
+    Returns:
+        dict: {"op", "points": [[size, median ns], ...], "stopped_at": size
+        or None, "noisy": sizes whose measurement stayed noisy, "class",
+        "slope", "class_slopes"}
+    """
+    points = []
+    noisy = []
+    stopped_at = None
+    for size in sizes:
+        result = runner.measure(op, size)
+        if result is None:
+            stopped_at = size
+            break
+        points.append([size, result["stats"]["median"]])
+        if result["noisy"]:
+            noisy.append(size)
+
+    fit = fit_complexity(points)
+    return {"op": op, "points": points, "stopped_at": stopped_at, "noisy": noisy, **fit}
+
+
+def run_scaling_benchmark(runner, expected, sizes=None, operations=BENCH_OPERATIONS):
+    """
+    Sweep every operation and compare the inferred classes to expectations.
+
+    Args:
+        runner: BenchmarkRunner used for the measurements
+        expected: Mapping of operation name to the slowest acceptable class
+        sizes: Sizes to measure, defaults to geometric_sizes()
+        operations: Operations to benchmark
+
+    Returns:
+        dict: Mapping of operation to its sweep result, with "expected" and
+        "exceeded" added. An operation whose sweep was stopped before three
+        points could be measured counts as exceeded.
+    """
+    if sizes is None:
+        sizes = geometric_sizes()
+
+    report = {}
+    for op in operations:
+        result = sweep(runner, op, sizes)
+        result["expected"] = expected.get(op)
+        if result["class"] is None:
+            result["exceeded"] = result["stopped_at"] is not None
+        elif result["expected"] is None:
+            result["exceeded"] = False
+        else:
+            result["exceeded"] = exceeds(result["class"], result["expected"])
+        report[op] = result
+    return report
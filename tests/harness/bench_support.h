@@ -0,0 +1,76 @@
+// Helpers shared by the benchmark scenarios of the test driver.
+#ifndef BENCH_SUPPORT_H
+#define BENCH_SUPPORT_H
+
+#include <cstdio>
+#include <new>
+
+#ifndef _WIN32
+#include <sys/mman.h>
+#include <sys/wait.h>
+#include <unistd.h>
+#endif
+
+// Deterministic pseudo-random numbers, so every run sees the same input
+struct BenchRandom {
+    unsigned long long state;
+
+    explicit BenchRandom(unsigned long long seed) : state(0x9E3779B97F4A7C15ULL ^ seed) {}
+
+    unsigned int next() {
+        state = state * 6364136223846793005ULL + 1442695040888963407ULL;
+        return (unsigned int)(state >> 33);
+    }
+};
+
+// Run one trial in a forked child and return its result, or -1 if the child
+// failed. Every trial then starts from the same clean heap; otherwise nodes
+// freed by one trial leave the allocator's free lists shuffled and later
+// trials traverse scattered memory.
+template <typename Trial>
+double isolated_trial(Trial trial) {
+#ifdef _WIN32
+    return trial();
+#else
+    int fds[2];
+    if (pipe(fds) != 0) {
+        return -1;
+    }
+    std::fflush(nullptr);
+    pid_t pid = fork();
+    if (pid == 0) {
+        close(fds[0]);
+        double result = trial();
+        ssize_t written = write(fds[1], &result, sizeof(result));
+        _exit(written == (ssize_t)sizeof(result) ? 0 : 1);
+    }
+    close(fds[1]);
+    double result = -1;
+    ssize_t got = pid > 0 ? read(fds[0], &result, sizeof(result)) : -1;
+    close(fds[0]);
+    int status = 0;
+    if (pid < 0 || waitpid(pid, &status, 0) < 0 || !WIFEXITED(status) || WEXITSTATUS(status) != 0 ||
+        got != (ssize_t)sizeof(result)) {
+        return -1;
+    }
+    return result;
+#endif
+}
+
+// Storage shared with the children forked by isolated_trial(), for results a
+// trial reports besides its return value. Returns nullptr on failure.
+template <typename T>
+T* shared_value() {
+#ifdef _WIN32
+    static T value = T();
+    return &value;
+#else
+    void* memory = mmap(nullptr, sizeof(T), PROT_READ | PROT_WRITE, MAP_SHARED | MAP_ANONYMOUS, -1, 0);
+    if (memory == MAP_FAILED) {
+        return nullptr;
+    }
+    return new (memory) T();
+#endif
+}
+
+#endif
@@ -0,0 +1,129 @@
+"""
+Performance budgets checked against the scaling benchmark.
+
+The budget file (tests/perf_budget.json, LL_PERF_BUDGET overrides it) sets
+limits per operation:
+
+    {
+      "operations": {
+        "insertAtEnd": {"max_ns": {"1000000": 50000000}, "hard": false},
+        ...
+      }
+    }
+
+max_ns is the slowest acceptable median time of one call, in nanoseconds,
+at each listed size of the sweep. A size the sweep did not reach because a
+smaller one timed out counts as exceeded. The slowest acceptable complexity
+class is not part of the file: it is the class the scaling benchmark
+expects (EXPECTED_COMPLEXITY in tests/test_linked_list.py, or
+LL_EXPECTED_COMPLEXITY), so the two checks cannot disagree. Each
+operation's budget is hard or soft, and the result of a check is a tier:
+
+    efficient    every budget is met
+    acceptable   only soft budgets are exceeded
+    over-budget  a hard budget is exceeded
+
+Tests record the tier, the violations and compact per-operation metrics;
+scripts/update_review_pool.py copies them into the review pool and can
+withhold admission from over-budget submissions.
+"""
+
+import json
+import os
+
+from harness.complexity import exceeds
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PERF_BUDGET = os.environ.get("LL_PERF_BUDGET", os.path.join(TESTS_DIR, "perf_budget.json"))
+
+TIERS = ["efficient", "acceptable", "over-budget"]
+
+# Fail the budget test, not just record the tier, on a hard violation
+ENFORCE_PERF_BUDGET = os.environ.get("LL_ENFORCE_PERF_BUDGET", "") not in ("", "0")
+
+
+def load_budget(path=PERF_BUDGET):
+    """
+    Load and validate a budget file.
+
+    Raises:
+        ValueError: If an operation sets its own complexity class or a size
+            or time is not a positive number
+    """
+    with open(path, "r") as f:
+        budget = json.load(f)
+    for op, limits in budget.get("operations", {}).items():
+        if "max_class" in limits:
+            raise ValueError(f"{op} sets max_class; complexity classes come from the scaling benchmark's "
+                             "expected classes (EXPECTED_COMPLEXITY or LL_EXPECTED_COMPLEXITY)")
+        for size, ns in limits.get("max_ns", {}).items():
+            if int(size) <= 0 or float(ns) <= 0:
+                raise ValueError(f"Invalid time budget for {op}: {size}: {ns}")
+    return budget
+
+
+def check_budget(budget, scaling_report):
+    """
+    Check a scaling benchmark report against a budget.
+
+    Args:
+        budget: Result of load_budget()
+        scaling_report: Result of harness.bench.run_scaling_benchmark(),
+            whose expected class of each operation is its class budget
+
+    Returns:
+        dict: {"tier", "violations": [{"op", "kind" ("class", "time" or
+        "incomplete"), "hard", "limit", "actual", "size"}], "metrics": {op:
+        {"class", "size", "ns"}}}
+    """
+    violations = []
+    metrics = {}
+    for op, result in scaling_report.items():
+        points = dict((size, ns) for size, ns in result["points"])
+        largest = max(points) if points else None
+        metrics[op] = {
+            "class": result["class"],
+            "size": largest,
+            "ns": points[largest] if largest is not None else None,
+        }
+
+        limits = budget.get("operations", {}).get(op)
+        if not limits:
+            continue
+        hard = bool(limits.get("hard", False))
+
+        max_class = result.get("expected")
+        if max_class and result["class"] and exceeds(result["class"], max_class):
+            violations.append({
+                "op": op, "kind": "class", "hard": hard, "limit": max_class, "actual": result["class"], "size": None,
+            })
+
+        for size, limit in sorted((int(size), float(ns)) for size, ns in limits.get("max_ns", {}).items()):
+            if size in points:
+                if points[size] > limit:
+                    violations.append({
+                        "op": op, "kind": "time", "hard": hard, "limit": limit, "actual": points[size], "size": size,
+                    })
+            elif result["stopped_at"] is not None and result["stopped_at"] <= size:
+                violations.append({
+                    "op": op, "kind": "incomplete", "hard": hard, "limit": limit, "actual": None, "size": size,
+                })
+
+    if any(v["hard"] for v in violations):
+        tier = "over-budget"
+    elif violations:
+        tier = "acceptable"
+    else:
+        tier = "efficient"
+    return {"tier": tier, "violations": violations, "metrics": metrics}
+
+
+def describe_violation(violation):
+    """Return a one-line description of a budget violation"""
+    op = violation["op"]
+    if violation["kind"] == "class":
+        return f"{op} is O({violation['actual']}), budget O({violation['limit']})"
+    if violation["kind"] == "incomplete":
+        return f"{op} did not complete at size {violation['size']}"
+    return f"{op} takes {violation['actual']:.0f}ns at size {violation['size']}, budget {violation['limit']:.0f}ns"
@@ -0,0 +1,138 @@
+// C ABI over the student's LinkedList for in-process differential testing.
+//
+// The shim is compiled together with src/linked_list.cpp into a shared
+// library that harness.differential loads with ctypes. Operations are
+// executed in batches: Python passes a whole program of (opcode, value, arg)
+// triples and gets back one (result, size, empty) triple per operation, so a
+// long random sequence costs a single call across the ABI.
+//
+// Positions are given as arbitrary non-negative numbers and reduced modulo
+// the current size, so every program stays meaningful when operations are
+// removed from it while a failure is being shrunk. The opcodes and the
+// reduction rules must match harness/differential.py.
+#include <climits>
+
+#include "src/linked_list.h"
+
+namespace {
+
+enum Opcode {
+    OP_INSERT_AT_BEGINNING = 0,
+    OP_INSERT_AT_END = 1,
+    OP_INSERT_AT_POSITION = 2,
+    OP_DELETE_FROM_BEGINNING = 3,
+    OP_DELETE_FROM_END = 4,
+    OP_DELETE_FROM_POSITION = 5,
+    OP_DELETE_VALUE = 6,
+    OP_SEARCH = 7,
+    OP_REVERSE = 8,
+    OP_SORT = 9,
+    OP_REMOVE_DUPLICATES = 10,
+    OP_GET_MIDDLE_NODE = 11,
+    OP_CLEAR = 12,
+    OP_DETECT_LOOP = 13,
+};
+
+// Result of an operation that returns no node
+const int MISSING = INT_MIN;
+
+int execute(LinkedList& list, int opcode, int value, int arg) {
+    switch (opcode) {
+    case OP_INSERT_AT_BEGINNING:
+        list.insertAtBeginning(value);
+        return 0;
+    case OP_INSERT_AT_END:
+        list.insertAtEnd(value);
+        return 0;
+    case OP_INSERT_AT_POSITION:
+        // A valid position: 0..size
+        list.insertAtPosition(value, arg % (list.getSize() + 1));
+        return 0;
+    case OP_DELETE_FROM_BEGINNING:
+        return list.deleteFromBeginning();
+    case OP_DELETE_FROM_END:
+        return list.deleteFromEnd();
+    case OP_DELETE_FROM_POSITION:
+        // -1..size, where -1 and size are out of range
+        return list.deleteFromPosition(arg % (list.getSize() + 2) - 1);
+    case OP_DELETE_VALUE:
+        return list.deleteValue(value);
+    case OP_SEARCH: {
+        Node* node = list.search(value);
+        if (node == nullptr) {
+            return 0;
+        }
+        return node->data == value ? 1 : 2;
+    }
+    case OP_REVERSE:
+        list.reverse();
+        return 0;
+    case OP_SORT:
+        list.sort();
+        return 0;
+    case OP_REMOVE_DUPLICATES:
+        list.removeDuplicates();
+        return 0;
+    case OP_GET_MIDDLE_NODE: {
+        Node* node = list.getMiddleNode();
+        return node == nullptr ? MISSING : node->data;
+    }
+    case OP_CLEAR:
+        list.clear();
+        return 0;
+    case OP_DETECT_LOOP:
+        return list.detectLoop();
+    default:
+        return MISSING;
+    }
+}
+
+}  // namespace
+
+extern "C" {
+
+void* ll_create() {
+    return new LinkedList();
+}
+
+void ll_destroy(void* list) {
+    delete static_cast<LinkedList*>(list);
+}
+
+// Run count operations from program (3 ints each) and write 3 ints per
+// operation to results
+void ll_run(void* handle, const int* program, int count, int* results) {
+    LinkedList& list = *static_cast<LinkedList*>(handle);
+    for (int i = 0; i < count; i++) {
+        const int* op = program + 3 * i;
+        int* result = results + 3 * i;
+        result[0] = execute(list, op[0], op[1], op[2]);
+        result[1] = list.getSize();
+        result[2] = list.isEmpty();
+    }
+}
+
+// Copy the list's values to out. Only the public interface is used: a
+// sentinel is inserted at the front, found with search() and removed again
+// after walking the nodes behind it. Returns the number of values, or -1 if
+// the list is longer than capacity (e.g. because it contains a cycle) or the
+// sentinel cannot be found.
+int ll_contents(void* handle, int* out, int capacity) {
+    LinkedList& list = *static_cast<LinkedList*>(handle);
+    list.insertAtBeginning(MISSING);
+    Node* sentinel = list.search(MISSING);
+    if (sentinel == nullptr) {
+        return -1;
+    }
+    int count = 0;
+    for (Node* node = sentinel->next; node != nullptr; node = node->next) {
+        if (count == capacity) {
+            return -1;
+        }
+        out[count++] = node->data;
+    }
+    list.deleteFromBeginning();
+    return count;
+}
+
+}
@@ -0,0 +1,88 @@
+"""
+Empirical complexity inference for benchmark size sweeps.
+
+Fitting exact curves to linked list timings does not work well: once a list
+outgrows the CPU caches, every node visited costs several times more (8x and
+more from L1 to main memory), which bends an O(n) curve to look like
+O(n log n). Instead, the growth of the measurements is summarized by the
+least squares slope of log t against log n, and compared with the slope each
+candidate class f(n) has over the same sizes. A class matches if the
+measured slope is at most SLOPE_MARGIN above its own. The margin absorbs a
+step in the per-node cost of up to about 30x in the middle of the default
+sweep from 100 to 10^6 (more towards either end), while a wrong class (O(n)
+for O(1), O(n^2) for O(n log n)) exceeds the slope of the right one by close
+to 1 or more.
+The inferred class is the slowest growing class that matches.
+"""
+
+import math
+
+# Candidate classes from slowest to fastest growing
+COMPLEXITY_CLASSES = {
+    "1": lambda n: 1.0,
+    "log n": lambda n: math.log2(n),
+    "n": lambda n: float(n),
+    "n log n": lambda n: n * math.log2(n),
+    "n^2": lambda n: float(n) ** 2,
+    "n^3": lambda n: float(n) ** 3,
+}
+CLASS_ORDER = list(COMPLEXITY_CLASSES)
+
+# Largest amount by which the measured log-log slope may exceed a class's
+# own slope for the class to still match. Slopes of adjacent classes differ
+# by at least 0.85 between O(n log n) and O(n^2), but only by about 0.1
+# between O(n) and O(n log n), which caches cannot be told apart from
+SLOPE_MARGIN = 0.5
+
+
+def class_rank(name):
+    """Return the position of a class in CLASS_ORDER, raising on unknown names"""
+    if name not in COMPLEXITY_CLASSES:
+        raise ValueError(f"Unknown complexity class: {name}")
+    return CLASS_ORDER.index(name)
+
+
+def exceeds(inferred, expected):
+    """Return True if the inferred class grows faster than the expected one"""
+    return class_rank(inferred) > class_rank(expected)
+
+
+def loglog_slope(points):
+    """Return the least squares slope of log t against log n"""
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(t) for _, t in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+
+
+def class_slopes(sizes):
+    """Return the log-log slope of every class over the given sizes"""
+    return {name: loglog_slope([(n, f(n)) for n in sizes]) for name, f in COMPLEXITY_CLASSES.items()}
+
+
+def fit_complexity(points, margin=SLOPE_MARGIN):
+    """
+    Infer the complexity class of a set of (size, time) measurements.
+
+    Args:
+        points: Iterable of (n, t) pairs with n >= 2 and t > 0
+        margin: Largest amount by which the measured slope may exceed the
+            slope of the inferred class
+
+    Returns:
+        dict: {"class": inferred class or None if there are fewer than
+        three points, "slope": log-log slope, "class_slopes": slope of
+        every class over the measured sizes}
+    """
+    points = [(n, t) for n, t in points if n >= 2 and t > 0]
+    if len(points) < 3:
+        return {"class": None, "slope": None, "class_slopes": {}}
+
+    slope = loglog_slope(points)
+    slopes = class_slopes([n for n, _ in points])
+    inferred = next((name for name in CLASS_ORDER if slope <= slopes[name] + margin), CLASS_ORDER[-1])
+    return {"class": inferred, "slope": slope, "class_slopes": slopes}
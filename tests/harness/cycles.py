@@ -0,0 +1,222 @@
+"""
+Cycle-injection benchmark for detectLoop and getMiddleNode.
+
+The functional tests only call detectLoop on short acyclic lists, where a
+hash set of visited nodes passes as well as Floyd's two-pointer algorithm.
+This benchmark builds large lists (values 0..n-1, so every node can be found
+through search()), links the tail back to a chosen node through the public
+Node pointers and runs
+
+    detectLoop     on the list with a cycle back to the head, the middle or
+                   the tail node, and on the acyclic list
+    getMiddleNode  on the acyclic list
+
+as "driver --run cycles <operation> <size> <cycle> <warmup> <repetitions>",
+where cycle is "head", "middle", "tail" or "none". Every call is checked for
+the right answer and timed, and the peak heap memory it allocates on top of
+the list is measured through the driver's allocation hooks. The tail's next
+pointer is reset after the calls, before the list's destructor runs.
+
+An operation fails the check when its auxiliary memory at the largest size
+exceeds CYCLES_AUX_SLACK bytes and is larger than at the smallest size, i.e.
+grows with the length of the list.
+"""
+
+import os
+
+from harness.driver import Scenario
+
+# (operation, cycle) combinations measured
+CYCLES_CASES = [
+    ("detectLoop", "none"),
+    ("detectLoop", "head"),
+    ("detectLoop", "middle"),
+    ("detectLoop", "tail"),
+    ("getMiddleNode", "none"),
+]
+
+CYCLES_MIN_SIZE = int(os.environ.get("LL_CYCLES_MIN_SIZE", 10 ** 5))
+CYCLES_MAX_SIZE = int(os.environ.get("LL_CYCLES_MAX_SIZE", 10 ** 7))
+
+# Heap bytes a call may allocate regardless of the list length
+CYCLES_AUX_SLACK = int(os.environ.get("LL_CYCLES_AUX_SLACK", 4096))
+
+CYCLES_WARMUP = int(os.environ.get("LL_CYCLES_WARMUP", 0))
+CYCLES_REPETITIONS = int(os.environ.get("LL_CYCLES_REPETITIONS", 3))
+
+# Seconds a single trial may take, including building the list
+CYCLES_TIMEOUT = float(os.environ.get("LL_CYCLES_TIMEOUT", 20))
+
+CYCLES_SCENARIO = Scenario(
+    "cycles",
+    r"""
+    if (argc < 3) {
+        std::cerr << "usage: cycles <operation> <size> <cycle> [warmup] [repetitions]" << std::endl;
+        return 2;
+    }
+    const std::string op = argv[0];
+    const long n = std::atol(argv[1]);
+    const std::string cycle = argv[2];
+    const int warmup = argc > 3 ? std::atoi(argv[3]) : 0;
+    const int repetitions = argc > 4 ? std::atoi(argv[4]) : 1;
+    typedef std::chrono::steady_clock Clock;
+
+    if (op != "detectLoop" && op != "getMiddleNode") {
+        std::cerr << "Unknown operation: " << op << std::endl;
+        return 2;
+    }
+    if (cycle != "none" && cycle != "head" && cycle != "middle" && cycle != "tail") {
+        std::cerr << "Unknown cycle: " << cycle << std::endl;
+        return 2;
+    }
+    if (op == "getMiddleNode" && cycle != "none") {
+        std::cerr << "getMiddleNode is only defined on acyclic lists" << std::endl;
+        return 2;
+    }
+    if (n < 2) {
+        std::cerr << "size must be at least 2" << std::endl;
+        return 2;
+    }
+
+    // Peak heap bytes allocated by any call, over every trial
+    long long* aux_bytes = shared_value<long long>();
+    if (aux_bytes == nullptr) {
+        std::cerr << "Could not allocate shared memory" << std::endl;
+        return 1;
+    }
+
+    // One trial on a freshly built list, returning nanoseconds per call
+    auto trial = [&]() -> double {
+        LinkedList list;
+        for (long i = n - 1; i >= 0; i--) {
+            list.insertAtBeginning((int)i);
+        }
+        Node* tail = list.search((int)(n - 1));
+        Node* target = nullptr;
+        if (cycle == "head") {
+            target = list.search(0);
+        } else if (cycle == "middle") {
+            target = list.search((int)(n / 2));
+        } else if (cycle == "tail") {
+            target = tail;
+        }
+        if (tail == nullptr || tail->next != nullptr || (cycle != "none" && target == nullptr)) {
+            std::cerr << "Could not find the nodes to link" << std::endl;
+            return -1;
+        }
+        tail->next = target;
+
+        const bool expected = target != nullptr;
+        bool correct = true;
+        long calls = 0;
+        long long elapsed = 0;
+        const long long target_ns = 2000000;
+        while (correct && elapsed < target_ns && calls < 100) {
+            alloc_reset_peak();
+            AllocStats before = alloc_stats();
+            auto start = Clock::now();
+            if (op == "detectLoop") {
+                correct = list.detectLoop() == expected;
+            } else {
+                Node* middle = list.getMiddleNode();
+                correct = middle != nullptr && (middle->data == n / 2 || middle->data == (n - 1) / 2);
+            }
+            elapsed += std::chrono::duration_cast<std::chrono::nanoseconds>(Clock::now() - start).count();
+            AllocStats after = alloc_stats();
+            if (after.peak_bytes - before.live_bytes > *aux_bytes) {
+                *aux_bytes = after.peak_bytes - before.live_bytes;
+            }
+            calls++;
+        }
+
+        // Break the cycle so the destructor sees a terminated list
+        tail->next = nullptr;
+        if (!correct) {
+            std::cerr << op << " gave a wrong answer with cycle " << cycle << std::endl;
+            return -1;
+        }
+        return (double)elapsed / calls;
+    };
+
+    for (int i = 0; i < warmup; i++) {
+        isolated_trial(trial);
+    }
+
+    std::vector<double> samples;
+    for (int i = 0; i < repetitions; i++) {
+        double ns = isolated_trial(trial);
+        if (ns < 0) {
+            std::cerr << "Benchmark trial failed" << std::endl;
+            return 1;
+        }
+        samples.push_back(ns);
+    }
+
+    std::cout << "{\"op\": \"" << op << "\", \"size\": " << n << ", \"cycle\": \"" << cycle
+              << "\", \"aux_bytes\": " << *aux_bytes << ", \"samples_ns\": [";
+    for (int i = 0; i < repetitions; i++) {
+        std::cout << (i ? ", " : "") << samples[i];
+    }
+    std::cout << "]}" << std::endl;
+    return 0;
+""",
+    includes=("<chrono>", "<cstdlib>", "<string>", "<vector>", '"bench_support.h"'),
+    profile="bench",
+)
+
+
+def cycles_sizes(min_size=CYCLES_MIN_SIZE, max_size=CYCLES_MAX_SIZE):
+    """Return the sizes to measure: powers of ten from min_size to max_size"""
+    sizes = []
+    size = min_size
+    while size <= max_size:
+        sizes.append(size)
+        size *= 10
+    return sizes
+
+
+def run_cycles_benchmark(runner, sizes=None, cases=CYCLES_CASES, slack=CYCLES_AUX_SLACK):
+    """
+    Measure every case over increasing sizes.
+
+    A case is not measured at larger sizes once it fails, gives a wrong
+    answer or times out, e.g. on a cycle it never leaves.
+
+    Args:
+        runner: BenchmarkRunner used for the measurements
+        sizes: List sizes, defaults to cycles_sizes()
+        cases: (operation, cycle) pairs to measure
+        slack: Auxiliary heap bytes allowed regardless of the size
+
+    Returns:
+        dict: Mapping of "<operation>.<cycle>" to {"op", "cycle", "points":
+        {size: {"ns", "ns_per_node", "aux_bytes"}}, "failed_at": first size
+        that failed or None, "aux_growth": whether auxiliary memory grows
+        with the size, "flagged"}
+    """
+    if sizes is None:
+        sizes = cycles_sizes()
+
+    report = {}
+    for op, cycle in cases:
+        entry = {"op": op, "cycle": cycle, "points": {}, "failed_at": None, "aux_growth": False}
+        for size in sizes:
+            result = runner.measure(op, size, case="cycles", extra=[cycle])
+            if result is None:
+                entry["failed_at"] = size
+                break
+            median = result["stats"]["median"]
+            entry["points"][size] = {
+                "ns": median,
+                "ns_per_node": median / size,
+                "aux_bytes": result["aux_bytes"],
+            }
+
+        points = entry["points"]
+        if points:
+            smallest = points[min(points)]["aux_bytes"]
+            largest = points[max(points)]["aux_bytes"]
+            entry["aux_growth"] = largest > slack and largest > smallest
+        entry["flagged"] = entry["failed_at"] is not None or entry["aux_growth"]
+        report[f"{op}.{cycle}"] = entry
+    return report
@@ -0,0 +1,501 @@
+"""
+Differential testing of the student's list against a Python reference model.
+
+The student's implementation and capi_shim.cpp are built into a shared
+library that is loaded with ctypes, so long random operation sequences run
+without a compile or a process spawn per test. Each sequence is executed by
+the library in one call, and its per-operation results are then replayed
+against ReferenceList. The first sequence that diverges is shrunk to a
+minimal failing program.
+
+The student's code can crash or hang, so the sequences run in a child
+process under resource limits:
+
+    python -m harness.differential run <library> [--seed S] ...
+    python -m harness.differential replay <library> <program.json>
+
+The child announces every sequence before running it and every smaller
+failing program it finds while shrinking, so the parent can carry on
+shrinking in fresh processes if the child dies. Programs are lists of
+[opcode, value, arg] triples; see capi_shim.cpp for how arg is turned into
+a position.
+"""
+
+import argparse
+import ctypes
+import json
+import os
+import random
+import sys
+import time
+
+from harness.build import ObjectCache, profile_flags
+from harness.limits import DEFAULT_LIMITS, run_limited
+from harness.memory import HARNESS_DIR
+from harness.scheduler import compile_driver, link_program, scratch_dir
+
+CAPI_SHIM_CPP = os.path.join(HARNESS_DIR, "capi_shim.cpp")
+TESTS_DIR = os.path.dirname(HARNESS_DIR)
+LIBRARY_NAME = "linked_list_capi"
+
+DIFF_SEED = int(os.environ.get("LL_DIFF_SEED", 1))
+DIFF_SEQUENCES = int(os.environ.get("LL_DIFF_SEQUENCES", 500))
+DIFF_LENGTH = int(os.environ.get("LL_DIFF_LENGTH", 400))
+# Runs of the library allowed for shrinking a crash in fresh processes
+DIFF_SHRINK_RUNS = int(os.environ.get("LL_DIFF_SHRINK_RUNS", 200))
+
+# Lists stay short and values few so duplicates and edge cases are common
+MAX_SIZE = 48
+VALUE_RANGE = 16
+CONTENTS_CAPACITY = 4096
+
+# Limits of one replay while shrinking a crash
+REPLAY_LIMITS = DEFAULT_LIMITS._replace(wall_seconds=5, cpu_seconds=5)
+
+SEQUENCE_PREFIX = "@@SEQ "
+MINIMAL_PREFIX = "@@MIN "
+
+# Result of an operation that returns no node (INT_MIN)
+MISSING = -(2 ** 31)
+
+# (name, takes a value, takes a position, weight), indexed by opcode
+OPERATIONS = [
+    ("insertAtBeginning", True, False, 6),
+    ("insertAtEnd", True, False, 6),
+    ("insertAtPosition", True, True, 6),
+    ("deleteFromBeginning", False, False, 3),
+    ("deleteFromEnd", False, False, 3),
+    ("deleteFromPosition", False, True, 3),
+    ("deleteValue", True, False, 3),
+    ("search", True, False, 3),
+    ("reverse", False, False, 2),
+    ("sort", False, False, 2),
+    ("removeDuplicates", False, False, 2),
+    ("getMiddleNode", False, False, 2),
+    ("clear", False, False, 1),
+    ("detectLoop", False, False, 1),
+]
+(
+    INSERT_AT_BEGINNING,
+    INSERT_AT_END,
+    INSERT_AT_POSITION,
+    DELETE_FROM_BEGINNING,
+    DELETE_FROM_END,
+    DELETE_FROM_POSITION,
+    DELETE_VALUE,
+    SEARCH,
+    REVERSE,
+    SORT,
+    REMOVE_DUPLICATES,
+    GET_MIDDLE_NODE,
+    CLEAR,
+    DETECT_LOOP,
+) = range(len(OPERATIONS))
+
+# Operations that never grow the list, used once it reaches MAX_SIZE
+_SHRINKING = [DELETE_FROM_BEGINNING, DELETE_FROM_END, DELETE_FROM_POSITION, DELETE_VALUE, REMOVE_DUPLICATES, CLEAR]
+
+
+class ReferenceList:
+    """
+    Python model of the expected behaviour of LinkedList.
+
+    removeDuplicates keeps the first occurrence of every value. For an even
+    number of nodes either middle node is accepted from getMiddleNode.
+    """
+
+    def __init__(self):
+        self.items = []
+
+    def apply(self, opcode, value, arg):
+        """
+        Apply one operation.
+
+        Returns:
+            tuple: Results the implementation may return (see capi_shim.cpp)
+        """
+        items = self.items
+        size = len(items)
+        if opcode == INSERT_AT_BEGINNING:
+            items.insert(0, value)
+        elif opcode == INSERT_AT_END:
+            items.append(value)
+        elif opcode == INSERT_AT_POSITION:
+            items.insert(arg % (size + 1), value)
+        elif opcode == DELETE_FROM_BEGINNING:
+            if not items:
+                return (0,)
+            del items[0]
+            return (1,)
+        elif opcode == DELETE_FROM_END:
+            if not items:
+                return (0,)
+            items.pop()
+            return (1,)
+        elif opcode == DELETE_FROM_POSITION:
+            position = arg % (size + 2) - 1
+            if not 0 <= position < size:
+                return (0,)
+            del items[position]
+            return (1,)
+        elif opcode == DELETE_VALUE:
+            if value not in items:
+                return (0,)
+            items.remove(value)
+            return (1,)
+        elif opcode == SEARCH:
+            return (1,) if value in items else (0,)
+        elif opcode == REVERSE:
+            items.reverse()
+        elif opcode == SORT:
+            items.sort()
+        elif opcode == REMOVE_DUPLICATES:
+            self.items = list(dict.fromkeys(items))
+        elif opcode == GET_MIDDLE_NODE:
+            if not items:
+                return (MISSING,)
+            if size % 2:
+                return (items[size // 2],)
+            return (items[size // 2 - 1], items[size // 2])
+        elif opcode == CLEAR:
+            items.clear()
+        return (0,)
+
+
+def describe(program):
+    """
+    Render a program as C++ calls, with positions resolved to the values
+    passed to the implementation.
+    """
+    model = ReferenceList()
+    steps = []
+    for opcode, value, arg in program:
+        name, takes_value, _, _ = OPERATIONS[opcode]
+        size = len(model.items)
+        args = []
+        if takes_value:
+            args.append(value)
+        if opcode == INSERT_AT_POSITION:
+            args.append(arg % (size + 1))
+        elif opcode == DELETE_FROM_POSITION:
+            args.append(arg % (size + 2) - 1)
+        steps.append(f"list.{name}({', '.join(str(a) for a in args)});")
+        model.apply(opcode, value, arg)
+    return steps
+
+
+def generate_program(rng, length=DIFF_LENGTH, max_size=MAX_SIZE, value_range=VALUE_RANGE):
+    """
+    Generate a random program of length operations.
+
+    Returns:
+        list: [opcode, value, arg] triples
+    """
+    opcodes = list(range(len(OPERATIONS)))
+    weights = [operation[3] for operation in OPERATIONS]
+    model = ReferenceList()
+    program = []
+    for opcode in rng.choices(opcodes, weights, k=length):
+        if len(model.items) >= max_size:
+            opcode = rng.choice(_SHRINKING)
+        op = [opcode, rng.randrange(value_range), rng.randrange(2 ** 30)]
+        model.apply(*op)
+        program.append(op)
+    return program
+
+
+def check(program, results, contents):
+    """
+    Compare a library run of a program with the reference model.
+
+    Args:
+        program: The program that was run
+        results: Flat (result, size, empty) triples, one per operation
+        contents: Values left in the list, or None if they could not be read
+
+    Returns:
+        tuple: (index, message) of the first divergence, or None
+    """
+    model = ReferenceList()
+    for index, (opcode, value, arg) in enumerate(program):
+        accepted = model.apply(opcode, value, arg)
+        result, size, empty = results[3 * index:3 * index + 3]
+        name = OPERATIONS[opcode][0]
+        expected_size = len(model.items)
+        if result not in accepted:
+            shown = "nullptr" if result == MISSING else result
+            return index, f"{name} returned {shown}, expected {' or '.join(map(str, accepted))}"
+        if size != expected_size:
+            return index, f"getSize() is {size} after {name}, expected {expected_size}"
+        if bool(empty) != (expected_size == 0):
+            return index, f"isEmpty() is {bool(empty)} after {name} with {expected_size} nodes"
+    if contents != model.items:
+        shown = "unreadable (cycle or lost head)" if contents is None else contents
+        return len(program) - 1, f"list holds {shown}, expected {model.items}"
+    return None
+
+
+class NativeList:
+    """
+    ctypes binding of the C API library.
+
+    Args:
+        path: Path of the shared library
+    """
+
+    def __init__(self, path):
+        library = ctypes.CDLL(os.path.abspath(path))
+        library.ll_create.restype = ctypes.c_void_p
+        library.ll_destroy.argtypes = [ctypes.c_void_p]
+        library.ll_run.argtypes = [
+            ctypes.c_void_p,
+            ctypes.POINTER(ctypes.c_int),
+            ctypes.c_int,
+            ctypes.POINTER(ctypes.c_int),
+        ]
+        library.ll_contents.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.c_int]
+        self.library = library
+        self.buffer = (ctypes.c_int * CONTENTS_CAPACITY)()
+
+    def run(self, program):
+        """
+        Run a program on a new list.
+
+        Returns:
+            tuple: (results, contents) as taken by check()
+        """
+        flat = [field for op in program for field in op]
+        count = len(program)
+        results = (ctypes.c_int * (3 * count))()
+        handle = self.library.ll_create()
+        self.library.ll_run(handle, (ctypes.c_int * len(flat))(*flat), count, results)
+        length = self.library.ll_contents(handle, self.buffer, CONTENTS_CAPACITY)
+        contents = self.buffer[:length] if length >= 0 else None
+        self.library.ll_destroy(handle)
+        return results[:], contents
+
+    def divergence(self, program):
+        """Return the first divergence of a program (see check())"""
+        return check(program, *self.run(program))
+
+
+def shrink(program, fails, budget=None, on_smaller=None):
+    """
+    Shrink a failing program by removing ever smaller chunks of operations.
+
+    Args:
+        program: Failing program
+        fails: Function returning whether a program still fails
+        budget: Maximum number of calls to fails, None for no limit
+        on_smaller: Called with every smaller failing program found
+
+    Returns:
+        list: The smallest failing program found
+    """
+    runs = 0
+    chunk = max(len(program) // 2, 1)
+    while True:
+        removed = False
+        start = 0
+        while start < len(program):
+            if budget is not None and runs >= budget:
+                return program
+            candidate = program[:start] + program[start + chunk:]
+            runs += 1
+            if candidate and fails(candidate):
+                program = candidate
+                removed = True
+                if on_smaller is not None:
+                    on_smaller(program)
+            else:
+                start += chunk
+        if chunk == 1 and not removed:
+            return program
+        if not removed:
+            chunk //= 2
+
+
+def _sequence_rng(seed, index):
+    return random.Random(f"{seed}:{index}")
+
+
+def _emit(prefix, payload):
+    print(prefix + json.dumps(payload), flush=True)
+
+
+def _run_command(args):
+    native = NativeList(args.library)
+    ops = 0
+    failure = None
+    start = time.perf_counter()
+    for index in range(args.sequences):
+        _emit(SEQUENCE_PREFIX, index)
+        program = generate_program(_sequence_rng(args.seed, index), args.length)
+        ops += len(program)
+        divergence = native.divergence(program)
+        if divergence is not None:
+            failure = (index, program[:divergence[0] + 1])
+            break
+    seconds = time.perf_counter() - start
+
+    report = {"ops": ops, "seconds": seconds, "failure": None}
+    if failure is not None:
+        index, program = failure
+        _emit(MINIMAL_PREFIX, program)
+        program = shrink(
+            program,
+            lambda candidate: native.divergence(candidate) is not None,
+            on_smaller=lambda smaller: _emit(MINIMAL_PREFIX, smaller),
+        )
+        report["failure"] = {
+            "sequence": index,
+            "program": program,
+            "message": native.divergence(program)[1],
+        }
+    print(json.dumps(report), flush=True)
+    return 0
+
+
+def _replay_command(args):
+    with open(args.program) as f:
+        program = json.load(f)
+    divergence = NativeList(args.library).divergence(program)
+    if divergence is None:
+        return 0
+    print(divergence[1])
+    return 1
+
+
+def build_library(implementation, root=None, include_dir=None):
+    """
+    Build the student's implementation and the C API shim into a shared
+    library.
+
+    Args:
+        implementation: Path of the student's .cpp file
+        root: Scratch root, defaults to this process's root
+        include_dir: Directory holding src/linked_list.h, defaults to the
+            working directory
+
+    Returns:
+        tuple: (library_path, errors), library_path is None on failure
+    """
+    flags = profile_flags("shared")
+    implementation_obj, errors = ObjectCache().build(implementation, flags)
+    if implementation_obj is None:
+        return None, errors
+    with open(CAPI_SHIM_CPP) as f:
+        shim_obj, errors = compile_driver(LIBRARY_NAME, f.read(), root, include_dir, flags)
+    if shim_obj is None:
+        return None, errors
+    return link_program(LIBRARY_NAME, [shim_obj, implementation_obj], root, flags + ["-shared"])
+
+
+def _child(command, library, *args, limits=DEFAULT_LIMITS):
+    cmd = [sys.executable, "-m", "harness.differential", command, os.path.abspath(library)]
+    return run_limited(cmd + [str(arg) for arg in args], limits, cwd=TESTS_DIR)
+
+
+def _replay(library, program, root=None):
+    path = os.path.join(scratch_dir(LIBRARY_NAME, root), "replay.json")
+    with open(path, "w") as f:
+        json.dump(program, f)
+    return _child("replay", library, path, limits=REPLAY_LIMITS)
+
+
+def _last_payload(stdout, prefix):
+    payload = None
+    for line in stdout.splitlines():
+        if line.startswith(prefix):
+            payload = json.loads(line[len(prefix):])
+    return payload
+
+
+def run_differential(library, seed=DIFF_SEED, sequences=DIFF_SEQUENCES, length=DIFF_LENGTH, limits=DEFAULT_LIMITS):
+    """
+    Run random programs against the library and the reference model.
+
+    Args:
+        library: Path of the library built by build_library()
+        seed: Seed of the random programs
+        sequences: Number of programs
+        length: Operations per program
+        limits: ResourceLimits of the child process
+
+    Returns:
+        dict: {"ops", "ops_per_second", "outcome", "failure"}. failure is
+        None if every program matched the model, otherwise a dictionary with
+        the minimal failing "program", its "steps" as C++ calls and a
+        "message"; outcome tells whether the failure was a divergence
+        ("diverged") or the child process crashed, timed out or ran out of
+        memory.
+    """
+    result = _child("run", library, "--seed", seed, "--sequences", sequences, "--length", length, limits=limits)
+    lines = result.stdout.strip().splitlines()
+    report = None
+    if result.outcome == "ok" and lines:
+        report = json.loads(lines[-1])
+
+    if report is not None:
+        summary = {
+            "ops": report["ops"],
+            "ops_per_second": report["ops"] / report["seconds"] if report["seconds"] else None,
+            "outcome": "ok" if report["failure"] is None else "diverged",
+            "failure": report["failure"],
+        }
+        if report["failure"] is not None:
+            report["failure"]["steps"] = describe(report["failure"]["program"])
+        return summary
+
+    # The child died: shrink what it was running in fresh processes
+    program = _last_payload(result.stdout, MINIMAL_PREFIX)
+    if program is None:
+        index = _last_payload(result.stdout, SEQUENCE_PREFIX) or 0
+        program = generate_program(_sequence_rng(seed, index), length)
+    last = {"result": result}
+
+    def fails(candidate):
+        replay = _replay(library, candidate)
+        if replay.outcome != "ok":
+            last["result"] = replay
+            return True
+        return False
+
+    if fails(program):
+        program = shrink(program, fails, budget=DIFF_SHRINK_RUNS)
+    failing = last["result"]
+    message = (failing.stdout.strip() if failing.outcome == "failed" else "") or failing.stderr.strip()[-2000:]
+    return {
+        "ops": None,
+        "ops_per_second": None,
+        "outcome": result.outcome,
+        "failure": {
+            "program": program,
+            "steps": describe(program),
+            "message": f"{failing.outcome} (exit {failing.returncode}): {message}",
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run random programs and shrink the first failure")
+    run.add_argument("library")
+    run.add_argument("--seed", default=DIFF_SEED)
+    run.add_argument("--sequences", type=int, default=DIFF_SEQUENCES)
+    run.add_argument("--length", type=int, default=DIFF_LENGTH)
+
+    replay = commands.add_parser("replay", help="Run one program, exit 1 if it diverges")
+    replay.add_argument("library")
+    replay.add_argument("program")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        return _run_command(args)
+    return _replay_command(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
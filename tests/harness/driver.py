@@ -0,0 +1,330 @@
+"""
+Generation of the multiplexed C++ test driver.
+
+All scenarios are compiled into a single driver binary, each as a named case
+function. The driver is invoked as:
+
+    driver --list                  print the names of all cases
+    driver --all                   run every case
+    driver <case> [<case> ...]     run the given cases
+    driver --run <case> [args]     run one case in-process with arguments
+
+When running several cases, each one is forked into its own process so a
+crash in one case cannot hide the results of the others. Each forked case
+runs under its own resource limits (see harness.limits): the child sets its
+CPU and address space rlimits, and the driver kills it once its wall-clock
+limit expires and reports its resource usage. The output of every
+case is framed by marker lines on both stdout and stderr, which
+parse_case_output() splits back into per-case results. The driver is linked
+with the allocation hooks (see harness.memory), and every forked case ends its
+output with an allocation report labelled with the case's name.
+"""
+
+import json
+import re
+from collections import namedtuple
+
+from harness.limits import DEFAULT_LIMITS, classify
+
+# A named test case. body is the C++ body of a function with the signature
+# int (int argc, char** argv); includes lists extra headers it needs, profile
+# names the build profile (see harness.build) its driver is built with and
+# limits holds its ResourceLimits (None for DEFAULT_LIMITS).
+Scenario = namedtuple("Scenario", ["name", "body", "includes", "profile", "limits"])
+Scenario.__new__.__defaults__ = ((), "check", None)
+
+BASE_INCLUDES = ("<iostream>", "<cassert>", '"src/linked_list.h"', '"alloc_hooks.h"')
+
+CASE_BEGIN = "@@CASE"
+CASE_END = "@@END"
+
+_DRIVER_MAIN = r"""
+struct DriverCase {
+    const char* name;
+    int (*run)(int argc, char** argv);
+    double wall_seconds;      // 0 for no limit
+    long cpu_seconds;         // 0 for no limit
+    long long memory_bytes;   // 0 for no limit
+};
+
+static const DriverCase CASES[] = {
+%(case_table)s
+};
+static const int NUM_CASES = sizeof(CASES) / sizeof(CASES[0]);
+
+static const DriverCase* find_case(const char* name) {
+    for (int i = 0; i < NUM_CASES; i++) {
+        if (std::strcmp(CASES[i].name, name) == 0) {
+            return &CASES[i];
+        }
+    }
+    return nullptr;
+}
+
+static void emit(const char* text) {
+    std::cout << text << std::flush;
+    std::cerr << text << std::flush;
+}
+
+// Run one case in a child process under its limits and report how it ended
+static void run_isolated(const DriverCase& c) {
+    std::string begin = std::string("%(begin)s ") + c.name + "\n";
+    emit(begin.c_str());
+    std::fflush(nullptr);
+
+    std::string status;
+    std::string usage = "{}";
+#ifdef _WIN32
+    status = "exit " + std::to_string(c.run(0, nullptr));
+#else
+    auto start = std::chrono::steady_clock::now();
+    pid_t pid = fork();
+    if (pid == 0) {
+        if (c.cpu_seconds > 0) {
+            struct rlimit cpu = {(rlim_t)c.cpu_seconds, (rlim_t)c.cpu_seconds + 1};
+            setrlimit(RLIMIT_CPU, &cpu);
+        }
+        if (c.memory_bytes > 0) {
+            struct rlimit memory = {(rlim_t)c.memory_bytes, (rlim_t)c.memory_bytes};
+            setrlimit(RLIMIT_AS, &memory);
+        }
+        std::cout.setf(std::ios::unitbuf);
+        // The peak is measured from the case's own start, not the parent's
+        alloc_reset_peak();
+        AllocStats before = alloc_stats();
+        int code = c.run(0, nullptr);
+        alloc_report(c.name, before, alloc_stats());
+        std::cout.flush();
+        std::cerr.flush();
+        std::fflush(nullptr);
+        _exit(code);
+    }
+
+    int wstatus = 0;
+    struct rusage ru;
+    std::memset(&ru, 0, sizeof(ru));
+    bool timed_out = false;
+    pid_t waited = pid < 0 ? -1 : 0;
+    while (waited == 0) {
+        waited = wait4(pid, &wstatus, WNOHANG, &ru);
+        if (waited != 0) {
+            break;
+        }
+        double elapsed = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+        if (c.wall_seconds > 0 && elapsed > c.wall_seconds) {
+            kill(pid, SIGKILL);
+            waited = wait4(pid, &wstatus, 0, &ru);
+            timed_out = true;
+            break;
+        }
+        usleep(1000);
+    }
+    double wall = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+    if (waited < 0) {
+        status = "error 0";
+    } else if (timed_out) {
+        status = "timeout " + std::to_string(SIGKILL);
+    } else if (WIFSIGNALED(wstatus)) {
+        status = "signal " + std::to_string(WTERMSIG(wstatus));
+    } else {
+        status = "exit " + std::to_string(WEXITSTATUS(wstatus));
+    }
+    usage = "{\"wall_s\": " + std::to_string(wall) +
+            ", \"user_s\": " + std::to_string(ru.ru_utime.tv_sec + ru.ru_utime.tv_usec / 1e6) +
+            ", \"sys_s\": " + std::to_string(ru.ru_stime.tv_sec + ru.ru_stime.tv_usec / 1e6) +
+            ", \"max_rss_kb\": " + std::to_string(ru.ru_maxrss) + "}";
+#endif
+
+    std::string end = std::string("\n%(end)s ") + c.name + " " + status + " " + usage + "\n";
+    emit(end.c_str());
+}
+
+int main(int argc, char** argv) {
+    if (argc < 2 || std::strcmp(argv[1], "--list") == 0) {
+        for (int i = 0; i < NUM_CASES; i++) {
+            std::cout << CASES[i].name << "\n";
+        }
+        return argc < 2 ? 2 : 0;
+    }
+
+    if (std::strcmp(argv[1], "--run") == 0) {
+        const DriverCase* c = argc > 2 ? find_case(argv[2]) : nullptr;
+        if (c == nullptr) {
+            std::cerr << "Unknown case" << std::endl;
+            return 2;
+        }
+        return c->run(argc - 3, argv + 3);
+    }
+
+    if (std::strcmp(argv[1], "--all") == 0) {
+        for (int i = 0; i < NUM_CASES; i++) {
+            run_isolated(CASES[i]);
+        }
+        return 0;
+    }
+
+    int status = 0;
+    for (int i = 1; i < argc; i++) {
+        const DriverCase* c = find_case(argv[i]);
+        if (c == nullptr) {
+            std::cerr << "Unknown case: " << argv[i] << std::endl;
+            status = 2;
+            continue;
+        }
+        run_isolated(*c);
+    }
+    return status;
+}
+"""
+
+_DRIVER_SYSTEM_INCLUDES = (
+    "<chrono>",
+    "<cstdio>",
+    "<cstring>",
+    "<string>",
+)
+
+_CASE_LINE = re.compile(r"^(%s|%s) (\S+)(?: (\w+) (-?\d+)(?: (\{.*\}))?)?$" % (CASE_BEGIN, CASE_END))
+
+# Outcome of one case from a multi-case run. returncode follows the
+# subprocess convention: the exit code, or minus the signal number. outcome
+# and usage are as described in harness.limits.
+CaseOutput = namedtuple("CaseOutput", ["stdout", "stderr", "returncode", "outcome", "usage"])
+
+
+def case_function(name):
+    """Return the C++ function name generated for a case"""
+    return "case_" + re.sub(r"\W", "_", name)
+
+
+def case_limits(scenario, memory_limit=True):
+    """
+    Return the limits a scenario runs under.
+
+    Args:
+        scenario: The Scenario
+        memory_limit: Whether an address space limit can be applied; it
+            cannot for AddressSanitizer builds, which reserve a huge shadow
+            mapping up front
+    """
+    limits = scenario.limits or DEFAULT_LIMITS
+    if not memory_limit:
+        limits = limits._replace(memory_bytes=None)
+    return limits
+
+
+def generate_driver(scenarios, memory_limit=True):
+    """
+    Generate the source of a driver holding every scenario.
+
+    Args:
+        scenarios: Iterable of Scenario
+        memory_limit: Whether to apply the scenarios' address space limits
+
+    Returns:
+        str: C++ source of the driver
+    """
+    scenarios = list(scenarios)
+    includes = []
+    for include in _DRIVER_SYSTEM_INCLUDES + BASE_INCLUDES:
+        includes.append(include)
+    for scenario in scenarios:
+        for include in scenario.includes:
+            if include not in includes:
+                includes.append(include)
+
+    lines = [f"#include {include}" for include in includes]
+    lines += [
+        "#ifndef _WIN32",
+        "#include <csignal>",
+        "#include <sys/resource.h>",
+        "#include <sys/wait.h>",
+        "#include <unistd.h>",
+        "#endif",
+        "",
+    ]
+
+    for scenario in scenarios:
+        lines.append(f"static int {case_function(scenario.name)}(int argc, char** argv) {{")
+        lines.append("    (void)argc;")
+        lines.append("    (void)argv;")
+        lines.append(scenario.body.rstrip())
+        lines.append("}")
+        lines.append("")
+
+    table = []
+    for scenario in scenarios:
+        limits = case_limits(scenario, memory_limit)
+        table.append(
+            f'    {{"{scenario.name}", {case_function(scenario.name)}, '
+            f'{float(limits.wall_seconds or 0)}, {int(limits.cpu_seconds or 0)}, '
+            f'{int(limits.memory_bytes or 0)}LL}},'
+        )
+    case_table = "\n".join(table)
+    lines.append(_DRIVER_MAIN % {"case_table": case_table, "begin": CASE_BEGIN, "end": CASE_END})
+    return "\n".join(lines)
+
+
+def _split_stream(text):
+    """Split one framed output stream into {case: (text, status, value, usage)}"""
+    cases = {}
+    current = None
+    collected = []
+    for line in text.splitlines(keepends=True):
+        match = _CASE_LINE.match(line.rstrip("\n"))
+        if match and match.group(1) == CASE_BEGIN and current is None:
+            current = match.group(2)
+            collected = []
+        elif match and match.group(1) == CASE_END and match.group(2) == current:
+            # The driver writes a newline before the end marker in case the
+            # case's own output did not end with one
+            body = "".join(collected)
+            if body.endswith("\n"):
+                body = body[:-1]
+            usage = json.loads(match.group(5)) if match.group(5) else {}
+            cases[current] = (body, match.group(3), int(match.group(4)), usage)
+            current = None
+        elif current is not None:
+            collected.append(line)
+
+    if current is not None:
+        # The driver itself died while a case was running
+        cases[current] = ("".join(collected), None, None, {})
+    return cases
+
+
+def parse_case_output(stdout, stderr, limits=None):
+    """
+    Split the output of a multi-case driver run into per-case results.
+
+    Args:
+        stdout: Captured standard output of the driver
+        stderr: Captured standard error of the driver
+        limits: Mapping of case name to the ResourceLimits it ran under,
+            used to classify how each case ended
+
+    Returns:
+        dict: Mapping of case name to CaseOutput. Cases that did not finish
+        have a returncode of None.
+    """
+    out_cases = _split_stream(stdout)
+    err_cases = _split_stream(stderr)
+
+    results = {}
+    for name, (out_text, status, value, usage) in out_cases.items():
+        err_text = err_cases.get(name, ("", None, None, {}))[0]
+        case_limit = (limits or {}).get(name, DEFAULT_LIMITS)
+        if status == "exit":
+            returncode = value
+        elif status in ("signal", "timeout"):
+            returncode = -value
+        else:
+            returncode = None
+
+        if returncode is None:
+            outcome = "crashed"
+        else:
+            outcome = classify(returncode, err_text, usage, case_limit, status == "timeout")
+        results[name] = CaseOutput(out_text, err_text, returncode, outcome, usage)
+    return results
@@ -0,0 +1,186 @@
+"""
+Resource limits and outcome classification for test programs.
+
+Every program the harness runs is bounded in wall-clock time, CPU time
+(RLIMIT_CPU) and address space (RLIMIT_AS). A program that hits a limit is
+killed and reported with a structured outcome instead of a generic failure:
+
+    "ok"       exited with status 0
+    "failed"   exited with a non-zero status
+    "crashed"  killed by a signal
+    "timeout"  ran past its wall-clock or CPU time limit
+    "oom"      ran out of its address space limit
+
+together with its resource usage when it ended (from os.wait4, which returns
+the resource.getrusage() figures of that one child).
+"""
+
+import os
+import signal
+import subprocess
+import threading
+import time
+from collections import namedtuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Limits for one program. A value of None leaves that resource unlimited.
+ResourceLimits = namedtuple("ResourceLimits", ["wall_seconds", "cpu_seconds", "memory_bytes"])
+
+DEFAULT_LIMITS = ResourceLimits(
+    wall_seconds=float(os.environ.get("LL_WALL_LIMIT", 60)),
+    cpu_seconds=float(os.environ.get("LL_CPU_LIMIT", 60)),
+    memory_bytes=int(os.environ.get("LL_MEMORY_LIMIT", 2 * 1024 ** 3)),
+)
+
+# Result of a limited run. usage holds wall_s, user_s, sys_s and max_rss_kb.
+RunResult = namedtuple("RunResult", ["stdout", "stderr", "returncode", "outcome", "usage"])
+
+OOM_MESSAGES = ("std::bad_alloc", "out of memory", "Cannot allocate memory")
+
+
+def _set_rlimits(limits):
+    """Apply CPU and address space limits to the current process"""
+    if limits.cpu_seconds:
+        cpu = max(int(limits.cpu_seconds + 0.999), 1)
+        # The soft limit sends SIGXCPU, the hard limit a second later SIGKILL
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    if limits.memory_bytes:
+        resource.setrlimit(resource.RLIMIT_AS, (limits.memory_bytes, limits.memory_bytes))
+
+
+def classify(returncode, stderr, usage, limits, timed_out=False):
+    """
+    Classify how a program ended.
+
+    Args:
+        returncode: Exit code, or minus the signal number
+        stderr: Captured standard error
+        usage: Resource usage dictionary (see RunResult)
+        limits: ResourceLimits the program ran under
+        timed_out: Whether the program was killed for exceeding its
+            wall-clock limit
+
+    Returns:
+        str: One of "ok", "failed", "crashed", "timeout" or "oom"
+    """
+    if timed_out:
+        return "timeout"
+    if returncode == 0:
+        return "ok"
+
+    cpu_used = (usage or {}).get("user_s", 0) + (usage or {}).get("sys_s", 0)
+    if returncode == -getattr(signal, "SIGXCPU", -1000):
+        return "timeout"
+    if returncode == -signal.SIGKILL and limits.cpu_seconds and cpu_used >= limits.cpu_seconds:
+        return "timeout"
+
+    if any(message in (stderr or "") for message in OOM_MESSAGES):
+        return "oom"
+    max_rss = (usage or {}).get("max_rss_kb", 0) * 1024
+    if limits.memory_bytes and max_rss >= 0.9 * limits.memory_bytes:
+        return "oom"
+
+    return "crashed" if returncode < 0 else "failed"
+
+
+def _usage(rusage, wall):
+    return {
+        "wall_s": round(wall, 6),
+        "user_s": rusage.ru_utime,
+        "sys_s": rusage.ru_stime,
+        # ru_maxrss is in kilobytes on Linux
+        "max_rss_kb": rusage.ru_maxrss,
+    }
+
+
+def run_limited(cmd, limits=DEFAULT_LIMITS, cwd=None, preexec_fn=None):
+    """
+    Run a command under resource limits.
+
+    The command runs in its own process group, so the whole group is killed
+    when the wall-clock limit expires.
+
+    Args:
+        cmd: Command and arguments
+        limits: ResourceLimits to apply
+        cwd: Working directory
+        preexec_fn: Extra setup run in the child before the command
+
+    Returns:
+        RunResult: Output, return code, outcome and resource usage
+    """
+    if resource is None:
+        # No rlimits or wait4 outside POSIX; only the wall-clock limit applies
+        start = time.monotonic()
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd, timeout=limits.wall_seconds)
+        except subprocess.TimeoutExpired as e:
+            usage = {"wall_s": time.monotonic() - start}
+            return RunResult(e.stdout or "", e.stderr or "", None, "timeout", usage)
+        usage = {"wall_s": time.monotonic() - start}
+        outcome = classify(result.returncode, result.stderr, usage, limits)
+        return RunResult(result.stdout, result.stderr, result.returncode, outcome, usage)
+
+    def setup():
+        _set_rlimits(limits)
+        if preexec_fn is not None:
+            preexec_fn()
+
+    start = time.monotonic()
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd,
+        start_new_session=True,
+        preexec_fn=setup,
+    )
+
+    output = {}
+
+    def read(name, stream):
+        output[name] = stream.read()
+        stream.close()
+
+    readers = [
+        threading.Thread(target=read, args=("stdout", proc.stdout)),
+        threading.Thread(target=read, args=("stderr", proc.stderr)),
+    ]
+    for reader in readers:
+        reader.start()
+
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    timer = None
+    if limits.wall_seconds:
+        timer = threading.Timer(limits.wall_seconds, kill)
+        timer.start()
+
+    _, status, rusage = os.wait4(proc.pid, 0)
+    wall = time.monotonic() - start
+    if timer is not None:
+        timer.cancel()
+    # Reap anything left in the process group (e.g. forked cases) so the
+    # output pipes close
+    if timed_out.is_set():
+        kill()
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    for reader in readers:
+        reader.join()
+
+    stdout = output.get("stdout", b"").decode(errors="replace")
+    stderr = output.get("stderr", b"").decode(errors="replace")
+    usage = _usage(rusage, wall)
+    outcome = classify(proc.returncode, stderr, usage, limits, timed_out.is_set())
+    return RunResult(stdout, stderr, proc.returncode, outcome, usage)
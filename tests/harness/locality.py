@@ -0,0 +1,234 @@
+"""
+Pointer-chasing benchmark comparing node layouts in memory.
+
+A list built by inserting into a fresh heap gets its nodes from consecutive
+addresses, so traversals stream through memory and the hardware prefetcher
+hides most of the cost. After the heap has seen churn, the nodes of a list
+are scattered and every step of a traversal can miss the caches. This
+benchmark builds the same list in two layouts:
+
+    sequential   nodes allocated back to back on a fresh heap
+    fragmented   node-sized blocks are first allocated interleaved with
+                 junk blocks of random sizes, then freed in shuffled order,
+                 so the list is built from a free list in random address
+                 order with junk between the nodes
+
+and times traversal-bound operations (search for a missing value, reverse,
+getMiddleNode and sort) as "driver --run locality <operation> <size>
+<layout> <warmup> <repetitions>". Results are in nanoseconds per node: the
+time of one call divided by the list size. The sizes are one that fits in
+the L2 cache and one several times the size of the last-level cache.
+"""
+
+import glob
+import os
+
+from harness.driver import Scenario
+
+LOCALITY_OPERATIONS = ["search", "reverse", "getMiddleNode", "sort"]
+LOCALITY_LAYOUTS = ["sequential", "fragmented"]
+
+# Bytes of heap used per node, including allocator and allocation hook
+# headers, used to turn cache sizes into list sizes
+NODE_FOOTPRINT = 48
+
+# The large size covers this many times the last-level cache, capped at
+# LL_LOCALITY_MAX_SIZE nodes
+LLC_MULTIPLE = 4
+LOCALITY_MAX_SIZE = int(os.environ.get("LL_LOCALITY_MAX_SIZE", 1 << 21))
+
+# Each trial builds a list of millions of nodes, so fewer are run than for
+# the scaling benchmark
+LOCALITY_WARMUP = int(os.environ.get("LL_LOCALITY_WARMUP", 0))
+LOCALITY_REPETITIONS = int(os.environ.get("LL_LOCALITY_REPETITIONS", 3))
+
+LOCALITY_SCENARIO = Scenario(
+    "locality",
+    r"""
+    if (argc < 3) {
+        std::cerr << "usage: locality <operation> <size> <layout> [warmup] [repetitions]" << std::endl;
+        return 2;
+    }
+    const std::string op = argv[0];
+    const long n = std::atol(argv[1]);
+    const std::string layout = argv[2];
+    const int warmup = argc > 3 ? std::atoi(argv[3]) : 0;
+    const int repetitions = argc > 4 ? std::atoi(argv[4]) : 1;
+    typedef std::chrono::steady_clock Clock;
+
+    if (op != "search" && op != "reverse" && op != "getMiddleNode" && op != "sort") {
+        std::cerr << "Unknown operation: " << op << std::endl;
+        return 2;
+    }
+    if (layout != "sequential" && layout != "fragmented") {
+        std::cerr << "Unknown layout: " << layout << std::endl;
+        return 2;
+    }
+
+    std::vector<int> values(n);
+    BenchRandom random(n);
+    for (long i = 0; i < n; i++) {
+        values[i] = (int)(random.next() & 0x7FFFFFFF);
+    }
+
+    volatile long sink = 0;
+
+    // One trial on a freshly built list, returning nanoseconds per node
+    auto trial = [&]() -> double {
+        std::vector<char*> junk;
+        if (layout == "fragmented") {
+            BenchRandom shuffle(n * 7919 + 1);
+            junk.reserve(n / 4 + 16);
+            std::vector<Node*> pool(n);
+            for (long i = 0; i < n; i++) {
+                pool[i] = new Node(0);
+                if (shuffle.next() % 4 == 0) {
+                    junk.push_back(new char[16 + shuffle.next() % 112]);
+                }
+            }
+            for (long i = n - 1; i > 0; i--) {
+                long j = shuffle.next() % (i + 1);
+                Node* swapped = pool[i];
+                pool[i] = pool[j];
+                pool[j] = swapped;
+            }
+            // The allocator hands freed blocks out again last in, first out
+            for (long i = 0; i < n; i++) {
+                delete pool[i];
+            }
+        }
+
+        // The trial runs in a child that exits without freeing anything,
+        // which saves tearing down millions of scattered nodes
+        LinkedList& list = *new LinkedList();
+        for (long i = n - 1; i >= 0; i--) {
+            list.insertAtBeginning(values[i]);
+        }
+
+        long calls = 0;
+        long long elapsed = 0;
+        if (op == "sort") {
+            auto start = Clock::now();
+            list.sort();
+            elapsed = std::chrono::duration_cast<std::chrono::nanoseconds>(Clock::now() - start).count();
+            calls = 1;
+        } else {
+            // Traversals leave the layout unchanged (reverse twice restores
+            // it), so repeat them until enough time has been measured
+            const long long target_ns = 2000000;
+            while (elapsed < target_ns && calls < 1000) {
+                auto start = Clock::now();
+                if (op == "search") {
+                    sink += list.search(-1) != nullptr;
+                } else if (op == "reverse") {
+                    list.reverse();
+                } else {
+                    sink += list.getMiddleNode() != nullptr;
+                }
+                elapsed += std::chrono::duration_cast<std::chrono::nanoseconds>(Clock::now() - start).count();
+                calls++;
+            }
+        }
+        return (double)elapsed / calls / (n > 0 ? n : 1);
+    };
+
+    for (int i = 0; i < warmup; i++) {
+        isolated_trial(trial);
+    }
+
+    std::vector<double> samples;
+    for (int i = 0; i < repetitions; i++) {
+        double ns = isolated_trial(trial);
+        if (ns < 0) {
+            std::cerr << "Benchmark trial failed" << std::endl;
+            return 1;
+        }
+        samples.push_back(ns);
+    }
+
+    std::cout << "{\"op\": \"" << op << "\", \"size\": " << n << ", \"layout\": \"" << layout
+              << "\", \"samples_ns\": [";
+    for (int i = 0; i < repetitions; i++) {
+        std::cout << (i ? ", " : "") << samples[i];
+    }
+    std::cout << "]}" << std::endl;
+    return 0;
+""",
+    includes=("<chrono>", "<cstdlib>", "<string>", "<vector>", '"bench_support.h"'),
+    profile="bench",
+)
+
+
+def _parse_cache_size(text):
+    text = text.strip().upper()
+    for suffix, scale in (("K", 1024), ("M", 1024 ** 2), ("G", 1024 ** 3)):
+        if text.endswith(suffix):
+            return int(text[:-1]) * scale
+    return int(text)
+
+
+def cache_sizes():
+    """
+    Return the data cache sizes of CPU 0 in bytes, keyed by level.
+
+    Read from sysfs; empty where it is not available.
+    """
+    sizes = {}
+    for directory in glob.glob("/sys/devices/system/cpu/cpu0/cache/index*"):
+        try:
+            with open(os.path.join(directory, "type")) as f:
+                if f.read().strip() == "Instruction":
+                    continue
+            with open(os.path.join(directory, "level")) as f:
+                level = int(f.read())
+            with open(os.path.join(directory, "size")) as f:
+                sizes[level] = _parse_cache_size(f.read())
+        except (OSError, ValueError):
+            continue
+    return sizes
+
+
+def locality_sizes(max_size=LOCALITY_MAX_SIZE):
+    """
+    Return the list sizes to measure: one that fits in the L2 cache and one
+    LLC_MULTIPLE times the last-level cache, capped at max_size.
+    """
+    sizes = cache_sizes()
+    l2 = sizes.get(2, 256 * 1024)
+    llc = sizes[max(sizes)] if sizes else 32 * 1024 * 1024
+    small = max(l2 // (4 * NODE_FOOTPRINT), 1000)
+    large = min(LLC_MULTIPLE * llc // NODE_FOOTPRINT, max_size)
+    return [small, large] if large > small else [small]
+
+
+def run_locality_benchmark(runner, sizes=None, operations=LOCALITY_OPERATIONS):
+    """
+    Measure every operation in both layouts.
+
+    Args:
+        runner: BenchmarkRunner used for the measurements
+        sizes: List sizes, defaults to locality_sizes()
+        operations: Operations to measure
+
+    Returns:
+        dict: Mapping of operation to {size: {"sequential": ns per node,
+        "fragmented": ns per node, "ratio": fragmented / sequential}}, with
+        None for measurements that failed or timed out
+    """
+    if sizes is None:
+        sizes = locality_sizes()
+
+    report = {}
+    for op in operations:
+        report[op] = {}
+        for size in sizes:
+            point = {}
+            for layout in LOCALITY_LAYOUTS:
+                result = runner.measure(op, size, case="locality", extra=[layout])
+                point[layout] = None if result is None else result["stats"]["median"]
+            if point["sequential"] and point["fragmented"]:
+                point["ratio"] = point["fragmented"] / point["sequential"]
+            else:
+                point["ratio"] = None
+            report[op][size] = point
+    return report
@@ -0,0 +1,34 @@
+"""
+Parsing of the allocation reports printed by the test driver.
+
+The driver is linked with alloc_hooks.cpp, which counts every call to the
+global operator new and operator delete. Each scenario run by the driver ends
+with a report labelled with the scenario's name, and scenarios can report
+individual operations with an AllocScope. Every report is one line of the form
+"@@ALLOC {json}" on standard output.
+"""
+
+import json
+import os
+
+ALLOC_PREFIX = "@@ALLOC "
+
+HARNESS_DIR = os.path.dirname(os.path.abspath(__file__))
+ALLOC_HOOKS_CPP = os.path.join(HARNESS_DIR, "alloc_hooks.cpp")
+
+
+def parse_alloc_reports(stdout):
+    """
+    Extract the allocation reports from a scenario's output.
+
+    Returns:
+        dict: Mapping of report label to its counters (allocations,
+        deallocations, bytes, live_bytes, live_blocks, peak_bytes). Later
+        reports with the same label replace earlier ones.
+    """
+    reports = {}
+    for line in (stdout or "").splitlines():
+        if line.startswith(ALLOC_PREFIX):
+            report = json.loads(line[len(ALLOC_PREFIX):])
+            reports[report.pop("label")] = report
+    return reports
@@ -0,0 +1,303 @@
+"""
+Results cache for incremental grading.
+
+Grading verdicts are cached under keys built from everything that can change
+them:
+
+- the submission key covers the student's source files (everything under
+  src/), the harness (this package, tests/conftest.py and the JSON
+  configuration files in tests/), every test module, the toolchain
+  versions, the build profiles' flags and the LL_* environment variables
+  that change what the tests check (sizes, limits, LL_SANITIZE, ...). A
+  submission with a cached verdict does not need to be graded again.
+- each test's key covers the student's sources, the harness, the toolchain,
+  the test function and every module-level constant, function or fixture it
+  references. A test whose key matches a cached pass is skipped, so editing
+  one test only reruns the tests that depend on what changed.
+
+The cache is one JSON file, by default .grading_cache/results.json in the
+working directory (LL_RESULTS_CACHE overrides it, "off" disables it). Updates
+are read-merge-write under a file lock with an atomic rename, so concurrent
+grading sessions can share the file.
+"""
+
+import datetime
+import hashlib
+import inspect
+import json
+import os
+import platform
+import sys
+import tempfile
+import types
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from harness.build import BUILD_PROFILES, compiler_version
+
+SRC_DIR = "src"
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HARNESS_DIR = os.path.join(TESTS_DIR, "harness")
+
+RESULTS_CACHE = os.environ.get("LL_RESULTS_CACHE", os.path.join(".grading_cache", "results.json"))
+
+HARNESS_EXTENSIONS = (".py", ".cpp", ".h", ".json")
+
+# LL_* variables that only move caches and reports or set parallelism, and
+# so are left out of the keys: a verdict does not depend on them
+UNKEYED_VARIABLES = frozenset([
+    "LL_BENCH_CPU",
+    "LL_BENCH_REPORT",
+    "LL_BRANCH",
+    "LL_BUILD_CACHE",
+    "LL_BUILD_CACHE_MAX_BYTES",
+    "LL_ISSUE_WORKERS",
+    "LL_RESULTS_CACHE",
+    "LL_RESULTS_DB",
+    "LL_REVIEWER_INDEX",
+    "LL_SIGNATURE_CACHE",
+    "LL_WORKERS",
+])
+
+# LL_* variables naming a file whose contents are keyed as well
+KEYED_FILE_VARIABLES = ("LL_EXPECTED_COMPLEXITY", "LL_PERF_BUDGET")
+
+
+def _hash_tree(digest, directory, extensions=None):
+    """Add every file below directory (sorted by path) to a digest"""
+    if not os.path.isdir(directory):
+        digest.update(b"<missing>\0")
+        return
+    for base, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            if extensions and not name.endswith(extensions):
+                continue
+            path = os.path.join(base, name)
+            digest.update(os.path.relpath(path, directory).encode() + b"\0")
+            with open(path, "rb") as f:
+                digest.update(f.read())
+            digest.update(b"\0")
+
+
+def toolchain_version():
+    """Return a description of the compiler, Python and pytest versions"""
+    try:
+        import pytest
+        pytest_version = pytest.__version__
+    except ImportError:
+        pytest_version = ""
+    return "\n".join([compiler_version(), sys.version, platform.machine(), pytest_version])
+
+
+def source_key(student_dir="."):
+    """Return a hash of the student's sources (everything under src/)"""
+    digest = hashlib.sha256()
+    _hash_tree(digest, os.path.join(student_dir, SRC_DIR))
+    return digest.hexdigest()
+
+
+def settings(environ=None):
+    """
+    Return a description of the settings a verdict depends on besides the
+    files: the flags of every build profile and the sorted LL_* environment
+    variables not in UNKEYED_VARIABLES, with the contents of the files named
+    by KEYED_FILE_VARIABLES.
+    """
+    environ = os.environ if environ is None else environ
+    variables = {
+        name: value for name, value in environ.items()
+        if name.startswith("LL_") and name not in UNKEYED_VARIABLES
+    }
+    files = {}
+    for name in KEYED_FILE_VARIABLES:
+        if name in variables:
+            try:
+                with open(variables[name], "rb") as f:
+                    files[name] = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                files[name] = None
+    return json.dumps({"profiles": BUILD_PROFILES, "environment": variables, "files": files}, sort_keys=True)
+
+
+def base_key(student_dir="."):
+    """
+    Return the part of every key shared by all tests: the student's
+    sources, the harness, the toolchain and the settings.
+    """
+    digest = hashlib.sha256()
+    _hash_tree(digest, os.path.join(student_dir, SRC_DIR))
+    _hash_tree(digest, HARNESS_DIR, HARNESS_EXTENSIONS)
+    for name in sorted(os.listdir(TESTS_DIR)):
+        if name == "conftest.py" or name.endswith(".json"):
+            with open(os.path.join(TESTS_DIR, name), "rb") as f:
+                digest.update(name.encode() + b"\0" + f.read())
+    digest.update(toolchain_version().encode())
+    digest.update(settings().encode())
+    return digest.hexdigest()
+
+
+def submission_key(student_dir="."):
+    """
+    Return the key of a whole submission: the shared inputs plus every test
+    module.
+
+    Args:
+        student_dir: Checkout of the student's branch
+    """
+    digest = hashlib.sha256(base_key(student_dir).encode())
+    for name in sorted(os.listdir(TESTS_DIR)):
+        if name.startswith("test_") and name.endswith(".py"):
+            with open(os.path.join(TESTS_DIR, name), "rb") as f:
+                digest.update(name.encode() + b"\0" + f.read())
+    return digest.hexdigest()
+
+
+def selection_key(markexpr="", keyword=""):
+    """Describe the tests selected for a run by its -m and -k expressions"""
+    return f"{markexpr}\0{keyword}"
+
+
+def verdict_key(student_dir=".", selection=selection_key()):
+    """
+    Return the key a submission's verdict is stored under.
+
+    Args:
+        student_dir: Checkout of the student's branch
+        selection: Result of selection_key() for the run, since a partial
+            run has its own verdict
+    """
+    digest = hashlib.sha256(submission_key(student_dir).encode())
+    digest.update(selection.encode())
+    return digest.hexdigest()
+
+
+def _unwrap(obj):
+    """Return the function behind a pytest fixture definition"""
+    return getattr(obj, "__wrapped__", obj)
+
+
+def _describe(obj):
+    """Return a stable text description of a module-level object"""
+    obj = _unwrap(obj)
+    if isinstance(obj, (types.FunctionType, type)):
+        try:
+            return inspect.getsource(obj)
+        except (OSError, TypeError):
+            return repr(getattr(obj, "__code__", obj))
+    return repr(obj)
+
+
+def key_for_test(function, base, argnames=()):
+    """
+    Return the key of one test.
+
+    The key covers the test function, every module-level name it uses and,
+    recursively, the names those use. Fixture arguments are resolved to the
+    module-level fixture functions of the same name.
+
+    Args:
+        function: The test function
+        base: Result of base_key()
+        argnames: Names of the fixtures the test requests
+    """
+    function = _unwrap(function)
+    module_globals = function.__globals__
+    digest = hashlib.sha256(base.encode())
+
+    seen = set()
+    pending = [function]
+    pending += [module_globals[name] for name in argnames if name in module_globals]
+    while pending:
+        obj = _unwrap(pending.pop())
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        digest.update(_describe(obj).encode())
+        digest.update(b"\0")
+
+        if isinstance(obj, types.FunctionType) and obj.__globals__ is module_globals:
+            names = list(obj.__code__.co_names) + list(obj.__code__.co_varnames[:obj.__code__.co_argcount])
+            for const in obj.__code__.co_consts:
+                if isinstance(const, types.CodeType):
+                    names += list(const.co_names)
+            for name in names:
+                value = module_globals.get(name)
+                if value is None or isinstance(value, types.ModuleType):
+                    continue
+                pending.append(value)
+
+    return digest.hexdigest()
+
+
+class ResultsCache:
+    """
+    JSON file of cached test outcomes and submission verdicts.
+
+    Args:
+        path: Cache file, "off" to disable caching
+    """
+
+    def __init__(self, path=RESULTS_CACHE):
+        self.enabled = path != "off"
+        self.path = path
+        self.data = self._read() if self.enabled else self._empty()
+
+    @staticmethod
+    def _empty():
+        return {"tests": {}, "submissions": {}}
+
+    def _read(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return self._empty()
+        data.setdefault("tests", {})
+        data.setdefault("submissions", {})
+        return data
+
+    def test_result(self, key):
+        """Return the cached outcome of a test key, or None"""
+        return self.data["tests"].get(key)
+
+    def verdict(self, key):
+        """Return the cached verdict of a submission key, or None"""
+        return self.data["submissions"].get(key)
+
+    def update(self, tests=None, submissions=None):
+        """
+        Merge new entries into the cache file.
+
+        The file is re-read under an exclusive lock before merging, so
+        entries written by concurrent sessions are kept.
+
+        Args:
+            tests: Mapping of test key to outcome entry
+            submissions: Mapping of submission key to verdict entry
+        """
+        if not self.enabled:
+            return
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        with open(self.path + ".lock", "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            data = self._read()
+            data["tests"].update(tests or {})
+            data["submissions"].update(submissions or {})
+
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        self.data = data
+
+
+def now():
+    """Return the current time as an ISO 8601 string"""
+    return datetime.datetime.now().isoformat()
@@ -0,0 +1,296 @@
+"""
+Persistent database of benchmark results.
+
+Every benchmark measurement is stored in a local SQLite database, keyed by
+student branch, source hash, operation, list size and build profile, so
+results survive the test session and can be compared over time and across
+the cohort. Rerunning an unchanged submission replaces its results.
+
+When a result is recorded it is compared with the best earlier result of the
+same branch for the same operation, size and profile, and flagged as a
+regression if it is significantly worse: slower by more than
+REGRESSION_FACTOR, and by more than NOISE_MADS times the larger of the two
+measurements' median absolute deviations.
+
+The database is .grading_cache/benchmarks.sqlite in the working directory by
+default (LL_RESULTS_DB overrides it, "off" disables it). The branch is taken
+from LL_BRANCH, then GITHUB_HEAD_REF or GITHUB_REF_NAME, then git.
+scripts/bench_history.py queries it.
+"""
+
+import os
+import re
+import sqlite3
+import subprocess
+import time
+
+from harness.results_cache import source_key
+from harness.stats import percentile
+
+RESULTS_DB = os.environ.get("LL_RESULTS_DB", os.path.join(".grading_cache", "benchmarks.sqlite"))
+
+REGRESSION_FACTOR = float(os.environ.get("LL_REGRESSION_FACTOR", 1.5))
+NOISE_MADS = 3.0
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    branch TEXT NOT NULL,
+    source_hash TEXT NOT NULL,
+    op TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    profile TEXT NOT NULL,
+    median_ns REAL NOT NULL,
+    mad_ns REAL NOT NULL DEFAULT 0,
+    min_ns REAL,
+    p95_ns REAL,
+    samples INTEGER NOT NULL DEFAULT 1,
+    noisy INTEGER NOT NULL DEFAULT 0,
+    recorded_at REAL NOT NULL,
+    regression REAL,
+    PRIMARY KEY (branch, source_hash, op, size, profile)
+);
+CREATE INDEX IF NOT EXISTS results_by_op ON results (op, size, profile);
+CREATE INDEX IF NOT EXISTS results_by_branch ON results (branch, op, size, profile, recorded_at);
+"""
+
+_COLUMNS = ("branch", "source_hash", "op", "size", "profile", "median_ns", "mad_ns", "min_ns", "p95_ns", "samples",
+            "noisy", "recorded_at", "regression")
+
+# "Time to sort 1000 elements: 3ms" lines printed by the performance scenario
+_TIMING_LINE = re.compile(r"^Time to (\w+)(?: for)?(?: (\d+))? elements: (\d+)ms$")
+
+
+def current_branch():
+    """Return the branch being graded, or "local" if it cannot be told"""
+    for variable in ("LL_BRANCH", "GITHUB_HEAD_REF", "GITHUB_REF_NAME"):
+        if os.environ.get(variable):
+            return os.environ[variable]
+    try:
+        result = subprocess.run(["git", "rev-parse", "--abbrev-ref", "HEAD"], capture_output=True, text=True)
+    except OSError:
+        return "local"
+    branch = result.stdout.strip()
+    return branch if result.returncode == 0 and branch != "HEAD" else "local"
+
+
+def parse_timing_lines(stdout, size, prefix=""):
+    """
+    Turn the "Time to ..." lines of the performance scenario into results.
+
+    Args:
+        stdout: Output of the scenario
+        size: Size used when a line does not name one
+        prefix: Prefix of the operation names, keeping them apart from the
+            benchmark runner's per-call measurements
+
+    Returns:
+        list: Measurements in the format of BenchmarkRunner.results
+    """
+    measurements = []
+    for line in (stdout or "").splitlines():
+        match = _TIMING_LINE.match(line.strip())
+        if match:
+            ns = int(match.group(3)) * 1e6
+            measurements.append({
+                "op": prefix + match.group(1),
+                "size": int(match.group(2) or size),
+                "stats": {"n": 1, "median": ns, "mad": 0.0, "min": ns, "p95": ns},
+                "noisy": False,
+            })
+    return measurements
+
+
+def is_regression(result, best, factor=REGRESSION_FACTOR, noise_mads=NOISE_MADS):
+    """
+    Return whether a result is significantly worse than a previous best.
+
+    Args:
+        result: Row or dictionary with median_ns and mad_ns
+        best: Previous best, in the same form
+    """
+    if best["median_ns"] <= 0:
+        # Below the resolution of the measurement, no ratio can be taken
+        return False
+    slowdown = result["median_ns"] - best["median_ns"]
+    noise = noise_mads * max(result["mad_ns"], best["mad_ns"])
+    return result["median_ns"] > factor * best["median_ns"] and slowdown > noise
+
+
+class ResultsDB:
+    """
+    SQLite store of benchmark results.
+
+    Args:
+        path: Path of the database file, created on first use
+    """
+
+    def __init__(self, path=RESULTS_DB):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Concurrent grading sessions may write at the same time
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+            self.connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self):
+        self.connection.close()
+
+    def best(self, branch, op, size, profile, exclude_source=None):
+        """Return the fastest earlier result of a branch, or None"""
+        return self.connection.execute(
+            "SELECT * FROM results WHERE branch = ? AND op = ? AND size = ? AND profile = ? "
+            "AND source_hash != ? ORDER BY median_ns LIMIT 1",
+            (branch, op, size, profile, exclude_source or ""),
+        ).fetchone()
+
+    def record(self, measurements, profile, branch=None, source=None, recorded_at=None):
+        """
+        Store measurements and flag regressions.
+
+        Args:
+            measurements: Dictionaries with "op", "size" and "stats" (see
+                BenchmarkRunner.measure())
+            profile: Build profile the measurements were taken with
+            branch: Branch name, defaults to current_branch()
+            source: Source hash, defaults to source_key()
+            recorded_at: Timestamp, defaults to now
+
+        Returns:
+            list: One dictionary per regression with op, size, profile,
+            median_ns, best_ns and ratio
+        """
+        branch = branch or current_branch()
+        source = source or source_key()
+        recorded_at = recorded_at or time.time()
+        regressions = []
+        with self.connection:
+            for measurement in measurements:
+                stats = measurement["stats"]
+                row = {
+                    "median_ns": stats["median"],
+                    "mad_ns": stats.get("mad", 0.0),
+                }
+                op, size = measurement["op"], measurement["size"]
+                best = self.best(branch, op, size, profile, exclude_source=source)
+                ratio = None
+                if best is not None and is_regression(row, best):
+                    ratio = row["median_ns"] / best["median_ns"]
+                    regressions.append({
+                        "op": op,
+                        "size": size,
+                        "profile": profile,
+                        "median_ns": row["median_ns"],
+                        "best_ns": best["median_ns"],
+                        "ratio": ratio,
+                    })
+                self.connection.execute(
+                    f"INSERT OR REPLACE INTO results ({', '.join(_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    (
+                        branch,
+                        source,
+                        op,
+                        size,
+                        profile,
+                        row["median_ns"],
+                        row["mad_ns"],
+                        stats.get("min"),
+                        stats.get("p95"),
+                        stats.get("n", 1),
+                        int(bool(measurement.get("noisy"))),
+                        recorded_at,
+                        ratio,
+                    ),
+                )
+        return regressions
+
+    def merge(self, path):
+        """
+        Copy every result of another database into this one.
+
+        Results with the same key (branch, source, operation, size and
+        profile) are replaced, as rerunning the submission would.
+
+        Returns:
+            int: Number of results copied
+        """
+        columns = ", ".join(_COLUMNS)
+        self.connection.execute("ATTACH DATABASE ? AS other", (path,))
+        try:
+            with self.connection:
+                return self.connection.execute(
+                    f"INSERT OR REPLACE INTO results ({columns}) SELECT {columns} FROM other.results"
+                ).rowcount
+        finally:
+            self.connection.execute("DETACH DATABASE other")
+
+    def history(self, branch, op=None, size=None, profile=None):
+        """Return a branch's results in the order they were recorded"""
+        query = "SELECT * FROM results WHERE branch = ?"
+        params = [branch]
+        for column, value in (("op", op), ("size", size), ("profile", profile)):
+            if value is not None:
+                query += f" AND {column} = ?"
+                params.append(value)
+        query += " ORDER BY recorded_at, op, size"
+        return self.connection.execute(query, params).fetchall()
+
+    def latest(self, op, size, profile):
+        """Return the most recent result of every branch for one measurement"""
+        return self.connection.execute(
+            "SELECT r.* FROM results r JOIN ("
+            "    SELECT branch, MAX(recorded_at) AS recorded_at FROM results"
+            "    WHERE op = ? AND size = ? AND profile = ? GROUP BY branch"
+            ") l ON r.branch = l.branch AND r.recorded_at = l.recorded_at "
+            "WHERE r.op = ? AND r.size = ? AND r.profile = ? ORDER BY r.median_ns",
+            (op, size, profile, op, size, profile),
+        ).fetchall()
+
+    def cohort(self, op, size, profile, percentiles=(10, 25, 50, 75, 90)):
+        """
+        Summarize the cohort's latest results for one measurement.
+
+        Returns:
+            dict: {"branches", "percentiles": {p: median_ns}, "ranking":
+            [(branch, median_ns)] fastest first}, or None without results
+        """
+        rows = self.latest(op, size, profile)
+        if not rows:
+            return None
+        medians = sorted(row["median_ns"] for row in rows)
+        return {
+            "branches": len(rows),
+            "percentiles": {p: percentile(medians, p) for p in percentiles},
+            "ranking": [(row["branch"], row["median_ns"]) for row in rows],
+        }
+
+    def regressions(self, branch=None):
+        """Return the flagged results, of one branch or of every branch"""
+        query = "SELECT * FROM results WHERE regression IS NOT NULL"
+        params = []
+        if branch is not None:
+            query += " AND branch = ?"
+            params.append(branch)
+        return self.connection.execute(query + " ORDER BY recorded_at DESC", params).fetchall()
+
+    def measurements(self):
+        """Return every distinct (op, size, profile) in the database"""
+        return [
+            tuple(row)
+            for row in self.connection.execute(
+                "SELECT DISTINCT op, size, profile FROM results ORDER BY profile, op, size"
+            )
+        ]
+
+
+def open_results_db(path=RESULTS_DB):
+    """Return the ResultsDB at path, or None if the database is disabled"""
+    if path.lower() == "off":
+        return None
+    return ResultsDB(path)
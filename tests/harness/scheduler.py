@@ -0,0 +1,324 @@
+"""
+Parallel, collision-free build and run scheduler for test programs.
+
+Each test program gets its own scratch directory under a per-process root, so
+nothing is written to the working directory and concurrent runs (including
+pytest-xdist workers) never share files. The scheduler compiles the student's
+implementation and the multiplexed scenario driver at the same time in a
+process pool, then runs the scenarios in parallel, spread over one driver
+process per worker. Scenarios are grouped by build profile, and one driver is
+built per profile. Every program runs under resource limits (see
+harness.limits) and every scenario reports how it ended and what it used.
+"""
+
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from harness.build import CXX, CXX_FLAGS, ObjectCache, profile_flags
+from harness.driver import case_limits, generate_driver, parse_case_output
+from harness.limits import DEFAULT_LIMITS, ResourceLimits, run_limited
+from harness.memory import ALLOC_HOOKS_CPP, HARNESS_DIR
+
+EXE_SUFFIX = ".exe" if platform.system() == "Windows" else ""
+
+DRIVER_NAME = "driver"
+
+# Outcome of building and running one scenario. compile_errors is empty when
+# the driver built; stdout/stderr/returncode are None if it did not, and
+# returncode is None if the driver died before the scenario finished. outcome
+# and usage are as described in harness.limits.
+CaseResult = namedtuple(
+    "CaseResult",
+    ["name", "built", "compile_errors", "stdout", "stderr", "returncode", "outcome", "usage"],
+)
+
+# Extra wall-clock time a driver gets on top of the limits of its cases
+DRIVER_WALL_SLACK = 10.0
+
+_scratch_root = None
+
+
+def available_cpus():
+    """
+    Return the number of workers to use: LL_WORKERS if set, otherwise the
+    number of CPUs this process may run on.
+    """
+    if os.environ.get("LL_WORKERS"):
+        return max(int(os.environ["LL_WORKERS"]), 1)
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def scratch_root():
+    """
+    Return this process's scratch root, creating it on first use.
+
+    The root is unique per process so parallel test sessions never collide.
+    """
+    global _scratch_root
+    if _scratch_root is None or not os.path.isdir(_scratch_root):
+        _scratch_root = tempfile.mkdtemp(prefix="linked-list-tests-")
+    return _scratch_root
+
+
+def scratch_dir(name, root=None):
+    """Return (and create) the scratch directory for one test program"""
+    directory = os.path.join(root or scratch_root(), name)
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def cleanup_scratch():
+    """Remove every file created by the scheduler in this process"""
+    global _scratch_root
+    if _scratch_root is not None:
+        shutil.rmtree(_scratch_root, ignore_errors=True)
+        _scratch_root = None
+
+
+def executable_path(name, root=None):
+    """Return the path of a test program's executable"""
+    return os.path.join(scratch_dir(name, root), name + EXE_SUFFIX)
+
+
+def compile_driver(name, code, root=None, include_dir=None, flags=()):
+    """
+    Compile the source of one test program into an object file.
+
+    Args:
+        name: Name of the test program
+        code: C++ source of the test driver
+        root: Scratch root, defaults to this process's root
+        include_dir: Directory added to the include path so drivers can
+            include "src/linked_list.h", defaults to the working directory.
+            The harness directory is always on the include path.
+        flags: Extra compiler flags, such as those of a build profile
+
+    Returns:
+        tuple: (object_path, errors), object_path is None on failure
+    """
+    directory = scratch_dir(name, root)
+    source = os.path.join(directory, f"{name}.cpp")
+    obj = os.path.join(directory, f"{name}.o")
+    with open(source, "w") as f:
+        f.write(code)
+
+    cmd = [CXX] + CXX_FLAGS + list(flags)
+    cmd += ["-I", include_dir or os.getcwd(), "-I", HARNESS_DIR, "-c", source, "-o", obj]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None, result.stderr
+    return obj, ""
+
+
+def link_program(name, objects, root=None, flags=()):
+    """
+    Link object files into a test program's executable.
+
+    Args:
+        name: Name of the test program
+        objects: Object files to link
+        root: Scratch root, defaults to this process's root
+        flags: Extra linker flags, which must match the flags the objects
+            were compiled with for LTO and sanitizer builds
+
+    Returns:
+        tuple: (executable_path, errors), executable_path is None on failure
+    """
+    executable = executable_path(name, root)
+    cmd = [CXX] + CXX_FLAGS + list(flags) + ["-o", executable] + list(objects)
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None, result.stderr
+    return executable, ""
+
+
+def run_program(executable, args=(), limits=DEFAULT_LIMITS):
+    """
+    Run a compiled test program under resource limits.
+
+    Args:
+        executable: Path of the program
+        args: Command line arguments passed to the program
+        limits: ResourceLimits to run under
+
+    Returns:
+        RunResult: (stdout, stderr, returncode, outcome, usage) of the program
+    """
+    return run_limited([executable] + list(args), limits)
+
+
+def memory_limited(profile):
+    """
+    Return whether programs built with a profile can run under an address
+    space limit. AddressSanitizer reserves terabytes of shadow memory up
+    front, so sanitized builds cannot.
+    """
+    return not any(flag.startswith("-fsanitize=address") for flag in profile_flags(profile))
+
+
+def run_cases(executable, names, limits=None):
+    """
+    Run several cases of a driver in one process, each forked in isolation.
+
+    The driver enforces each case's own limits; the driver as a whole only
+    gets a wall-clock limit covering all of its cases.
+
+    Args:
+        executable: Path of the driver
+        names: Names of the cases to run
+        limits: Mapping of case name to ResourceLimits, as built into the
+            driver
+
+    Returns:
+        dict: Mapping of case name to CaseOutput
+    """
+    limits = limits or {}
+    walls = [(limits.get(name) or DEFAULT_LIMITS).wall_seconds for name in names]
+    wall = None if None in walls else sum(walls) + DRIVER_WALL_SLACK
+    result = run_program(executable, names, ResourceLimits(wall, None, None))
+    return parse_case_output(result.stdout, result.stderr, limits)
+
+
+def partition(items, count):
+    """Split items into at most count round-robin groups"""
+    groups = [items[i::count] for i in range(count)]
+    return [group for group in groups if group]
+
+
+def driver_name(profile):
+    """Return the name of the driver built with a profile"""
+    return f"{DRIVER_NAME}-{profile}"
+
+
+class BuildScheduler:
+    """
+    Build the scenario drivers and run their scenarios in parallel.
+
+    Args:
+        implementation: Path of the student's .cpp file
+        workers: Size of the process pool, defaults to the available CPUs
+        root: Scratch root, defaults to this process's root
+    """
+
+    def __init__(self, implementation, workers=None, root=None):
+        self.implementation = implementation
+        self.workers = workers or available_cpus()
+        self.root = root or scratch_root()
+        self.scenarios = []
+        self.run_names = []
+        self.executables = {}
+        self.results = {}
+
+    def add(self, scenario, run=True):
+        """
+        Register a Scenario to build into the driver of its profile.
+
+        Args:
+            scenario: The Scenario to add
+            run: Whether run() executes the scenario. Scenarios that need
+                command line arguments (such as benchmarks) are only built
+                and are invoked later through the driver executable.
+        """
+        self.scenarios.append(scenario)
+        if run:
+            self.run_names.append(scenario.name)
+
+    def profiles(self):
+        """Return the build profiles used by the registered scenarios"""
+        profiles = []
+        for scenario in self.scenarios:
+            if scenario.profile not in profiles:
+                profiles.append(scenario.profile)
+        return profiles
+
+    def run(self):
+        """
+        Build one driver per profile and run every registered scenario.
+
+        For every profile, the student's implementation, the allocation hooks
+        and the driver are compiled concurrently with the other profiles'
+        objects. The scenarios are then split across one driver process per
+        worker; each driver forks every scenario it runs.
+
+        The driver paths are kept in self.executables (keyed by profile) and
+        the results in self.results.
+
+        Returns:
+            dict: Mapping of scenario name to CaseResult
+        """
+        include_dir = os.getcwd()
+        cache = ObjectCache()
+        results = {}
+        groups = []
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            builds = {}
+            limits = {}
+            for profile in self.profiles():
+                flags = profile_flags(profile)
+                scenarios = [scenario for scenario in self.scenarios if scenario.profile == profile]
+                for scenario in scenarios:
+                    limits[scenario.name] = case_limits(scenario, memory_limited(profile))
+                builds[profile] = [
+                    pool.submit(cache.build, self.implementation, flags),
+                    pool.submit(cache.build, ALLOC_HOOKS_CPP, flags),
+                    pool.submit(
+                        compile_driver,
+                        driver_name(profile),
+                        generate_driver(scenarios, memory_limited(profile)),
+                        self.root,
+                        include_dir,
+                        flags,
+                    ),
+                ]
+
+            for profile, futures in builds.items():
+                names = [
+                    scenario.name
+                    for scenario in self.scenarios
+                    if scenario.profile == profile and scenario.name in self.run_names
+                ]
+                objects = []
+                errors = ""
+                for future in futures:
+                    obj, obj_errors = future.result()
+                    objects.append(obj)
+                    errors = errors or obj_errors
+
+                executable = None
+                if None not in objects:
+                    executable, errors = link_program(
+                        driver_name(profile), objects, self.root, profile_flags(profile)
+                    )
+                if executable is None:
+                    for name in names:
+                        results[name] = CaseResult(name, False, errors, None, None, None, None, {})
+                    continue
+
+                self.executables[profile] = executable
+                for group in partition(names, self.workers):
+                    groups.append(pool.submit(run_cases, executable, group, limits))
+
+            outputs = {}
+            for future in groups:
+                outputs.update(future.result())
+
+        for name in self.run_names:
+            if name in results:
+                continue
+            output = outputs.get(name)
+            if output is None:
+                results[name] = CaseResult(name, True, "", "", "", None, "crashed", {})
+            else:
+                results[name] = CaseResult(
+                    name, True, "", output.stdout, output.stderr, output.returncode, output.outcome, output.usage
+                )
+        self.results = results
+        return results
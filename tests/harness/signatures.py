@@ -0,0 +1,159 @@
+"""
+Compile-only check of the declarations in the student's header.
+
+Instead of matching each required declaration with a regular expression,
+which rejects valid headers (a const getSize(), other parameter names) and
+accepts ones that do not compile, a probe translation unit is generated that
+includes the header and checks every required member with a static_assert on
+the type of a pointer to it:
+
+    template <typename T> auto ll_probe_2_0(int) -> decltype(ll_exact<void(int)>(&T::insertAtBeginning));
+    template <typename T> std::false_type ll_probe_2_0(...);
+    static_assert(decltype(ll_probe_2_0<LinkedList>(0))::value || ..., "missing or wrong: void insertAtBeginning(int)");
+
+A member that is missing, private or of another type makes the probe pick
+the std::false_type overload, so each static_assert fails on its own
+instead of stopping the compiler. The probe is compiled once with
+-fsyntax-only, which takes a fraction of a second, and every failed
+assertion is reported. Methods may also be declared const or noexcept.
+"""
+
+import os
+import re
+import subprocess
+import time
+from collections import namedtuple
+
+from harness.build import CXX, CXX_FLAGS
+
+# A required member of a class: params is the list of parameter types of a
+# method, or None for a data member
+Member = namedtuple("Member", ["cls", "name", "type", "params"])
+
+REQUIRED_MEMBERS = [
+    Member("Node", "data", "int", None),
+    Member("Node", "next", "Node*", None),
+    Member("LinkedList", "insertAtBeginning", "void", ["int"]),
+    Member("LinkedList", "insertAtEnd", "void", ["int"]),
+    Member("LinkedList", "insertAtPosition", "void", ["int", "int"]),
+    Member("LinkedList", "deleteFromBeginning", "bool", []),
+    Member("LinkedList", "deleteFromEnd", "bool", []),
+    Member("LinkedList", "deleteFromPosition", "bool", ["int"]),
+    Member("LinkedList", "deleteValue", "bool", ["int"]),
+    Member("LinkedList", "getSize", "int", []),
+    Member("LinkedList", "isEmpty", "bool", []),
+    Member("LinkedList", "display", "void", []),
+    Member("LinkedList", "search", "Node*", ["int"]),
+    Member("LinkedList", "reverse", "void", []),
+    Member("LinkedList", "sort", "void", []),
+    Member("LinkedList", "removeDuplicates", "void", []),
+    Member("LinkedList", "getMiddleNode", "Node*", []),
+    Member("LinkedList", "detectLoop", "bool", []),
+    Member("LinkedList", "clear", "void", []),
+]
+
+# Constructors checked with std::is_constructible: (class, argument types)
+REQUIRED_CONSTRUCTORS = [
+    ("Node", ["int"]),
+    ("LinkedList", []),
+]
+
+# Result of a probe. missing lists the declarations that are missing or
+# wrong, errors any other compiler errors (e.g. a header that does not parse)
+ProbeResult = namedtuple("ProbeResult", ["ok", "missing", "errors", "seconds"])
+
+FAILED_PREFIX = "missing or wrong: "
+
+_PROBE_HEADER = """\
+#include <type_traits>
+#include "%(header)s"
+
+// True only if the member pointer has exactly the type Sig C::*
+template <typename Sig, typename C> std::true_type ll_exact(Sig C::*);
+template <typename Sig> std::false_type ll_exact(...);
+"""
+
+_MEMBER_PROBE = """\
+template <typename T> auto ll_probe_%(index)s(int) -> decltype(ll_exact<%(sig)s>(&T::%(name)s));
+template <typename T> std::false_type ll_probe_%(index)s(...);
+"""
+
+_ASSERTION = re.compile(r"static assertion failed[^\n]*?" + re.escape(FAILED_PREFIX) + r"([^\n\"]*)")
+
+
+def describe(member):
+    """Return the declaration a member is expected to have"""
+    if member.params is None:
+        return f"{member.type} {member.cls}::{member.name}"
+    prefix = "" if member.cls == "LinkedList" else f"{member.cls}::"
+    return f"{member.type} {prefix}{member.name}({', '.join(member.params)})"
+
+
+def generate_probe(header, members=REQUIRED_MEMBERS, constructors=REQUIRED_CONSTRUCTORS):
+    """
+    Generate the source of a probe checking every required declaration.
+
+    Args:
+        header: Header to include, found through the include path
+        members: Required members
+        constructors: Required constructors
+
+    Returns:
+        str: C++ source with one static_assert per declaration
+    """
+    lines = [_PROBE_HEADER % {"header": header}]
+    for index, member in enumerate(members):
+        if member.params is None:
+            signatures = [member.type]
+        else:
+            function = f"{member.type}({', '.join(member.params)})"
+            signatures = [function, function + " const"]
+
+        checks = []
+        for variant, sig in enumerate(signatures):
+            probe = f"{index}_{variant}"
+            lines.append(_MEMBER_PROBE % {"index": probe, "sig": sig, "name": member.name})
+            checks.append(f"decltype(ll_probe_{probe}<{member.cls}>(0))::value")
+        lines.append(f'static_assert({" || ".join(checks)}, "{FAILED_PREFIX}{describe(member)}");\n')
+
+    for cls, args in constructors:
+        params = "".join(f", {arg}" for arg in args)
+        lines.append(f'static_assert(std::is_constructible<{cls}{params}>::value, '
+                     f'"{FAILED_PREFIX}{cls}({", ".join(args)})");\n')
+    return "\n".join(lines)
+
+
+def probe_signatures(header_path, members=REQUIRED_MEMBERS, constructors=REQUIRED_CONSTRUCTORS, cxx=CXX):
+    """
+    Check the declarations of a header with one syntax-only compile.
+
+    Args:
+        header_path: Path of the header
+        members: Required members
+        constructors: Required constructors
+        cxx: Compiler
+
+    Returns:
+        ProbeResult: Whether every declaration is present, the missing or
+        wrong ones, other compiler errors and the time taken
+    """
+    directory, header = os.path.split(os.path.abspath(header_path))
+    source = generate_probe(header, members, constructors)
+    cmd = [cxx] + CXX_FLAGS + ["-fsyntax-only", "-iquote", directory, "-x", "c++", "-"]
+
+    start = time.monotonic()
+    result = subprocess.run(cmd, input=source, capture_output=True, text=True)
+    seconds = time.monotonic() - start
+
+    missing = []
+    errors = []
+    for line in result.stderr.splitlines():
+        match = _ASSERTION.search(line)
+        if match:
+            if match.group(1) not in missing:
+                missing.append(match.group(1))
+        elif "error:" in line:
+            errors.append(line.strip())
+    if result.returncode != 0 and not missing and not errors:
+        errors.append(result.stderr.strip() or f"{cxx} exited with status {result.returncode}")
+    return ProbeResult(result.returncode == 0, missing, errors, seconds)
@@ -0,0 +1,58 @@
+"""
+Robust summary statistics for benchmark samples.
+"""
+
+import math
+
+
+def median(values):
+    """Return the median of a non-empty sequence"""
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    if len(ordered) % 2:
+        return float(ordered[mid])
+    return (ordered[mid - 1] + ordered[mid]) / 2.0
+
+
+def mad(values):
+    """Return the median absolute deviation from the median"""
+    center = median(values)
+    return median([abs(v - center) for v in values])
+
+
+def percentile(values, q):
+    """
+    Return the q-th percentile (0-100) using linear interpolation between
+    the closest ranks.
+    """
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return float(ordered[0])
+    rank = (len(ordered) - 1) * q / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples):
+    """
+    Summarize benchmark samples.
+
+    Returns:
+        dict: median, mad, relative mad (mad / median), min, max and the
+        5th, 25th, 75th and 95th percentiles
+    """
+    center = median(samples)
+    spread = mad(samples)
+    return {
+        "n": len(samples),
+        "median": center,
+        "mad": spread,
+        "rel_mad": spread / center if center else 0.0,
+        "min": float(min(samples)),
+        "max": float(max(samples)),
+        "p5": percentile(samples, 5),
+        "p25": percentile(samples, 25),
+        "p75": percentile(samples, 75),
+        "p95": percentile(samples, 95),
+    }
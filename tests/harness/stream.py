@@ -0,0 +1,274 @@
+"""
+Streaming verification of a program's standard output.
+
+run_limited() keeps the whole output of a program in memory, which rules out
+checking display() on large lists: a million elements print as megabytes of
+text. check_stream() reads the output through the pipe in fixed-size chunks
+instead and compares it, element by element, with expected sequences that
+may themselves be generators, so memory stays constant whatever the length
+of the output. The program is killed on the first mismatch.
+
+The program divides its output into sections by printing marker words,
+"##<name>" on a line of their own, before each one:
+
+    ##display
+    3 -> 1 -> 2 -> NULL
+    ##sort
+    1 -> 2 -> 3 -> NULL
+
+Within a section every integer is an element and everything else (arrows,
+commas, brackets, "NULL") is ignored, so any reasonable display() format
+is accepted. Output before the first marker is ignored.
+"""
+
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+from collections import deque, namedtuple
+from itertools import islice
+
+from harness.limits import DEFAULT_LIMITS, _set_rlimits, _usage, classify
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Bytes read from the pipe at a time
+STREAM_CHUNK = 1 << 16
+
+# Longest run of token characters (a number or marker) held across chunks;
+# longer runs mean the output has no separators and fail the check
+MAX_TOKEN = 4096
+
+# Bytes of standard error kept, from its end
+STDERR_TAIL = 1 << 16
+
+# Result of a streamed check. outcome is "ok", "mismatch" (the program was
+# stopped or its output was incomplete) or an outcome of harness.limits;
+# mismatch is None or {"section", "index", "expected", "actual", "message"}
+StreamResult = namedtuple(
+    "StreamResult", ["returncode", "outcome", "usage", "stderr", "mismatch", "elements", "max_buffered"]
+)
+
+_TOKENS = re.compile(rb"##[A-Za-z_][A-Za-z0-9_]*|-?\d+")
+_TOKEN_BYTES = frozenset(b"0123456789-#_abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+
+class StreamChecker:
+    """
+    Incremental comparison of output chunks with expected sections.
+
+    Args:
+        sections: (name, iterable of int) pairs in the order the program
+            prints them
+    """
+
+    def __init__(self, sections):
+        self.sections = iter(sections)
+        self.section = None
+        self.expected = None
+        self.index = 0
+        self.elements = 0
+        self.carry = b""
+        self.max_buffered = 0
+        self.mismatch = None
+
+    def _fail(self, expected, actual, message):
+        self.mismatch = {
+            "section": self.section,
+            "index": self.index,
+            "expected": expected,
+            "actual": actual,
+            "message": message,
+        }
+
+    def _end_section(self):
+        """Check that the current section printed every expected element"""
+        if self.expected is None:
+            return True
+        missing = sum(1 for _ in self.expected)
+        if missing:
+            self._fail(None, None, f"{missing} elements missing from {self.section} after {self.index}")
+            return False
+        return True
+
+    def _start_section(self, name):
+        if not self._end_section():
+            return False
+        try:
+            expected_name, values = next(self.sections)
+        except StopIteration:
+            self._fail(None, name, f"unexpected section {name}")
+            return False
+        if expected_name != name:
+            self._fail(expected_name, name, f"expected section {expected_name}, got {name}")
+            return False
+        self.section = name
+        self.expected = iter(values)
+        self.index = 0
+        return True
+
+    def _check_values(self, values):
+        """Compare a run of elements with the next expected ones"""
+        if self.expected is None or not values:
+            return True
+        expected = list(islice(self.expected, len(values)))
+        if expected == values:
+            self.index += len(values)
+            self.elements += len(values)
+            return True
+        for offset, actual in enumerate(values):
+            if offset == len(expected):
+                self.index += offset
+                self._fail(None, actual, f"{self.section} has more elements than expected")
+                return False
+            if expected[offset] != actual:
+                self.index += offset
+                self._fail(expected[offset], actual,
+                           f"{self.section} element {self.index} is {actual}, expected {expected[offset]}")
+                return False
+        return True
+
+    def _check_tokens(self, tokens):
+        values = []
+        for token in tokens:
+            if token.startswith(b"##"):
+                if not self._check_values(values) or not self._start_section(token[2:].decode()):
+                    return False
+                values = []
+            else:
+                values.append(int(token))
+        return self._check_values(values)
+
+    def feed(self, chunk):
+        """
+        Check a chunk of output.
+
+        Returns:
+            bool: False once the output has diverged from the expected one
+        """
+        buffer = self.carry + chunk
+        self.max_buffered = max(self.max_buffered, len(buffer))
+        # Only tokens followed by a separator are complete
+        end = len(buffer)
+        while end > 0 and buffer[end - 1] in _TOKEN_BYTES:
+            end -= 1
+        if len(buffer) - end > MAX_TOKEN:
+            self._fail(None, None, f"{self.section or 'output'} has no separators between elements")
+            return False
+        self.carry = buffer[end:]
+        return self._check_tokens(_TOKENS.findall(buffer, 0, end))
+
+    def finish(self):
+        """
+        Check the end of the output.
+
+        Returns:
+            bool: Whether the output matched every expected section
+        """
+        if not self._check_tokens(_TOKENS.findall(self.carry)) or not self._end_section():
+            return False
+        remaining = [name for name, _ in self.sections]
+        if remaining:
+            self._fail(remaining[0], None, f"missing sections: {', '.join(remaining)}")
+            return False
+        return True
+
+
+def check_stream(cmd, sections, limits=DEFAULT_LIMITS, cwd=None, chunk_size=STREAM_CHUNK):
+    """
+    Run a command under resource limits and check its output as it is printed.
+
+    Args:
+        cmd: Command and arguments
+        sections: (name, iterable of int) pairs the output must match, in
+            order
+        limits: ResourceLimits to apply
+        cwd: Working directory
+        chunk_size: Bytes read from the pipe at a time
+
+    Returns:
+        StreamResult: How the program ended, the first mismatch, the number
+        of elements checked and the most output bytes held at once
+    """
+    checker = StreamChecker(sections)
+    start = time.monotonic()
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd,
+        start_new_session=resource is not None,
+        preexec_fn=(lambda: _set_rlimits(limits)) if resource is not None else None,
+    )
+
+    stderr = deque()
+
+    def read_stderr():
+        size = 0
+        for data in iter(lambda: proc.stderr.read1(chunk_size), b""):
+            stderr.append(data)
+            size += len(data)
+            while size - len(stderr[0]) >= STDERR_TAIL:
+                size -= len(stderr.popleft())
+        proc.stderr.close()
+
+    def kill():
+        try:
+            if resource is not None:
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except ProcessLookupError:
+            pass
+
+    timed_out = threading.Event()
+
+    def expire():
+        timed_out.set()
+        kill()
+
+    reader = threading.Thread(target=read_stderr)
+    reader.start()
+    timer = None
+    if limits.wall_seconds:
+        timer = threading.Timer(limits.wall_seconds, expire)
+        timer.start()
+
+    fd = proc.stdout.fileno()
+    matched = True
+    while True:
+        chunk = os.read(fd, chunk_size)
+        if not chunk:
+            break
+        if not checker.feed(chunk):
+            matched = False
+            kill()
+            break
+    proc.stdout.close()
+
+    if resource is not None:
+        _, status, rusage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        usage = _usage(rusage, time.monotonic() - start)
+    else:
+        proc.wait()
+        usage = {"wall_s": time.monotonic() - start}
+    if timer is not None:
+        timer.cancel()
+    # Reap anything left in the process group so the stderr pipe closes
+    kill()
+    reader.join()
+
+    stderr = b"".join(stderr).decode(errors="replace")
+    outcome = classify(proc.returncode, stderr, usage, limits, timed_out.is_set())
+    if matched and outcome == "ok":
+        matched = checker.finish()
+    if not matched and not timed_out.is_set():
+        outcome = "mismatch"
+    return StreamResult(proc.returncode, outcome, usage, stderr, checker.mismatch, checker.elements,
+                        checker.max_buffered)
@@ -0,0 +1,235 @@
+"""
+Multi-core scaling benchmark for independent LinkedList instances.
+
+Every node is a separate allocation, so when many lists are used at once on
+different threads the implementation leans on the allocator from every
+core. This benchmark runs one LinkedList per thread, each doing the same
+churn (insert size elements alternately at either end, delete half of them
+from the front, clear the rest, repeated for a number of rounds), on 1 up to
+the number of available CPUs, as "driver --run threads <size> <threads>
+<rounds> <warmup> <repetitions>". The threads start together from a barrier
+and a trial is timed from the start until the last thread is done.
+
+The driver is built with the "bench-nohooks" profile: the allocation
+counters of the other drivers are atomics shared by every thread, and
+updating them on each new and delete would measure contention on the
+harness's own counters rather than on the allocator.
+
+Since every thread does the same work, perfect scaling keeps the time of a
+trial constant. For each thread count the report has the aggregate
+throughput (operations per second over all threads), the speedup over one
+thread and the parallel efficiency (speedup divided by the thread count).
+"""
+
+import json
+import os
+
+from harness.driver import Scenario
+from harness.limits import DEFAULT_LIMITS, run_limited
+from harness.stats import summarize
+
+# Elements inserted per round and rounds per trial; each round is
+# size inserts, size / 2 deletes and a clear of the rest
+THREADS_LIST_SIZE = int(os.environ.get("LL_THREADS_LIST_SIZE", 1000))
+THREADS_ROUNDS = int(os.environ.get("LL_THREADS_ROUNDS", 200))
+
+# Largest thread count, by default the number of CPUs this process may use
+THREADS_MAX = os.environ.get("LL_THREADS_MAX")
+
+THREADS_WARMUP = int(os.environ.get("LL_THREADS_WARMUP", 1))
+THREADS_REPETITIONS = int(os.environ.get("LL_THREADS_REPETITIONS", 5))
+
+# Seconds a single trial may take
+THREADS_TIMEOUT = float(os.environ.get("LL_THREADS_TIMEOUT", 10))
+
+THREADS_SCENARIO = Scenario(
+    "threads",
+    r"""
+    if (argc < 3) {
+        std::cerr << "usage: threads <size> <threads> <rounds> [warmup] [repetitions]" << std::endl;
+        return 2;
+    }
+    const long n = std::atol(argv[0]);
+    const int thread_count = std::atoi(argv[1]);
+    const long rounds = std::atol(argv[2]);
+    const int warmup = argc > 3 ? std::atoi(argv[3]) : 0;
+    const int repetitions = argc > 4 ? std::atoi(argv[4]) : 1;
+    typedef std::chrono::steady_clock Clock;
+
+    if (n < 1 || thread_count < 1 || rounds < 1) {
+        std::cerr << "size, threads and rounds must be positive" << std::endl;
+        return 2;
+    }
+
+    // Operations done by each thread: inserts, deletes and the nodes freed
+    // by clear()
+    const long ops_per_thread = rounds * (n + n / 2 + (n - n / 2));
+
+    // One trial with every thread churning its own list, returning the
+    // nanoseconds from the common start until the last thread is done
+    auto trial = [&]() -> double {
+        std::atomic<int> ready(0);
+        std::atomic<bool> go(false);
+        std::vector<long> checks(thread_count, 0);
+        std::vector<std::thread> workers;
+        for (int t = 0; t < thread_count; t++) {
+            workers.emplace_back([&, t]() {
+                LinkedList list;
+                ready++;
+                while (!go.load(std::memory_order_acquire)) {
+                    std::this_thread::yield();
+                }
+                long check = 0;
+                for (long round = 0; round < rounds; round++) {
+                    for (long i = 0; i < n; i++) {
+                        if (i & 1) {
+                            list.insertAtEnd((int)i);
+                        } else {
+                            list.insertAtBeginning((int)i);
+                        }
+                    }
+                    for (long i = 0; i < n / 2; i++) {
+                        check += list.deleteFromBeginning();
+                    }
+                    check += list.getSize();
+                    list.clear();
+                }
+                checks[t] = check;
+            });
+        }
+        while (ready.load() < thread_count) {
+            std::this_thread::yield();
+        }
+        auto start = Clock::now();
+        go.store(true, std::memory_order_release);
+        for (auto& worker : workers) {
+            worker.join();
+        }
+        double elapsed = (double)std::chrono::duration_cast<std::chrono::nanoseconds>(Clock::now() - start).count();
+
+        // Every thread must have seen every node, or the list is broken
+        for (int t = 0; t < thread_count; t++) {
+            if (checks[t] != rounds * n) {
+                std::cerr << "Thread " << t << " lost nodes: " << checks[t] << " of " << rounds * n << std::endl;
+                return -1;
+            }
+        }
+        return elapsed;
+    };
+
+    for (int i = 0; i < warmup; i++) {
+        isolated_trial(trial);
+    }
+
+    std::vector<double> samples;
+    for (int i = 0; i < repetitions; i++) {
+        double ns = isolated_trial(trial);
+        if (ns < 0) {
+            std::cerr << "Benchmark trial failed" << std::endl;
+            return 1;
+        }
+        samples.push_back(ns);
+    }
+
+    std::cout << "{\"size\": " << n << ", \"threads\": " << thread_count << ", \"ops_per_thread\": "
+              << ops_per_thread << ", \"samples_ns\": [";
+    for (int i = 0; i < repetitions; i++) {
+        std::cout << (i ? ", " : "") << samples[i];
+    }
+    std::cout << "]}" << std::endl;
+    return 0;
+""",
+    includes=("<atomic>", "<chrono>", "<cstdlib>", "<thread>", "<vector>", '"bench_support.h"'),
+    profile="bench-nohooks",
+)
+
+
+def max_threads():
+    """Return the largest thread count to measure"""
+    if THREADS_MAX:
+        return max(1, int(THREADS_MAX))
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def thread_counts(maximum=None):
+    """Return the thread counts to measure: powers of two up to maximum, and maximum"""
+    maximum = maximum or max_threads()
+    counts = []
+    count = 1
+    while count < maximum:
+        counts.append(count)
+        count *= 2
+    counts.append(maximum)
+    return counts
+
+
+def measure_threads(executable, threads, size=THREADS_LIST_SIZE, rounds=THREADS_ROUNDS,
+                    warmup=THREADS_WARMUP, repetitions=THREADS_REPETITIONS, timeout=THREADS_TIMEOUT):
+    """
+    Run the churn on a number of threads.
+
+    The driver is not pinned to a CPU, and its CPU time limit scales with
+    the number of threads. The memory limit is lifted: every thread may get
+    its own allocator arena, which reserves address space far beyond what
+    it uses.
+
+    Returns:
+        dict: {"threads", "size", "ops_per_thread", "samples_ns", "stats"},
+        or None if the run failed or timed out
+    """
+    cmd = [executable, "--run", "threads", str(size), str(threads), str(rounds), str(warmup), str(repetitions)]
+    budget = timeout * (warmup + repetitions)
+    limits = DEFAULT_LIMITS._replace(wall_seconds=budget, cpu_seconds=budget * threads, memory_bytes=None)
+    result = run_limited(cmd, limits)
+    if result.outcome != "ok":
+        return None
+    measurement = json.loads(result.stdout.strip().splitlines()[-1])
+    measurement["stats"] = summarize(measurement["samples_ns"])
+    return measurement
+
+
+def run_thread_scaling(executable, counts=None, **kwargs):
+    """
+    Measure the churn over increasing thread counts.
+
+    Args:
+        executable: Path of the benchmark driver
+        counts: Thread counts, defaults to thread_counts()
+        **kwargs: Passed to measure_threads()
+
+    Returns:
+        dict: {"size", "ops_per_thread", "cpus", "curve": [{"threads",
+        "median_ns", "throughput" (operations per second), "speedup",
+        "efficiency"}], "failed": thread counts whose run failed,
+        "measurements": the raw measurements}
+    """
+    if counts is None:
+        counts = thread_counts()
+
+    report = {"size": None, "ops_per_thread": None, "cpus": max_threads(), "curve": [], "failed": [],
+              "measurements": []}
+    baseline = None
+    for threads in counts:
+        measurement = measure_threads(executable, threads, **kwargs)
+        if measurement is None:
+            report["failed"].append(threads)
+            continue
+        report["measurements"].append(measurement)
+        report["size"] = measurement["size"]
+        report["ops_per_thread"] = measurement["ops_per_thread"]
+
+        median = measurement["stats"]["median"]
+        throughput = threads * measurement["ops_per_thread"] / (median / 1e9) if median > 0 else None
+        if threads == 1:
+            baseline = throughput
+        speedup = throughput / baseline if baseline and throughput else None
+        report["curve"].append({
+            "threads": threads,
+            "median_ns": median,
+            "throughput": throughput,
+            "speedup": speedup,
+            "efficiency": speedup / threads if speedup is not None else None,
+        })
+    return report
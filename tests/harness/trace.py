@@ -0,0 +1,243 @@
+"""
+Compact binary operation traces for replaying large workloads.
+
+A trace is a 16-byte header followed by fixed-width 8-byte records, all
+little endian:
+
+    header   4s magic "LLTR", u16 version, u16 record size, u64 record count
+    record   u32 opcode, i32 operand
+
+Opcodes are the indices of harness.differential.OPERATIONS. The operand is
+the value for operations that take one. insertAtPosition uses it as both the
+value and, modulo size + 1, the position; deleteFromPosition uses it modulo
+the size as the position. Other operations ignore it.
+
+Traces are written as a stream through array-backed buffers, so a workload of
+millions of operations never exists as Python objects at once. They are
+replayed by trace_replay.cpp, a generic driver that memory-maps the trace and
+reports throughput and per-opcode latency percentiles:
+
+    python -m harness.trace generate <path> --ops 10000000 --mix insertAtEnd=4,search=1
+"""
+
+import argparse
+import array
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+
+from harness.differential import OPERATIONS
+from harness.memory import HARNESS_DIR
+
+TRACE_MAGIC = b"LLTR"
+TRACE_VERSION = 1
+HEADER = struct.Struct("<4sHHQ")
+RECORD = struct.Struct("<Ii")
+
+TRACE_REPLAY_CPP = os.path.join(HARNESS_DIR, "trace_replay.cpp")
+
+OPCODES = {operation[0]: opcode for opcode, operation in enumerate(OPERATIONS)}
+
+# Default workload: a bounded queue with lookups
+DEFAULT_MIX = {"insertAtEnd": 4, "deleteFromBeginning": 3, "search": 3}
+DEFAULT_MAX_SIZE = 1000
+
+# Records buffered before each write
+CHUNK_RECORDS = 1 << 16
+
+# Operations whose effect on the size generate_workload() can track without
+# knowing the list's values
+_SIZE_EFFECT = {
+    "insertAtBeginning": 1,
+    "insertAtEnd": 1,
+    "insertAtPosition": 1,
+    "deleteFromBeginning": -1,
+    "deleteFromEnd": -1,
+    "deleteFromPosition": -1,
+    "search": 0,
+    "getMiddleNode": 0,
+    "detectLoop": 0,
+}
+
+
+class TraceWriter:
+    """
+    Stream records to a trace file.
+
+    The record count in the header is filled in when the writer is closed.
+    Use as a context manager.
+
+    Args:
+        path: Path of the trace file
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION, RECORD.size, 0))
+        self.buffer = array.array("i")
+        self.count = 0
+
+    def write(self, opcode, operand=0):
+        """Append one record"""
+        self.buffer.append(opcode)
+        self.buffer.append(operand)
+        if len(self.buffer) >= 2 * CHUNK_RECORDS:
+            self.flush()
+
+    def write_records(self, records):
+        """Append records given as a flat sequence of opcode, operand pairs"""
+        self.buffer.extend(records)
+        if len(self.buffer) >= 2 * CHUNK_RECORDS:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered records"""
+        if sys.byteorder != "little":
+            self.buffer.byteswap()
+        self.buffer.tofile(self.file)
+        self.count += len(self.buffer) // 2
+        self.buffer = array.array("i")
+
+    def close(self):
+        """Write the remaining records and the final record count"""
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.seek(0)
+        self.file.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION, RECORD.size, self.count))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_trace(path):
+    """
+    Iterate over the records of a trace.
+
+    Yields:
+        tuple: (opcode, operand)
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if len(mapped) < HEADER.size:
+            raise ValueError(f"{path} is truncated")
+        magic, version, record_size, count = HEADER.unpack_from(mapped)
+        if magic != TRACE_MAGIC or version != TRACE_VERSION or record_size != RECORD.size:
+            raise ValueError(f"{path} is not a version {TRACE_VERSION} trace")
+        if HEADER.size + count * RECORD.size > len(mapped):
+            raise ValueError(f"{path} is truncated")
+        for offset in range(HEADER.size, HEADER.size + count * RECORD.size, RECORD.size):
+            yield RECORD.unpack_from(mapped, offset)
+
+
+def generate_workload(path, ops, mix=None, max_size=DEFAULT_MAX_SIZE, value_range=None, seed=0):
+    """
+    Write a random workload trace.
+
+    The list size is tracked while generating: once it reaches max_size,
+    inserts are replaced by deleteFromBeginning, and deletes on an empty
+    list are replaced by insertAtEnd, so the workload stays in a steady state.
+
+    Args:
+        path: Path of the trace file
+        ops: Number of operations
+        mix: Mapping of operation name to relative weight, defaults to
+            DEFAULT_MIX. Only operations whose effect on the size does not
+            depend on the values are supported.
+        max_size: Largest size the list grows to
+        value_range: Values are drawn from 0..value_range-1, defaults to
+            2 * max_size so about half the searches miss
+        seed: Random seed
+
+    Returns:
+        dict: {"ops", "final_size"}, the size the list has after the replay
+    """
+    mix = mix or DEFAULT_MIX
+    unsupported = [name for name in mix if name not in _SIZE_EFFECT]
+    if unsupported:
+        raise ValueError(f"Unsupported operations in workload mix: {', '.join(unsupported)}")
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    effects = [_SIZE_EFFECT[name] for name in names]
+    opcodes = [OPCODES[name] for name in names]
+    value_range = value_range or 2 * max_size
+
+    rng = random.Random(seed)
+    insert_at_end = OPCODES["insertAtEnd"]
+    delete_from_beginning = OPCODES["deleteFromBeginning"]
+    size = 0
+    with TraceWriter(path) as writer:
+        remaining = ops
+        while remaining > 0:
+            batch = min(remaining, CHUNK_RECORDS)
+            records = []
+            append = records.append
+            random_value = rng.random
+            for index in rng.choices(range(len(names)), weights, k=batch):
+                opcode = opcodes[index]
+                effect = effects[index]
+                if effect > 0 and size >= max_size:
+                    opcode, effect = delete_from_beginning, -1
+                elif effect < 0 and size == 0:
+                    opcode, effect = insert_at_end, 1
+                size += effect
+                append(opcode)
+                append(int(random_value() * value_range))
+            writer.write_records(records)
+            remaining -= batch
+    return {"ops": ops, "final_size": size}
+
+
+def parse_replay_report(stdout):
+    """
+    Parse the report printed by trace_replay.cpp.
+
+    Returns:
+        dict: {"ops", "seconds", "ops_per_second", "latency", "final_size",
+        "checksum", "opcodes"}, where opcodes maps each operation name to
+        its count and, with latency, mean_ns, p50_ns, p90_ns, p99_ns, p999_ns
+        and max_ns. None if there is no report.
+    """
+    lines = (stdout or "").strip().splitlines()
+    if not lines:
+        return None
+    try:
+        return json.loads(lines[-1])
+    except ValueError:
+        return None
+
+
+def parse_mix(text):
+    """Parse a workload mix given as name=weight,name=weight"""
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate binary operation traces")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="Write a random workload trace")
+    generate.add_argument("path")
+    generate.add_argument("--ops", type=int, default=1000000)
+    generate.add_argument("--mix", type=parse_mix, default=None, help="e.g. insertAtEnd=4,search=1")
+    generate.add_argument("--max-size", type=int, default=DEFAULT_MAX_SIZE)
+    generate.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(argv)
+    result = generate_workload(args.path, args.ops, args.mix, args.max_size, seed=args.seed)
+    print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+// Replay a binary operation trace against the student's LinkedList.
+//
+// The trace is written by harness/trace.py: a 16-byte header followed by
+// fixed-width records of a uint32 opcode and an int32 operand, all little
+// endian. The file is memory-mapped (read into memory on Windows, which has
+// no mmap) and replayed record by record:
+//
+//     trace_replay <trace> [--no-latency]
+//
+// Every operation is timed individually and its latency added to a
+// histogram of its opcode (logarithmic buckets with 16 steps per power of
+// two, so percentiles are within about 6%). --no-latency skips the clock
+// reads to measure raw throughput. The result is printed as one JSON line.
+//
+// The opcodes and operand rules must match harness/trace.py.
+#include <chrono>
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <string>
+
+#ifndef _WIN32
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+#include "src/linked_list.h"
+
+namespace {
+
+const char TRACE_MAGIC[4] = {'L', 'L', 'T', 'R'};
+const uint16_t TRACE_VERSION = 1;
+
+struct TraceHeader {
+    char magic[4];
+    uint16_t version;
+    uint16_t record_size;
+    uint64_t count;
+};
+
+struct TraceRecord {
+    uint32_t opcode;
+    int32_t operand;
+};
+
+static_assert(sizeof(TraceHeader) == 16, "trace header must be 16 bytes");
+static_assert(sizeof(TraceRecord) == 8, "trace records must be 8 bytes");
+
+const char* const OPCODE_NAMES[] = {
+    "insertAtBeginning",
+    "insertAtEnd",
+    "insertAtPosition",
+    "deleteFromBeginning",
+    "deleteFromEnd",
+    "deleteFromPosition",
+    "deleteValue",
+    "search",
+    "reverse",
+    "sort",
+    "removeDuplicates",
+    "getMiddleNode",
+    "clear",
+    "detectLoop",
+};
+const uint32_t OPCODE_COUNT = sizeof(OPCODE_NAMES) / sizeof(OPCODE_NAMES[0]);
+
+const int SUB_BUCKETS = 16;
+const int BUCKETS = 64 * SUB_BUCKETS;
+
+struct Histogram {
+    uint64_t buckets[BUCKETS];
+    uint64_t count;
+    uint64_t total_ns;
+    uint64_t max_ns;
+
+    static int bucket(uint64_t ns) {
+        if (ns < SUB_BUCKETS) {
+            return (int)ns;
+        }
+        int exponent = 63 - __builtin_clzll(ns);
+        int sub = (int)((ns >> (exponent - 4)) & (SUB_BUCKETS - 1));
+        return (exponent - 3) * SUB_BUCKETS + sub;
+    }
+
+    // Middle of a bucket's range
+    static uint64_t value(int index) {
+        if (index < SUB_BUCKETS) {
+            return index;
+        }
+        int exponent = index / SUB_BUCKETS + 3;
+        uint64_t width = 1ULL << (exponent - 4);
+        return (uint64_t)(SUB_BUCKETS + index % SUB_BUCKETS) * width + width / 2;
+    }
+
+    void add(uint64_t ns) {
+        buckets[bucket(ns)]++;
+        count++;
+        total_ns += ns;
+        if (ns > max_ns) {
+            max_ns = ns;
+        }
+    }
+
+    uint64_t percentile(double p) const {
+        uint64_t rank = (uint64_t)(p / 100.0 * (double)(count - 1));
+        uint64_t seen = 0;
+        for (int i = 0; i < BUCKETS; i++) {
+            seen += buckets[i];
+            if (seen > rank) {
+                return value(i) < max_ns ? value(i) : max_ns;
+            }
+        }
+        return max_ns;
+    }
+};
+
+Histogram histograms[OPCODE_COUNT];
+uint64_t counts[OPCODE_COUNT];
+
+long execute(LinkedList& list, uint32_t opcode, int32_t operand) {
+    uint32_t arg = (uint32_t)operand;
+    switch (opcode) {
+    case 0:
+        list.insertAtBeginning(operand);
+        return 0;
+    case 1:
+        list.insertAtEnd(operand);
+        return 0;
+    case 2:
+        // The operand is the value and, modulo size + 1, the position
+        list.insertAtPosition(operand, (int)(arg % (uint32_t)(list.getSize() + 1)));
+        return 0;
+    case 3:
+        return list.deleteFromBeginning();
+    case 4:
+        return list.deleteFromEnd();
+    case 5: {
+        int size = list.getSize();
+        return list.deleteFromPosition(size > 0 ? (int)(arg % (uint32_t)size) : 0);
+    }
+    case 6:
+        return list.deleteValue(operand);
+    case 7:
+        return list.search(operand) != nullptr;
+    case 8:
+        list.reverse();
+        return 0;
+    case 9:
+        list.sort();
+        return 0;
+    case 10:
+        list.removeDuplicates();
+        return 0;
+    case 11: {
+        Node* middle = list.getMiddleNode();
+        return middle == nullptr ? 0 : middle->data;
+    }
+    case 12:
+        list.clear();
+        return 0;
+    case 13:
+        return list.detectLoop();
+    default:
+        return 0;
+    }
+}
+
+// Contents of a trace file, mapped or read into memory
+struct TraceFile {
+    void* data = nullptr;
+    size_t size = 0;
+
+    // Return nullptr on success or the reason the file could not be loaded
+    const char* load(const char* path) {
+#ifdef _WIN32
+        FILE* file = std::fopen(path, "rb");
+        if (file == nullptr) {
+            return "cannot open trace";
+        }
+        long long length = -1;
+        if (_fseeki64(file, 0, SEEK_END) == 0) {
+            length = _ftelli64(file);
+        }
+        if (length < (long long)sizeof(TraceHeader) || _fseeki64(file, 0, SEEK_SET) != 0) {
+            std::fclose(file);
+            return "trace is too short";
+        }
+        size = (size_t)length;
+        data = std::malloc(size);
+        bool read = data != nullptr && std::fread(data, 1, size, file) == size;
+        std::fclose(file);
+        return read ? nullptr : "cannot read trace";
+#else
+        int fd = open(path, O_RDONLY);
+        if (fd < 0) {
+            return "cannot open trace";
+        }
+        struct stat st;
+        if (fstat(fd, &st) < 0 || (size_t)st.st_size < sizeof(TraceHeader)) {
+            close(fd);
+            return "trace is too short";
+        }
+        void* mapped = mmap(nullptr, st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+        close(fd);
+        if (mapped == MAP_FAILED) {
+            return "cannot map trace";
+        }
+        madvise(mapped, st.st_size, MADV_SEQUENTIAL);
+        data = mapped;
+        size = (size_t)st.st_size;
+        return nullptr;
+#endif
+    }
+
+    ~TraceFile() {
+        if (data == nullptr) {
+            return;
+        }
+#ifdef _WIN32
+        std::free(data);
+#else
+        munmap(data, size);
+#endif
+    }
+};
+
+int fail(const std::string& message) {
+    std::fprintf(stderr, "trace_replay: %s\n", message.c_str());
+    return 2;
+}
+
+}  // namespace
+
+int main(int argc, char** argv) {
+    if (argc < 2) {
+        return fail("usage: trace_replay <trace> [--no-latency]");
+    }
+    bool latency = !(argc > 2 && std::strcmp(argv[2], "--no-latency") == 0);
+
+    TraceFile trace;
+    const char* error = trace.load(argv[1]);
+    if (error != nullptr) {
+        return fail(std::string(error) + ": " + argv[1]);
+    }
+
+    const TraceHeader* header = static_cast<const TraceHeader*>(trace.data);
+    if (std::memcmp(header->magic, TRACE_MAGIC, 4) != 0 || header->version != TRACE_VERSION ||
+        header->record_size != sizeof(TraceRecord)) {
+        return fail("not a version 1 trace");
+    }
+    uint64_t available = (trace.size - sizeof(TraceHeader)) / sizeof(TraceRecord);
+    if (header->count > available) {
+        return fail("trace is truncated");
+    }
+    const TraceRecord* records = reinterpret_cast<const TraceRecord*>(header + 1);
+    uint64_t count = header->count;
+
+    LinkedList list;
+    long checksum = 0;
+    auto start = std::chrono::steady_clock::now();
+    if (latency) {
+        for (uint64_t i = 0; i < count; i++) {
+            uint32_t opcode = records[i].opcode;
+            if (opcode >= OPCODE_COUNT) {
+                return fail("invalid opcode at record " + std::to_string(i));
+            }
+            auto before = std::chrono::steady_clock::now();
+            checksum += execute(list, opcode, records[i].operand);
+            auto after = std::chrono::steady_clock::now();
+            histograms[opcode].add(std::chrono::duration_cast<std::chrono::nanoseconds>(after - before).count());
+        }
+    } else {
+        for (uint64_t i = 0; i < count; i++) {
+            uint32_t opcode = records[i].opcode;
+            if (opcode >= OPCODE_COUNT) {
+                return fail("invalid opcode at record " + std::to_string(i));
+            }
+            checksum += execute(list, opcode, records[i].operand);
+            counts[opcode]++;
+        }
+    }
+    double seconds = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+    std::printf("{\"ops\": %llu, \"seconds\": %.6f, \"ops_per_second\": %.1f, \"latency\": %s, "
+                "\"final_size\": %d, \"checksum\": %ld, \"opcodes\": {",
+                (unsigned long long)count, seconds, seconds > 0 ? count / seconds : 0.0,
+                latency ? "true" : "false", list.getSize(), checksum);
+    bool first = true;
+    for (uint32_t opcode = 0; opcode < OPCODE_COUNT; opcode++) {
+        const Histogram& h = histograms[opcode];
+        uint64_t n = latency ? h.count : counts[opcode];
+        if (n == 0) {
+            continue;
+        }
+        std::printf("%s\"%s\": {\"count\": %llu", first ? "" : ", ", OPCODE_NAMES[opcode], (unsigned long long)n);
+        if (latency) {
+            std::printf(", \"mean_ns\": %.1f, \"p50_ns\": %llu, \"p90_ns\": %llu, \"p99_ns\": %llu, "
+                        "\"p999_ns\": %llu, \"max_ns\": %llu",
+                        (double)h.total_ns / h.count, (unsigned long long)h.percentile(50),
+                        (unsigned long long)h.percentile(90), (unsigned long long)h.percentile(99),
+                        (unsigned long long)h.percentile(99.9), (unsigned long long)h.max_ns);
+        }
+        std::printf("}");
+        first = false;
+    }
+    std::printf("}}\n");
+    return 0;
+}
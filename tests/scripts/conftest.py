@@ -0,0 +1,36 @@
+"""
+Pytest configuration for the unit tests of the scripts in scripts/.
+
+These tests do not grade a submission: grading runs leave this directory out
+(--ignore=tests/scripts), and the results cache does not record them (every
+module is marked "scripts"). Run them from the repository root with
+
+    python -m pytest tests/scripts
+"""
+
+import os
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "scripts")
+
+# The scripts import each other as top-level modules
+sys.path.insert(0, SCRIPTS_DIR)
+
+from fake_github import FakeGitHub  # noqa: E402
+
+
+@pytest.fixture
+def fake_github():
+    """A running FakeGitHub server, stopped after the test"""
+    servers = []
+
+    def start(**options):
+        server = FakeGitHub(**options).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
@@ -0,0 +1,132 @@
+"""
+Tests of the reviewer assignment (scripts/assign_reviewers.py).
+"""
+
+import functools
+import json
+from collections import Counter
+
+import pytest
+
+import assign_reviewers
+from assign_reviewers import assign_reviewers as assign, assign_reviewers_avoiding, reviews_each_other
+from github_api import GitHubClient, RateLimiter
+
+pytestmark = pytest.mark.scripts
+
+REPOSITORY = "course/linked-lists"
+
+STUDENTS = [f"student-{i}" for i in range(30)]
+
+
+def check_balanced(assignments, students, k):
+    """Check every student has k distinct reviewers and reviews k others"""
+    assert list(assignments) == list(dict.fromkeys(students))
+    reviews = Counter()
+    for student, reviewers in assignments.items():
+        assert len(reviewers) == len(set(reviewers)) == k
+        assert student not in reviewers
+        reviews.update(reviewers)
+    assert all(reviews[student] == k for student in assignments)
+
+
+@pytest.mark.parametrize("n, k", [(2, 1), (4, 3), (10, 3), (30, 3), (31, 5)])
+def test_assignment_is_balanced(n, k):
+    students = STUDENTS[:n] if n <= len(STUDENTS) else [f"student-{i}" for i in range(n)]
+    check_balanced(assign(students, k, seed=1), students, k)
+
+
+def test_duplicate_students_are_assigned_once():
+    students = ["alice", "bob", "alice", "carol", "dave"]
+    check_balanced(assign(students, 3, seed=2), students, 3)
+
+
+def test_too_few_students_lowers_the_reviewer_count():
+    assert assign([], 3) == {}
+    assert assign(["alice"], 3) == {"alice": []}
+    check_balanced(assign(["alice", "bob", "carol"], 3, seed=1), ["alice", "bob", "carol"], 2)
+
+
+def test_seed_makes_the_assignment_reproducible():
+    assert assign(STUDENTS, 3, seed=7) == assign(STUDENTS, 3, seed=7)
+    assert assign(STUDENTS, 3, seed=7) != assign(STUDENTS, 3, seed=8)
+
+
+def test_exclusions_are_respected():
+    exclusions = [(STUDENTS[i], STUDENTS[i + 1]) for i in range(0, len(STUDENTS) - 1, 2)]
+    exclusions += [(STUDENTS[0], student) for student in STUDENTS[2:12]]
+
+    for seed in range(20):
+        assignments = assign(STUDENTS, 3, seed=seed, exclusions=exclusions)
+        check_balanced(assignments, STUDENTS, 3)
+        for a, b in exclusions:
+            assert not reviews_each_other(assignments, a, b)
+
+
+def test_impossible_exclusions_raise():
+    students = STUDENTS[:5]
+    everyone = [(a, b) for i, a in enumerate(students) for b in students[i + 1:]]
+
+    with pytest.raises(ValueError):
+        assign(students, 3, seed=1, exclusions=everyone)
+
+
+def test_avoided_pairs_are_kept_apart_when_possible():
+    avoid = [(STUDENTS[0], STUDENTS[1]), (STUDENTS[2], STUDENTS[3])]
+
+    assignments, kept_apart = assign_reviewers_avoiding(STUDENTS, 3, seed=1, avoid=avoid)
+
+    check_balanced(assignments, STUDENTS, 3)
+    assert kept_apart == 2
+    assert not any(reviews_each_other(assignments, a, b) for a, b in avoid)
+
+
+def test_avoided_pairs_fall_back_to_the_most_important_ones():
+    students = STUDENTS[:10]
+    # No balanced assignment keeps student-0 apart from all of the others
+    avoid = [(students[0], student) for student in students[1:]]
+
+    assignments, kept_apart = assign_reviewers_avoiding(students, 3, seed=1, avoid=avoid)
+
+    check_balanced(assignments, students, 3)
+    assert 0 < kept_apart < len(avoid)
+    assert not any(reviews_each_other(assignments, a, b) for a, b in avoid[:kept_apart])
+
+
+def test_avoided_pairs_never_override_exclusions():
+    students = STUDENTS[:5]
+    exclusions = [(students[0], students[1])]
+    avoid = [(a, b) for i, a in enumerate(students) for b in students[i + 1:]]
+
+    assignments, kept_apart = assign_reviewers_avoiding(students, 2, seed=1, exclusions=exclusions, avoid=avoid)
+
+    check_balanced(assignments, students, 2)
+    assert not reviews_each_other(assignments, students[0], students[1])
+    with pytest.raises(ValueError):
+        assign_reviewers_avoiding(students, 3, seed=1, exclusions=avoid, avoid=[])
+
+
+def test_main_flags_similar_pairs_it_could_not_separate(fake_github, tmp_path, monkeypatch):
+    server = fake_github()
+    students = STUDENTS[:10]
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "review_pool.json").write_text(json.dumps({"students": students}))
+    similar = [{"students": [students[0], student], "similarity": 1.0 - i / 100}
+               for i, student in enumerate(students[1:])]
+    (tmp_path / "similarity.json").write_text(json.dumps({"pairs": similar}))
+    monkeypatch.setattr(assign_reviewers, "GitHubClient", functools.partial(
+        GitHubClient, api_url=server.url, rate_limiter=RateLimiter(reserve=0)))
+    monkeypatch.setattr("sys.argv", ["assign_reviewers.py", "--seed", "1", "--similarity", "similarity.json"])
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    monkeypatch.setenv("GITHUB_REPOSITORY", REPOSITORY)
+
+    assert assign_reviewers.main()
+
+    with open(tmp_path / "reviews" / "assignments.json") as f:
+        saved = json.load(f)
+    check_balanced(saved["assignments"], students, 3)
+    flagged = saved["similar_submissions"]
+    assert [pair["similarity"] for pair in flagged] == sorted((pair["similarity"] for pair in similar), reverse=True)
+    assert not flagged[0]["reviews_each_other"]
+    assert any(pair["reviews_each_other"] for pair in flagged)
+    assert len(server.issues) == 3 * len(students)
@@ -0,0 +1,179 @@
+"""
+Tests of the GitHub API client (scripts/github_api.py) against FakeGitHub.
+"""
+
+import pytest
+
+import github_api
+from github_api import GitHubClient, GitHubError, RateLimiter
+
+pytestmark = pytest.mark.scripts
+
+REPOSITORY = "course/linked-lists"
+
+
+@pytest.fixture(autouse=True)
+def no_waiting(monkeypatch):
+    """Retry without the real backoff and secondary rate limit waits"""
+    monkeypatch.setattr(github_api, "BACKOFF_SECONDS", 0.0)
+    monkeypatch.setattr(github_api, "SECONDARY_RATE_LIMIT_WAIT", 0.01)
+
+
+def client_for(server, **options):
+    return GitHubClient("token", REPOSITORY, api_url=server.url, rate_limiter=RateLimiter(reserve=0), **options)
+
+
+def test_paginate_returns_every_item(fake_github):
+    server = fake_github()
+    server.add_pull(1, [f"reviews/file-{i}.md" for i in range(25)])
+    client = client_for(server)
+
+    files = client.paginate(f"/repos/{REPOSITORY}/pulls/1/files", per_page=10)
+
+    assert [entry["filename"] for entry in files] == [f"reviews/file-{i}.md" for i in range(25)]
+    assert server.requests[("GET", f"/repos/{REPOSITORY}/pulls/1/files")] == 3
+
+
+def test_paginate_stops_after_a_short_page(fake_github):
+    server = fake_github()
+    server.add_pull(1, [f"reviews/file-{i}.md" for i in range(10)])
+    client = client_for(server)
+
+    assert len(client.paginate(f"/repos/{REPOSITORY}/pulls/1/files", per_page=10)) == 10
+    # A full last page needs one more, empty, page to tell it is the last
+    assert server.requests[("GET", f"/repos/{REPOSITORY}/pulls/1/files")] == 2
+
+
+def test_get_is_retried_after_server_errors(fake_github):
+    server = fake_github(fail_every=2)
+    server.add_pull(1, ["reviews/review-for-alice.md"])
+    client = client_for(server)
+
+    for _ in range(3):
+        files, _ = client.request("GET", f"/repos/{REPOSITORY}/pulls/1/files")
+        assert files[0]["filename"] == "reviews/review-for-alice.md"
+
+
+def test_client_errors_are_not_retried(fake_github):
+    server = fake_github()
+    client = client_for(server)
+
+    with pytest.raises(GitHubError) as error:
+        client.request("GET", f"/repos/{REPOSITORY}/pulls/7/files")
+
+    assert error.value.status == 404
+    assert server.requests[("GET", f"/repos/{REPOSITORY}/pulls/7/files")] == 1
+
+
+def test_retries_are_bounded(fake_github):
+    server = fake_github(fail_every=1)
+    client = client_for(server, max_retries=2)
+
+    with pytest.raises(GitHubError) as error:
+        client.request("GET", f"/repos/{REPOSITORY}/issues")
+
+    assert error.value.status == 502
+    assert server.requests[("GET", f"/repos/{REPOSITORY}/issues")] == 3
+
+
+def test_post_failing_after_apply_is_not_repeated(fake_github):
+    server = fake_github(fail_every=1, fail_after_apply=True)
+    client = client_for(server)
+
+    with pytest.raises(GitHubError) as error:
+        client.request("POST", f"/repos/{REPOSITORY}/issues", {"title": "Review"})
+
+    assert error.value.maybe_applied
+    assert server.requests[("POST", f"/repos/{REPOSITORY}/issues")] == 1
+    assert len(server.issues) == 1
+
+
+def test_create_issue_does_not_duplicate_an_applied_post(fake_github):
+    server = fake_github(fail_every=3, fail_after_apply=True)
+    client = client_for(server)
+
+    for i in range(10):
+        issue = client.create_issue(f"Review {i}", "body", ["bob"])
+        assert issue["title"] == f"Review {i}"
+
+    titles = [issue["title"] for issue in server.issues]
+    assert sorted(titles) == sorted(f"Review {i}" for i in range(10))
+
+
+def test_create_issue_retries_a_post_that_was_not_applied(fake_github):
+    server = fake_github(fail_every=3)
+    client = client_for(server)
+
+    # The third request, the POST, fails without creating the issue
+    client.request("GET", f"/repos/{REPOSITORY}/issues")
+    client.request("GET", f"/repos/{REPOSITORY}/issues")
+    issue = client.create_issue("Review", "body", ["bob"])
+
+    assert issue["title"] == "Review"
+    assert [issue["title"] for issue in server.issues] == ["Review"]
+    assert server.requests[("POST", f"/repos/{REPOSITORY}/issues")] == 2
+
+
+def test_find_issue_matches_title_and_assignees(fake_github):
+    server = fake_github()
+    client = client_for(server)
+    client.create_issue("Review", "body", ["alice"])
+    client.create_issue("Review", "body", ["bob", "carol"])
+
+    assert client.find_issue("Review", ["bob"])["number"] == 2
+    assert client.find_issue("Review", ["alice"])["number"] == 1
+    assert client.find_issue("Review", ["dave"]) is None
+    assert client.find_issue("Other", ["alice"]) is None
+
+
+def test_secondary_rate_limit_is_retried_after_the_wait(fake_github, monkeypatch):
+    monkeypatch.setattr(github_api, "SECONDARY_RATE_LIMIT_WAIT", 0.2)
+    server = fake_github(secondary_limit_every=2)
+    client = client_for(server)
+
+    client.request("GET", f"/repos/{REPOSITORY}/issues")
+    issue = client.create_issue("Review", "body", ["bob"])
+
+    assert issue["title"] == "Review"
+    assert len(server.issues) == 1
+    assert server.requests[("POST", f"/repos/{REPOSITORY}/issues")] == 2
+    assert client.rate_limiter.waited == pytest.approx(0.2, abs=0.05)
+
+
+def test_exhausted_quota_waits_for_the_reset(fake_github):
+    server = fake_github(quota=3, window=0.5)
+    client = client_for(server)
+
+    for _ in range(6):
+        client.request("GET", f"/repos/{REPOSITORY}/issues")
+
+    assert client.rate_limiter.waited > 0
+    assert server.requests[("GET", f"/repos/{REPOSITORY}/issues")] >= 6
+
+
+def test_reserve_pauses_before_the_quota_runs_out(fake_github):
+    server = fake_github(quota=4, window=0.5)
+    client = GitHubClient("token", REPOSITORY, api_url=server.url, rate_limiter=RateLimiter(reserve=2))
+
+    for _ in range(4):
+        client.request("GET", f"/repos/{REPOSITORY}/issues")
+
+    assert client.rate_limiter.waited > 0
+    assert server.rate_limited == 0
+
+
+@pytest.mark.parametrize("status, headers, message, expected", [
+    (403, {"Retry-After": "5"}, "", 5.0),
+    (502, {"Retry-After": "2"}, "", 2.0),
+    (403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1030"}, "API rate limit exceeded", 30.0),
+    (429, {"X-RateLimit-Remaining": "12"}, "", 0.5),
+    (403, {"X-RateLimit-Remaining": "12"}, "You have exceeded a secondary rate limit", 0.5),
+    (403, {"X-RateLimit-Remaining": "12"}, "Resource not accessible by integration", None),
+    (404, {}, "Not Found", None),
+    (500, {}, "", None),
+])
+def test_retry_delay(monkeypatch, status, headers, message, expected):
+    monkeypatch.setattr(github_api, "SECONDARY_RATE_LIMIT_WAIT", 0.5)
+    limiter = RateLimiter(clock=lambda: 1000.0)
+
+    assert limiter.retry_delay(status, headers, message) == expected
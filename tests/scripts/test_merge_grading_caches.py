@@ -0,0 +1,55 @@
+"""
+Tests of the merging of shard grading caches (scripts/merge_grading_caches.py).
+"""
+
+import pytest
+
+from harness.results_cache import ResultsCache
+from harness.results_db import ResultsDB
+from merge_grading_caches import merge_grading_caches
+
+pytestmark = pytest.mark.scripts
+
+
+def measurement(op, median):
+    return {"op": op, "size": 1000, "stats": {"median": median, "mad": 0.0, "n": 5}}
+
+
+def write_shard(directory, branch, median, recorded_at):
+    ResultsCache(str(directory / "results.json")).update({f"test-{branch}": {"outcome": "passed"}},
+                                                         {f"submission-{branch}": {"passed": True}})
+    db = ResultsDB(str(directory / "benchmarks.sqlite"))
+    db.record([measurement("sort", median)], "release", branch=branch, source=f"source-{branch}",
+              recorded_at=recorded_at)
+    db.close()
+
+
+def test_shards_are_merged_into_the_shared_cache(tmp_path):
+    shared = tmp_path / "shared"
+    write_shard(shared, "dev-carol", 300.0, 1.0)
+    for i, branch in enumerate(["dev-alice", "dev-bob"]):
+        write_shard(tmp_path / f"shard-{i}", branch, 100.0 * (i + 1), 2.0)
+    (tmp_path / "shard-2").mkdir()
+
+    merged = merge_grading_caches([str(tmp_path / f"shard-{i}") for i in range(3)],
+                                  str(shared / "results.json"), str(shared / "benchmarks.sqlite"))
+
+    assert merged == (2, 2)
+    cache = ResultsCache(str(shared / "results.json"))
+    assert sorted(cache.data["submissions"]) == ["submission-dev-alice", "submission-dev-bob", "submission-dev-carol"]
+    db = ResultsDB(str(shared / "benchmarks.sqlite"))
+    assert db.cohort("sort", 1000, "release")["ranking"] == [("dev-alice", 100.0), ("dev-bob", 200.0),
+                                                            ("dev-carol", 300.0)]
+    db.close()
+
+
+def test_merging_a_shard_again_replaces_its_results(tmp_path):
+    shard = tmp_path / "shard"
+    write_shard(shard, "dev-alice", 100.0, 1.0)
+    db = ResultsDB(str(tmp_path / "benchmarks.sqlite"))
+
+    assert db.merge(str(shard / "benchmarks.sqlite")) == 1
+    assert db.merge(str(shard / "benchmarks.sqlite")) == 1
+
+    assert len(db.history("dev-alice")) == 1
+    db.close()
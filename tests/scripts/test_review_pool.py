@@ -0,0 +1,163 @@
+"""
+Tests of the review pool store (scripts/pool_store.py) and of
+scripts/update_review_pool.py.
+"""
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import update_review_pool
+from pool_store import ReviewPool, read_pool
+
+pytestmark = pytest.mark.scripts
+
+OVER_BUDGET = {
+    "test_performance_budget": {
+        "performance": {
+            "tier": "over-budget",
+            "violations": [{"op": "sort", "kind": "class", "hard": True, "limit": "n log n", "actual": "n^2",
+                            "size": None}],
+            "metrics": {},
+        },
+    },
+}
+
+
+@pytest.fixture
+def pool_path(tmp_path):
+    return str(tmp_path / "review_pool.json")
+
+
+def add_students(path, students):
+    """Add students one update at a time, as separate workflow runs do"""
+    pool = ReviewPool(path)
+    for student in students:
+        pool.add([student])
+
+
+def test_add_keeps_order_and_skips_members(pool_path):
+    pool = ReviewPool(pool_path)
+
+    assert pool.add(["bob", "alice", "bob"]) == ["bob", "alice"]
+    assert pool.add(["alice", "carol"]) == ["carol"]
+
+    assert read_pool(pool_path)["students"] == ["bob", "alice", "carol"]
+    assert "carol" in ReviewPool(pool_path)
+
+
+def test_add_without_changes_does_not_write(pool_path):
+    pool = ReviewPool(pool_path)
+    pool.add(["alice"])
+    last_updated = read_pool(pool_path)["last_updated"]
+
+    assert pool.add(["alice"]) == []
+    assert read_pool(pool_path)["last_updated"] == last_updated
+
+
+def test_add_keeps_concurrent_additions(pool_path):
+    first = ReviewPool(pool_path)
+    second = ReviewPool(pool_path)
+
+    first.add(["alice"])
+    second.add(["bob"])
+
+    assert read_pool(pool_path)["students"] == ["alice", "bob"]
+
+
+def test_concurrent_updates_lose_nothing(pool_path):
+    batches = [[f"student-{worker}-{i}" for i in range(20)] for worker in range(4)]
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(add_students, [pool_path] * len(batches), batches))
+
+    students = read_pool(pool_path)["students"]
+    assert sorted(students) == sorted(student for batch in batches for student in batch)
+
+
+def test_remove_and_performance(pool_path):
+    pool = ReviewPool(pool_path)
+    pool.add(["alice", "bob"])
+
+    assert pool.add(["carol"], {"bob": {"tier": "over-budget"}}, remove=["bob", "dave"]) == ["carol"]
+
+    data = read_pool(pool_path)
+    assert data["students"] == ["alice", "carol"]
+    assert data["performance"] == {"bob": {"tier": "over-budget"}}
+    assert "bob" not in pool
+
+
+def test_invalid_pool_is_replaced(pool_path):
+    with open(pool_path, "w") as f:
+        f.write("{not json")
+
+    ReviewPool(pool_path).add(["alice"])
+
+    assert read_pool(pool_path)["students"] == ["alice"]
+
+
+@pytest.fixture
+def student_checkout(tmp_path, monkeypatch):
+    """Run update_review_pool.py in an empty checkout of dev-alice"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("BRANCH_NAME", "dev-alice")
+    return tmp_path
+
+
+def set_verdict(monkeypatch, passed=True, metrics=None):
+    verdict = {"passed": passed, "tests": {}, "metrics": metrics or {}}
+    monkeypatch.setattr(update_review_pool, "cached_verdict", lambda: verdict)
+
+
+def test_passing_student_is_added(student_checkout, monkeypatch):
+    set_verdict(monkeypatch)
+
+    assert update_review_pool.update_review_pool(from_cache=True)
+    assert read_pool()["students"] == ["alice"]
+
+
+def test_failing_verdict_is_not_added(student_checkout, monkeypatch):
+    set_verdict(monkeypatch, passed=False)
+
+    assert not update_review_pool.update_review_pool(from_cache=True)
+    assert read_pool()["students"] == []
+
+
+def test_withheld_student_succeeds_and_is_removed(student_checkout, monkeypatch):
+    ReviewPool().add(["alice", "bob"])
+    set_verdict(monkeypatch, metrics=OVER_BUDGET)
+
+    assert update_review_pool.update_review_pool(from_cache=True, withhold_over_budget=True)
+
+    data = read_pool()
+    assert data["students"] == ["bob"]
+    assert data["performance"]["alice"]["tier"] == "over-budget"
+    assert data["performance"]["alice"]["admitted"] is False
+
+
+def test_over_budget_student_is_added_unless_withheld(student_checkout, monkeypatch):
+    set_verdict(monkeypatch, metrics=OVER_BUDGET)
+
+    assert update_review_pool.update_review_pool(from_cache=True)
+    assert read_pool()["students"] == ["alice"]
+    assert read_pool()["performance"]["alice"]["admitted"] is True
+
+
+def test_batch_results_of_every_shard_are_applied(student_checkout):
+    ReviewPool().add(["carol"])
+    shards = [
+        {"alice": {"passed": True}, "bob": {"passed": False}},
+        {"carol": {"passed": True, "metrics": OVER_BUDGET}, "dave": {"passed": True}},
+    ]
+    paths = []
+    for i, results in enumerate(shards):
+        paths.append(str(student_checkout / f"grading_results-{i}.json"))
+        with open(paths[-1], "w") as f:
+            json.dump({"results": results}, f)
+
+    assert update_review_pool.update_review_pool_from_results(paths, withhold_over_budget=True)
+    assert read_pool()["students"] == ["alice", "dave"]
+
+
+def test_missing_results_file_fails(student_checkout):
+    assert not update_review_pool.update_review_pool_from_results([str(student_checkout / "missing.json")])
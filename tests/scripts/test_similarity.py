@@ -0,0 +1,128 @@
+"""
+Tests of the near-duplicate search (scripts/similarity.py).
+
+tests/data/submissions holds independent solutions of the assignment, which
+are all expected to stay below the threshold, while disguised copies of them
+are expected to be found.
+"""
+
+import glob
+import itertools
+import os
+import random
+import re
+
+import pytest
+
+from similarity import (DEFAULT_THRESHOLD, SignatureCache, candidate_pairs, estimate_similarity,
+                        find_similar_pairs, minhash, shingles, tokenize)
+
+pytestmark = pytest.mark.scripts
+
+SUBMISSIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "submissions")
+
+
+@pytest.fixture(scope="module")
+def submissions():
+    sources = {}
+    for path in sorted(glob.glob(os.path.join(SUBMISSIONS_DIR, "*.cpp"))):
+        with open(path) as f:
+            sources[os.path.splitext(os.path.basename(path))[0]] = f.read()
+    return sources
+
+
+def disguise(source):
+    """Rename the locals, drop the comments and reformat, as a copier would"""
+    for old, new in [("current", "walker"), ("temp", "node"), ("prev", "before"), ("slow", "tortoise"),
+                     ("fast", "hare")]:
+        source = re.sub(rf"\b{old}\b", new, source)
+    source = re.sub(r"//[^\n]*", "", source)
+    return re.sub(r"\n\s*\n", "\n", source).replace("{", "{\n")
+
+
+def signature(source):
+    return minhash(shingles(tokenize(source)))
+
+
+def test_tokenize_normalizes_locals_but_keeps_the_api():
+    first = tokenize('void LinkedList::insertAtEnd(int value) { Node* cur = head; std::cout << "x"; }')
+    second = tokenize("void LinkedList::insertAtEnd(int v) { Node* it = head; std::cout << 'y'; } // note")
+
+    assert first == second
+    assert "insertAtEnd" in first and "LinkedList" in first and "head" in first
+    assert "cur" not in first and "STR" in first
+
+
+def test_minhash_estimates_jaccard_similarity():
+    rng = random.Random(3)
+    shared = {rng.getrandbits(64).to_bytes(8, "little") for _ in range(1000)}
+    first = shared | {rng.getrandbits(64).to_bytes(8, "little") for _ in range(500)}
+    second = shared | {rng.getrandbits(64).to_bytes(8, "little") for _ in range(500)}
+
+    assert estimate_similarity(minhash(first), minhash(second)) == pytest.approx(0.5, abs=0.1)
+    assert estimate_similarity(minhash(first), minhash(set(first))) == 1.0
+    assert minhash(set()) is None
+
+
+def test_minhash_of_small_sets_fills_empty_bins():
+    small = {b"a", b"b", b"c"}
+    signature = minhash(small)
+
+    assert None not in signature
+    assert estimate_similarity(signature, minhash({b"a", b"b", b"d"})) < 1.0
+
+
+def test_lsh_finds_close_pairs_and_skips_distant_ones():
+    rng = random.Random(5)
+
+    def random_set(size):
+        return {rng.getrandbits(64).to_bytes(8, "little") for _ in range(size)}
+
+    base = random_set(1000)
+    close = set(list(base)[:950]) | random_set(50)
+    distant = set(list(base)[:200]) | random_set(800)
+    signatures = {"base": minhash(base), "close": minhash(close), "distant": minhash(distant)}
+
+    assert candidate_pairs(signatures) == {("base", "close")}
+    pairs = find_similar_pairs(signatures, threshold=0.8)
+    assert [pair["students"] for pair in pairs] == [["base", "close"]]
+
+
+def test_independent_submissions_are_below_the_threshold(submissions):
+    assert len(submissions) >= 4
+    signatures = {name: signature(source) for name, source in submissions.items()}
+
+    for a, b in itertools.combinations(signatures, 2):
+        assert estimate_similarity(signatures[a], signatures[b]) < DEFAULT_THRESHOLD, (a, b)
+    assert find_similar_pairs(signatures) == []
+
+
+def test_disguised_copies_are_found(submissions):
+    signatures = {name: signature(source) for name, source in submissions.items()}
+    signatures["copy"] = signature(disguise(submissions["textbook_1"]))
+    signatures["copy-3"] = signature(disguise(submissions["textbook_3"]))
+
+    pairs = find_similar_pairs(signatures)
+
+    assert [sorted(pair["students"]) for pair in pairs] == [["copy", "textbook_1"], ["copy-3", "textbook_3"]]
+    assert all(pair["similarity"] == 1.0 for pair in pairs)
+
+
+def test_signature_cache(tmp_path, submissions):
+    path = str(tmp_path / "minhash.json")
+    source = submissions["textbook_2"]
+
+    cache = SignatureCache(path)
+    first = cache.signature(source)
+    assert cache.signature(source) == first
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.save()
+
+    reloaded = SignatureCache(path)
+    assert reloaded.signature(source) == first
+    assert reloaded.hits == 1
+
+    # Signatures computed with other parameters are not reused
+    other = SignatureCache(path, seed=2)
+    other.signature(source)
+    assert other.misses == 1
@@ -0,0 +1,118 @@
+"""
+Tests of the review validator (scripts/validate_review.py).
+"""
+
+import functools
+import json
+import os
+
+import pytest
+
+from github_api import GitHubClient, RateLimiter
+from validate_review import build_reviewer_index, check_files, load_reviewer_index, main, validate_review
+
+pytestmark = pytest.mark.scripts
+
+REPOSITORY = "course/linked-lists"
+
+ASSIGNMENTS = {
+    "alice": ["bob", "carol"],
+    "bob": ["carol", "alice"],
+    "carol": ["alice", "bob"],
+}
+
+
+@pytest.fixture
+def assignments_file(tmp_path):
+    path = tmp_path / "assignments.json"
+    path.write_text(json.dumps({"assignments": ASSIGNMENTS}))
+    return str(path)
+
+
+def test_build_reviewer_index():
+    assert build_reviewer_index(ASSIGNMENTS) == {
+        "bob": ["alice", "carol"],
+        "carol": ["alice", "bob"],
+        "alice": ["bob", "carol"],
+    }
+
+
+def test_reviewer_index_is_cached_under_the_assignments_hash(assignments_file, tmp_path):
+    cache = str(tmp_path / "cache" / "reviewer_index.json")
+
+    index = load_reviewer_index(assignments_file, cache)
+    assert index["bob"] == {"alice", "carol"}
+    assert os.path.exists(cache)
+
+    # An unchanged assignments file is read from the cache
+    with open(cache) as f:
+        cached = json.load(f)
+    cached["index"]["bob"] = ["cached"]
+    with open(cache, "w") as f:
+        json.dump(cached, f)
+    assert load_reviewer_index(assignments_file, cache)["bob"] == {"cached"}
+
+    # Changed assignments rebuild it
+    with open(assignments_file, "w") as f:
+        json.dump({"assignments": {"alice": ["dave"]}}, f)
+    assert load_reviewer_index(assignments_file, cache) == {"dave": {"alice"}}
+
+
+def test_reviewer_index_of_a_missing_or_invalid_file(tmp_path):
+    cache = str(tmp_path / "reviewer_index.json")
+    assert load_reviewer_index(str(tmp_path / "missing.json"), cache) is None
+
+    invalid = tmp_path / "invalid.json"
+    invalid.write_text("{}")
+    assert load_reviewer_index(str(invalid), cache) is None
+
+
+@pytest.mark.parametrize("files, errors", [
+    ([("reviews/review-for-alice.md", "added")], []),
+    ([], ["The pull request must add reviews/review-for-alice.md"]),
+    ([("reviews/review-for-alice.md", "modified")], ["reviews/review-for-alice.md must be a new file, not modified"]),
+    ([("reviews/review-for-alice.md", "added"), ("src/linked_list.cpp", "modified")],
+     ["Unexpected change to src/linked_list.cpp: a review may only add reviews/review-for-alice.md"]),
+    ([("reviews/review-for-carol.md", "added")],
+     ["The pull request must add reviews/review-for-alice.md",
+      "Unexpected change to reviews/review-for-carol.md: a review may only add reviews/review-for-alice.md"]),
+])
+def test_check_files(files, errors):
+    entries = [{"filename": path, "status": status} for path, status in files]
+    assert check_files(entries, "alice") == errors
+
+
+def test_validate_review(fake_github):
+    server = fake_github()
+    server.add_pull(1, ["reviews/review-for-alice.md"])
+    server.add_pull(2, ["reviews/review-for-alice.md", ("src/linked_list.cpp", "modified")])
+    client = GitHubClient("token", REPOSITORY, api_url=server.url, rate_limiter=RateLimiter(reserve=0))
+    index = {reviewer: set(students) for reviewer, students in build_reviewer_index(ASSIGNMENTS).items()}
+
+    assert validate_review(client, 1, "dev-alice", "bob", index) == []
+    assert validate_review(client, 1, "dev-alice", "dave", index) == ["dave is not assigned to review alice"]
+    assert validate_review(client, 1, "dev-alice", "alice", index) == ["Students cannot review their own submission"]
+    assert validate_review(client, 1, "main", "bob", index) == ["Reviews must target a dev-<student> branch, not main"]
+    assert len(validate_review(client, 2, "dev-alice", "bob", index)) == 1
+
+
+def test_main_exit_status(fake_github, assignments_file, tmp_path, monkeypatch):
+    server = fake_github()
+    server.add_pull(1, ["reviews/review-for-alice.md"])
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("validate_review.GitHubClient", functools.partial(GitHubClient, api_url=server.url))
+    monkeypatch.setattr("sys.argv", ["validate_review.py", "--assignments", assignments_file])
+    monkeypatch.setenv("GITHUB_REPOSITORY", REPOSITORY)
+    monkeypatch.setenv("PR_NUMBER", "1")
+    monkeypatch.setenv("BASE_BRANCH", "dev-alice")
+
+    monkeypatch.setenv("PR_AUTHOR", "bob")
+    assert main() == 0
+
+    monkeypatch.setenv("PR_AUTHOR", "dave")
+    assert main() == 1
+
+    # Without an author the name in the head branch is used
+    monkeypatch.delenv("PR_AUTHOR")
+    monkeypatch.setenv("HEAD_BRANCH", "dev-carol")
+    assert main() == 0
@@ -10,18 +10,47 @@ requirements specified in the README.md file.
 """
 
 import pytest
-import subprocess
+import json
+import math
 import os
-import re
-import platform
 
-# Determine the correct command based on the OS
-if platform.system() == "Windows":
-    COMPILE_CMD = "g++ -std=c++17 -o {executable} {source_files}"
-    RUN_CMD = "{executable}"
-else:
-    COMPILE_CMD = "g++ -std=c++17 -o {executable} {source_files}"
-    RUN_CMD = "./{executable}"
+from harness.adversarial import (
+    ADVERSARIAL_REPETITIONS,
+    ADVERSARIAL_SCENARIO,
+    ADVERSARIAL_TIMEOUT,
+    ADVERSARIAL_WARMUP,
+    run_adversarial_benchmark,
+)
+from harness.bench import BENCH_SCENARIO, BenchmarkRunner, run_scaling_benchmark
+from harness.budget import ENFORCE_PERF_BUDGET, check_budget, describe_violation, load_budget
+from harness.build import compile_object, profile_flags
+from harness.cycles import (
+    CYCLES_AUX_SLACK,
+    CYCLES_REPETITIONS,
+    CYCLES_SCENARIO,
+    CYCLES_TIMEOUT,
+    CYCLES_WARMUP,
+    run_cycles_benchmark,
+)
+from harness.differential import build_library, run_differential
+from harness.driver import Scenario, case_limits
+from harness.locality import LOCALITY_REPETITIONS, LOCALITY_SCENARIO, LOCALITY_WARMUP, run_locality_benchmark
+from harness.memory import parse_alloc_reports
+from harness.results_db import open_results_db, parse_timing_lines
+from harness.scheduler import (
+    BuildScheduler,
+    cleanup_scratch,
+    compile_driver,
+    executable_path,
+    link_program,
+    memory_limited,
+    run_program,
+    scratch_dir,
+)
+from harness.signatures import probe_signatures
+from harness.stream import check_stream
+from harness.threads import THREADS_SCENARIO, run_thread_scaling
+from harness.trace import TRACE_REPLAY_CPP, generate_workload, parse_replay_report
 
 # Path constants - these match the required project structure
 SRC_DIR = "src"
@@ -32,51 +61,553 @@ MAIN_CPP = "main.cpp"
 # Test executable name
 TEST_EXECUTABLE = "test_linked_list"
 
+# Elements printed by display() in the streamed output check
+DISPLAY_STREAM_SIZE = int(os.environ.get("LL_DISPLAY_STREAM_SIZE", 10 ** 6))
+
+# Trace replay driver and the size of the workload it replays
+TRACE_EXECUTABLE = "trace_replay"
+TRACE_OPS = int(os.environ.get("LL_TRACE_OPS", 200000))
+
 # Test helper functions
-def compile_test_program(test_code, executable_name=TEST_EXECUTABLE):
+def compile_test_program(test_code, executable_name=TEST_EXECUTABLE, profile="default"):
     """
     Compile a test program with the student's linked list implementation.
     
-    This function creates a temporary C++ file with test code, then compiles it
-    along with the student's implementation.
+    This function writes the test code into the program's own scratch
+    directory, then compiles it and links it against the student's
+    implementation. The implementation is compiled only once per build
+    profile into a cached object file shared by all test programs.
     
     Args:
         test_code: C++ code to test the linked list implementation
         executable_name: Name for the compiled executable
+        profile: Build profile of the program and the implementation
         
     Returns:
         bool: True if compilation succeeded, False otherwise
     """
-    # Create a temporary test file
-    with open("temp_test.cpp", "w") as f:
-        f.write(test_code)
+    flags = profile_flags(profile)
     
-    # Compile the test program
-    source_files = f"temp_test.cpp {LINKED_LIST_CPP}"
-    cmd = COMPILE_CMD.format(executable=executable_name, source_files=source_files)
+    # Compile the student's implementation (or reuse the cached object)
+    linked_list_obj = compile_object(LINKED_LIST_CPP, flags)
+    if linked_list_obj is None:
+        return False
     
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+    # Compile the test program and link it against the implementation
+    driver_obj, errors = compile_driver(executable_name, test_code, flags=flags)
+    if driver_obj is None:
+        print(f"Compilation error: {errors}")
+        return False
     
-    # Check if compilation was successful
-    if result.returncode != 0:
-        print(f"Compilation error: {result.stderr}")
+    executable, errors = link_program(executable_name, [driver_obj, linked_list_obj], flags=flags)
+    if executable is None:
+        print(f"Compilation error: {errors}")
         return False
     
     return True
 
-def run_test_program(executable_name=TEST_EXECUTABLE):
+def run_test_program(executable_name=TEST_EXECUTABLE, args=()):
     """
     Run the compiled test program and return its output.
     
     Args:
         executable_name: Name of the executable to run
+        args: Command line arguments passed to the program
+        
+    Returns:
+        RunResult: (stdout, stderr, returncode, outcome, usage) of the program,
+        which is killed once it exceeds its time or memory limits
+    """
+    return run_program(executable_path(executable_name), args)
+
+def failure_message(result):
+    """
+    Describe why a test program failed.
+    
+    Args:
+        result: CaseResult or RunResult of the program
         
     Returns:
-        tuple: (stdout, stderr, return_code) from the executed program
+        str: The program's error output, prefixed with the limit it exceeded
+    """
+    if result.outcome == "timeout":
+        return f"timed out after {result.usage.get('wall_s', 0):.1f}s wall-clock time\n{result.stderr}"
+    if result.outcome == "oom":
+        return f"ran out of memory ({result.usage.get('max_rss_kb', 0)} KiB resident)\n{result.stderr}"
+    return result.stderr
+
+# Test scenarios - each is the body of a named case in the test driver built
+# with its profile: "check" (sanitizers) for correctness, "bench" (optimized)
+# for timing
+BASIC_OPERATIONS_TEST = """
+    LinkedList list;
+    
+    // Test isEmpty on empty list
+    assert(list.isEmpty() == true);
+    assert(list.getSize() == 0);
+    
+    // Test insertAtBeginning
+    list.insertAtBeginning(10);
+    assert(list.isEmpty() == false);
+    assert(list.getSize() == 1);
+    
+    // Test insertAtEnd
+    list.insertAtEnd(20);
+    assert(list.getSize() == 2);
+    
+    // Test insertAtPosition
+    list.insertAtPosition(15, 1);
+    assert(list.getSize() == 3);
+    
+    // Test deleteFromBeginning
+    assert(list.deleteFromBeginning() == true);
+    assert(list.getSize() == 2);
+    
+    // Test deleteFromEnd
+    assert(list.deleteFromEnd() == true);
+    assert(list.getSize() == 1);
+    
+    // Test deleteFromPosition
+    list.insertAtBeginning(5);
+    assert(list.deleteFromPosition(0) == true);
+    assert(list.getSize() == 1);
+    
+    // Test deleteValue
+    list.insertAtEnd(25);
+    assert(list.deleteValue(15) == true);
+    assert(list.getSize() == 1);
+    
+    // Test clear
+    list.clear();
+    assert(list.isEmpty() == true);
+    assert(list.getSize() == 0);
+    
+    std::cout << "All basic operations tests passed!" << std::endl;
+    return 0;
+"""
+
+ADVANCED_OPERATIONS_TEST = """
+    LinkedList list;
+    
+    // Test search
+    list.insertAtEnd(10);
+    list.insertAtEnd(20);
+    list.insertAtEnd(30);
+    
+    Node* found = list.search(20);
+    assert(found != nullptr);
+    assert(found->data == 20);
+    
+    Node* not_found = list.search(25);
+    assert(not_found == nullptr);
+    
+    // Test reverse
+    list.reverse();
+    // After reverse: 30 -> 20 -> 10
+    Node* first = list.search(30);
+    assert(first != nullptr);
+    
+    // Test sort
+    list.clear();
+    list.insertAtEnd(30);
+    list.insertAtEnd(10);
+    list.insertAtEnd(20);
+    list.sort();
+    // After sort: 10 -> 20 -> 30
+    Node* smallest = list.search(10);
+    assert(smallest != nullptr);
+    
+    // Test removeDuplicates
+    list.clear();
+    list.insertAtEnd(10);
+    list.insertAtEnd(20);
+    list.insertAtEnd(10);
+    list.insertAtEnd(30);
+    list.insertAtEnd(20);
+    list.removeDuplicates();
+    assert(list.getSize() == 3);
+    
+    // Test getMiddleNode
+    list.clear();
+    list.insertAtEnd(10);
+    list.insertAtEnd(20);
+    list.insertAtEnd(30);
+    Node* middle = list.getMiddleNode();
+    assert(middle != nullptr);
+    assert(middle->data == 20);
+    
+    // Test detectLoop
+    list.clear();
+    list.insertAtEnd(10);
+    list.insertAtEnd(20);
+    assert(list.detectLoop() == false);
+    
+    std::cout << "All advanced operations tests passed!" << std::endl;
+    return 0;
+"""
+
+EDGE_CASES_TEST = """
+    LinkedList list;
+    
+    // Test operations on empty list
+    assert(list.deleteFromBeginning() == false);
+    assert(list.deleteFromEnd() == false);
+    assert(list.deleteFromPosition(0) == false);
+    assert(list.deleteValue(10) == false);
+    assert(list.search(10) == nullptr);
+    assert(list.getMiddleNode() == nullptr);
+    assert(list.detectLoop() == false);
+    
+    // Test operations with invalid positions
+    list.insertAtBeginning(10);
+    assert(list.deleteFromPosition(1) == false);
+    assert(list.deleteFromPosition(-1) == false);
+    
+    list.insertAtPosition(20, 100); // Should handle out-of-bounds position
+    assert(list.getSize() <= 2);
+    
+    std::cout << "All edge cases tests passed!" << std::endl;
+    return 0;
+"""
+
+PERFORMANCE_TEST = """
+    LinkedList list;
+    const int SIZE = 1000;
+    
+    // Insert many elements
+    auto start = std::chrono::high_resolution_clock::now();
+    for (int i = 0; i < SIZE; i++) {
+        list.insertAtEnd(i);
+    }
+    auto end = std::chrono::high_resolution_clock::now();
+    auto duration = std::chrono::duration_cast<std::chrono::milliseconds>(end - start).count();
+    
+    std::cout << "Time to insert " << SIZE << " elements: " << duration << "ms" << std::endl;
+    assert(list.getSize() == SIZE);
+    
+    // Search for elements
+    start = std::chrono::high_resolution_clock::now();
+    for (int i = 0; i < SIZE; i += 100) {
+        Node* found = list.search(i);
+        assert(found != nullptr);
+        assert(found->data == i);
+    }
+    end = std::chrono::high_resolution_clock::now();
+    duration = std::chrono::duration_cast<std::chrono::milliseconds>(end - start).count();
+    
+    std::cout << "Time to search for elements: " << duration << "ms" << std::endl;
+    
+    // Sort the list
+    start = std::chrono::high_resolution_clock::now();
+    list.sort();
+    end = std::chrono::high_resolution_clock::now();
+    duration = std::chrono::duration_cast<std::chrono::milliseconds>(end - start).count();
+    
+    std::cout << "Time to sort " << SIZE << " elements: " << duration << "ms" << std::endl;
+    
+    std::cout << "All performance tests passed!" << std::endl;
+    return 0;
+"""
+
+MEMORY_TEST = """
+    const int COUNT = 100;
+    
+    // Nodes added and removed one at a time
+    AllocStats start = alloc_stats();
+    {
+        LinkedList list;
+        {
+            AllocScope scope("insertAtBeginning");
+            for (int i = 0; i < COUNT; i++) {
+                list.insertAtBeginning(i);
+            }
+        }
+        {
+            AllocScope scope("insertAtEnd");
+            for (int i = 0; i < COUNT; i++) {
+                list.insertAtEnd(i);
+            }
+        }
+        {
+            AllocScope scope("insertAtPosition");
+            for (int i = 0; i < COUNT; i++) {
+                list.insertAtPosition(i, list.getSize() / 2);
+            }
+        }
+        {
+            AllocScope scope("deleteFromBeginning");
+            for (int i = 0; i < COUNT / 2; i++) {
+                list.deleteFromBeginning();
+            }
+        }
+        {
+            AllocScope scope("deleteFromEnd");
+            for (int i = 0; i < COUNT / 2; i++) {
+                list.deleteFromEnd();
+            }
+        }
+        {
+            AllocScope scope("deleteFromPosition");
+            for (int i = 0; i < COUNT / 2; i++) {
+                list.deleteFromPosition(list.getSize() / 2);
+            }
+        }
+        {
+            AllocScope scope("clear");
+            list.clear();
+        }
+        alloc_report("after_clear", start, alloc_stats());
+    }
+    
+    // removeDuplicates and deleteValue must free the nodes they unlink
+    {
+        LinkedList list;
+        for (int i = 0; i < COUNT; i++) {
+            list.insertAtEnd(i);
+            list.insertAtEnd(i);
+        }
+        {
+            AllocScope scope("removeDuplicates");
+            list.removeDuplicates();
+        }
+        {
+            AllocScope scope("deleteValue");
+            for (int i = 0; i < COUNT / 2; i++) {
+                list.deleteValue(i);
+            }
+        }
+    }
+    
+    // A list destroyed without calling clear() must release every node
+    start = alloc_stats();
+    {
+        LinkedList* list = new LinkedList();
+        for (int i = 0; i < COUNT; i++) {
+            list->insertAtEnd(i);
+        }
+        list->sort();
+        list->reverse();
+        AllocScope scope("destructor");
+        delete list;
+    }
+    alloc_report("lifetime", start, alloc_stats());
+    
+    std::cout << "All memory tests passed!" << std::endl;
+    return 0;
+"""
+
+DISPLAY_STREAM_TEST = """
+    if (argc < 2) {
+        std::cerr << "usage: display_stream <size> <multiplier>" << std::endl;
+        return 2;
+    }
+    const long long n = std::atoll(argv[0]);
+    const long long multiplier = std::atoll(argv[1]);
+    
+    // A permutation of 0..n-1, halved and shifted: every value appears
+    // twice (once if n is odd) and a quarter of them are negative
+    LinkedList list;
+    for (long long i = n - 1; i >= 0; i--) {
+        list.insertAtBeginning((int)((i * multiplier) % n / 2 - n / 4));
+    }
+    
+    // Each display() is preceded by a section marker for harness.stream
+    std::cout << "\\n##display" << std::endl;
+    list.display();
+    std::cout << "\\n##reverse" << std::endl;
+    list.reverse();
+    list.display();
+    std::cout << "\\n##sort" << std::endl;
+    list.sort();
+    list.display();
+    std::cout << std::endl;
+    return 0;
+"""
+
+def display_sections(size, multiplier):
+    """
+    Expected output of DISPLAY_STREAM_TEST, generated lazily.
+    
+    Returns:
+        list: (section, values) pairs for harness.stream.check_stream
+    """
+    def value(i):
+        return (i * multiplier) % size // 2 - size // 4
+    
+    return [
+        ("display", map(value, range(size))),
+        ("reverse", map(value, range(size - 1, -1, -1))),
+        ("sort", (j // 2 - size // 4 for j in range(size))),
+    ]
+
+DISPLAY_STREAM_SCENARIO = Scenario("display_stream", DISPLAY_STREAM_TEST, includes=("<cstdlib>",))
+
+SCENARIOS = [
+    Scenario("basic_ops", BASIC_OPERATIONS_TEST),
+    Scenario("adv_ops", ADVANCED_OPERATIONS_TEST, includes=("<vector>",)),
+    Scenario("edge_cases", EDGE_CASES_TEST),
+    Scenario("performance", PERFORMANCE_TEST, includes=("<chrono>",), profile="bench"),
+    Scenario("memory", MEMORY_TEST),
+]
+
+# Benchmark scenarios - built into the driver but run with arguments
+BENCHMARK_SCENARIOS = [BENCH_SCENARIO, LOCALITY_SCENARIO, ADVERSARIAL_SCENARIO, THREADS_SCENARIO, CYCLES_SCENARIO]
+
+# Other scenarios run with arguments
+ARGUMENT_SCENARIOS = [DISPLAY_STREAM_SCENARIO]
+
+# Slowest acceptable growth of each operation in the scaling benchmark.
+# Per-element operations are measured per call, whole-list operations
+# (sort, reverse, removeDuplicates) per call over the whole list. These are
+# also the complexity class budgets of tests/perf_budget.json.
+# Override with a JSON file named by LL_EXPECTED_COMPLEXITY.
+EXPECTED_COMPLEXITY = {
+    "insertAtBeginning": "1",
+    "insertAtEnd": "n",
+    "search": "n",
+    "sort": "n log n",
+    "reverse": "n",
+    "removeDuplicates": "n^2",
+    "getMiddleNode": "n",
+    "deleteFromEnd": "n",
+}
+
+# Fixture to check the declarations in the header before building anything
+@pytest.fixture(scope="session")
+def signature_probe():
+    """
+    Check every required declaration in the header with one syntax-only
+    compile.
+    
+    Returns:
+        ProbeResult: The missing or wrong declarations and compiler errors
+    """
+    return probe_signatures(LINKED_LIST_H)
+
+@pytest.fixture(scope="session")
+def required_signatures(signature_probe):
+    """
+    Skip the tests that build the implementation when the header lacks a
+    required declaration: they could only fail to compile.
+    """
+    if not signature_probe.ok:
+        pytest.skip("the header does not declare every required member, see test_class_has_required_methods")
+
+# Fixture to build the test driver and run every scenario
+@pytest.fixture(scope="session")
+def driver(required_signatures):
+    """
+    Build the test drivers and run all scenarios at once.
+    
+    The student's implementation and one driver per build profile are
+    compiled concurrently, then the scenarios are run in parallel, each in
+    its own forked process.
+    
+    Returns:
+        BuildScheduler: The scheduler, holding the driver executable of
+        each profile and the results of every scenario
+    """
+    scheduler = BuildScheduler(LINKED_LIST_CPP)
+    for scenario in SCENARIOS:
+        scheduler.add(scenario)
+    for scenario in BENCHMARK_SCENARIOS + ARGUMENT_SCENARIOS:
+        scheduler.add(scenario, run=False)
+    scheduler.run()
+    return scheduler
+
+@pytest.fixture(scope="session")
+def test_results(driver):
+    """
+    Results of every scenario.
+    
+    Returns:
+        dict: Mapping of scenario name to CaseResult
+    """
+    return driver.results
+
+@pytest.fixture(scope="session")
+def bench_runner(driver):
+    """
+    Benchmark runner shared by all benchmarks.
+    
+    Every measurement is written to the structured benchmark report when
+    the session ends.
+    
+    Returns:
+        BenchmarkRunner: Runner for the driver's benchmark cases
+    """
+    runner = BenchmarkRunner(driver.executables.get("bench"))
+    yield runner
+    if runner.results:
+        runner.write_report()
+
+@pytest.fixture(scope="session")
+def results_db():
+    """
+    Database of benchmark results kept between runs.
+    
+    Returns:
+        ResultsDB: The database, or None if LL_RESULTS_DB is "off"
+    """
+    db = open_results_db()
+    yield db
+    if db is not None:
+        db.close()
+
+def record_benchmarks(results_db, measurements, profile, record_property):
+    """
+    Store benchmark measurements and report regressions.
+    
+    Args:
+        results_db: ResultsDB, or None to skip recording
+        measurements: Measurements in the format of BenchmarkRunner.results
+        profile: Build profile the measurements were taken with
+        record_property: The test's record_property fixture
+    """
+    if results_db is None:
+        return
+    regressions = results_db.record(measurements, profile)
+    for regression in regressions:
+        print(f"Regression: {regression['op']} at size {regression['size']} is "
+              f"{regression['ratio']:.1f}x slower than this branch's best")
+    if regressions:
+        record_property("regressions", regressions)
+
+@pytest.fixture(scope="session")
+def expected_complexity():
+    """
+    Expected complexity classes for the scaling benchmark.
+    
+    Returns:
+        dict: Mapping of operation name to the slowest acceptable class
     """
-    cmd = RUN_CMD.format(executable=executable_name)
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-    return result.stdout, result.stderr, result.returncode
+    expected = dict(EXPECTED_COMPLEXITY)
+    path = os.environ.get("LL_EXPECTED_COMPLEXITY")
+    if path:
+        with open(path, "r") as f:
+            expected.update(json.load(f))
+    return expected
+
+@pytest.fixture(scope="session")
+def perf_budget():
+    """
+    Performance budgets of the operations, from tests/perf_budget.json or
+    the file named by LL_PERF_BUDGET.
+    """
+    return load_budget()
+
+@pytest.fixture(scope="session")
+def scaling_report(driver, bench_runner, expected_complexity):
+    """
+    Result of the scaling benchmark, shared by the tests that check it.
+    
+    Returns:
+        dict: Mapping of operation to its sweep result, or None if the
+        benchmark driver failed to compile
+    """
+    if not driver.executables.get("bench"):
+        return None
+    return run_scaling_benchmark(bench_runner, expected_complexity)
 
 # Fixture to check if required files exist
 @pytest.fixture(scope="session")
@@ -112,46 +643,28 @@ def test_required_files_exist(check_files):
     assert not missing_files, f"Missing required files: {', '.join(missing_files)}"
 
 # Test if the LinkedList class has all required methods
-def test_class_has_required_methods():
-    """
-    Test if the LinkedList class has all required methods with correct signatures.
-    
-    This test parses the header file to check for required method declarations.
-    """
-    # Read the header file
-    with open(LINKED_LIST_H, "r") as f:
-        header_content = f.read()
-    
-    # Required methods to check
-    required_methods = [
-        r"void\s+insertAtBeginning\s*\(\s*int\s+value\s*\)",
-        r"void\s+insertAtEnd\s*\(\s*int\s+value\s*\)",
-        r"void\s+insertAtPosition\s*\(\s*int\s+value\s*,\s*int\s+position\s*\)",
-        r"bool\s+deleteFromBeginning\s*\(\s*\)",
-        r"bool\s+deleteFromEnd\s*\(\s*\)",
-        r"bool\s+deleteFromPosition\s*\(\s*int\s+position\s*\)",
-        r"bool\s+deleteValue\s*\(\s*int\s+value\s*\)",
-        r"int\s+getSize\s*\(\s*\)",
-        r"bool\s+isEmpty\s*\(\s*\)",
-        r"void\s+display\s*\(\s*\)",
-        r"Node\s*\*\s*search\s*\(\s*int\s+value\s*\)",
-        r"void\s+reverse\s*\(\s*\)",
-        r"void\s+sort\s*\(\s*\)",
-        r"void\s+removeDuplicates\s*\(\s*\)",
-        r"Node\s*\*\s*getMiddleNode\s*\(\s*\)",
-        r"bool\s+detectLoop\s*\(\s*\)",
-        r"void\s+clear\s*\(\s*\)"
-    ]
+def test_class_has_required_methods(signature_probe, record_property):
+    """
+    Test if the Node structure and the LinkedList class declare every
+    required member with the correct signature.
     
-    missing_methods = []
-    for method in required_methods:
-        if not re.search(method, header_content):
-            missing_methods.append(method.split(r"\s+")[1].split(r"\s*")[0])
+    All declarations are checked at once by compiling a generated probe
+    against the header with -fsyntax-only (see harness.signatures). Any
+    parameter names are accepted, and methods may be declared const.
+    """
+    result = signature_probe
+    print(f"Checked the declarations in {result.seconds:.2f}s")
+    record_property("signature_probe_seconds", round(result.seconds, 3))
     
-    assert not missing_methods, f"Missing required methods: {', '.join(missing_methods)}"
+    problems = []
+    if result.missing:
+        problems.append(f"Missing or wrong signatures: {', '.join(result.missing)}")
+    if result.errors:
+        problems.append(f"{LINKED_LIST_H} does not compile:\n" + "\n".join(result.errors[:10]))
+    assert not problems, "\n".join(problems)
 
 # Test basic operations
-def test_basic_operations():
+def test_basic_operations(test_results):
     """
     Test basic linked list operations.
     
@@ -166,66 +679,14 @@ def test_basic_operations():
     - deleteValue
     - clear
     """
-    test_code = """
-    #include <iostream>
-    #include <cassert>
-    #include "src/linked_list.h"
-    
-    int main() {
-        LinkedList list;
-        
-        // Test isEmpty on empty list
-        assert(list.isEmpty() == true);
-        assert(list.getSize() == 0);
-        
-        // Test insertAtBeginning
-        list.insertAtBeginning(10);
-        assert(list.isEmpty() == false);
-        assert(list.getSize() == 1);
-        
-        // Test insertAtEnd
-        list.insertAtEnd(20);
-        assert(list.getSize() == 2);
-        
-        // Test insertAtPosition
-        list.insertAtPosition(15, 1);
-        assert(list.getSize() == 3);
-        
-        // Test deleteFromBeginning
-        assert(list.deleteFromBeginning() == true);
-        assert(list.getSize() == 2);
-        
-        // Test deleteFromEnd
-        assert(list.deleteFromEnd() == true);
-        assert(list.getSize() == 1);
-        
-        // Test deleteFromPosition
-        list.insertAtBeginning(5);
-        assert(list.deleteFromPosition(0) == true);
-        assert(list.getSize() == 1);
-        
-        // Test deleteValue
-        list.insertAtEnd(25);
-        assert(list.deleteValue(15) == true);
-        assert(list.getSize() == 1);
-        
-        // Test clear
-        list.clear();
-        assert(list.isEmpty() == true);
-        assert(list.getSize() == 0);
-        
-        std::cout << "All basic operations tests passed!" << std::endl;
-        return 0;
-    }
-    """
-    
-    assert compile_test_program(test_code, "test_basic_ops"), "Failed to compile basic operations test"
-    stdout, stderr, returncode = run_test_program("test_basic_ops")
-    assert returncode == 0, f"Basic operations test failed with error: {stderr}"
+    result = test_results["basic_ops"]
+    assert result.built, "Failed to compile basic operations test"
+    stdout, stderr, returncode = result.stdout, result.stderr, result.returncode
+    assert returncode == 0, f"Basic operations test failed with error: {failure_message(result)}"
     assert "All basic operations tests passed!" in stdout, "Basic operations test did not pass"
 
 # Test advanced operations
-def test_advanced_operations():
+def test_advanced_operations(test_results):
     """
     Test advanced linked list operations.
     
@@ -237,80 +698,14 @@ def test_advanced_operations():
     - getMiddleNode
     - detectLoop
     """
-    test_code = """
-    #include <iostream>
-    #include <cassert>
-    #include <vector>
-    #include "src/linked_list.h"
-    
-    int main() {
-        LinkedList list;
-        
-        // Test search
-        list.insertAtEnd(10);
-        list.insertAtEnd(20);
-        list.insertAtEnd(30);
-        
-        Node* found = list.search(20);
-        assert(found != nullptr);
-        assert(found->data == 20);
-        
-        Node* not_found = list.search(25);
-        assert(not_found == nullptr);
-        
-        // Test reverse
-        list.reverse();
-        // After reverse: 30 -> 20 -> 10
-        Node* first = list.search(30);
-        assert(first != nullptr);
-        
-        // Test sort
-        list.clear();
-        list.insertAtEnd(30);
-        list.insertAtEnd(10);
-        list.insertAtEnd(20);
-        list.sort();
-        // After sort: 10 -> 20 -> 30
-        Node* smallest = list.search(10);
-        assert(smallest != nullptr);
-        
-        // Test removeDuplicates
-        list.clear();
-        list.insertAtEnd(10);
-        list.insertAtEnd(20);
-        list.insertAtEnd(10);
-        list.insertAtEnd(30);
-        list.insertAtEnd(20);
-        list.removeDuplicates();
-        assert(list.getSize() == 3);
-        
-        // Test getMiddleNode
-        list.clear();
-        list.insertAtEnd(10);
-        list.insertAtEnd(20);
-        list.insertAtEnd(30);
-        Node* middle = list.getMiddleNode();
-        assert(middle != nullptr);
-        assert(middle->data == 20);
-        
-        // Test detectLoop
-        list.clear();
-        list.insertAtEnd(10);
-        list.insertAtEnd(20);
-        assert(list.detectLoop() == false);
-        
-        std::cout << "All advanced operations tests passed!" << std::endl;
-        return 0;
-    }
-    """
-    
-    assert compile_test_program(test_code, "test_adv_ops"), "Failed to compile advanced operations test"
-    stdout, stderr, returncode = run_test_program("test_adv_ops")
-    assert returncode == 0, f"Advanced operations test failed with error: {stderr}"
+    result = test_results["adv_ops"]
+    assert result.built, "Failed to compile advanced operations test"
+    stdout, stderr, returncode = result.stdout, result.stderr, result.returncode
+    assert returncode == 0, f"Advanced operations test failed with error: {failure_message(result)}"
     assert "All advanced operations tests passed!" in stdout, "Advanced operations test did not pass"
 
 # Test edge cases
-def test_edge_cases():
+def test_edge_cases(test_results):
     """
     Test edge cases for linked list operations.
     
@@ -319,43 +714,14 @@ def test_edge_cases():
     - Invalid positions
     - Out-of-bounds operations
     """
-    test_code = """
-    #include <iostream>
-    #include <cassert>
-    #include "src/linked_list.h"
-    
-    int main() {
-        LinkedList list;
-        
-        // Test operations on empty list
-        assert(list.deleteFromBeginning() == false);
-        assert(list.deleteFromEnd() == false);
-        assert(list.deleteFromPosition(0) == false);
-        assert(list.deleteValue(10) == false);
-        assert(list.search(10) == nullptr);
-        assert(list.getMiddleNode() == nullptr);
-        assert(list.detectLoop() == false);
-        
-        // Test operations with invalid positions
-        list.insertAtBeginning(10);
-        assert(list.deleteFromPosition(1) == false);
-        assert(list.deleteFromPosition(-1) == false);
-        
-        list.insertAtPosition(20, 100); // Should handle out-of-bounds position
-        assert(list.getSize() <= 2);
-        
-        std::cout << "All edge cases tests passed!" << std::endl;
-        return 0;
-    }
-    """
-    
-    assert compile_test_program(test_code, "test_edge_cases"), "Failed to compile edge cases test"
-    stdout, stderr, returncode = run_test_program("test_edge_cases")
-    assert returncode == 0, f"Edge cases test failed with error: {stderr}"
+    result = test_results["edge_cases"]
+    assert result.built, "Failed to compile edge cases test"
+    stdout, stderr, returncode = result.stdout, result.stderr, result.returncode
+    assert returncode == 0, f"Edge cases test failed with error: {failure_message(result)}"
     assert "All edge cases tests passed!" in stdout, "Edge cases test did not pass"
 
 # Test performance with large lists
-def test_performance():
+def test_performance(test_results, results_db, record_property):
     """
     Test performance with large lists.
     
@@ -364,56 +730,383 @@ def test_performance():
     - Efficiency of search operations
     - Efficiency of sort operations
     """
-    test_code = """
-    #include <iostream>
-    #include <cassert>
-    #include <chrono>
-    #include "src/linked_list.h"
+    result = test_results["performance"]
+    assert result.built, "Failed to compile performance test"
+    stdout, stderr, returncode = result.stdout, result.stderr, result.returncode
+    assert returncode == 0, f"Performance test failed with error: {failure_message(result)}"
+    assert "All performance tests passed!" in stdout, "Performance test did not pass"
     
-    int main() {
-        LinkedList list;
-        const int SIZE = 1000;
-        
-        // Insert many elements
-        auto start = std::chrono::high_resolution_clock::now();
-        for (int i = 0; i < SIZE; i++) {
-            list.insertAtEnd(i);
-        }
-        auto end = std::chrono::high_resolution_clock::now();
-        auto duration = std::chrono::duration_cast<std::chrono::milliseconds>(end - start).count();
-        
-        std::cout << "Time to insert " << SIZE << " elements: " << duration << "ms" << std::endl;
-        assert(list.getSize() == SIZE);
-        
-        // Search for elements
-        start = std::chrono::high_resolution_clock::now();
-        for (int i = 0; i < SIZE; i += 100) {
-            Node* found = list.search(i);
-            assert(found != nullptr);
-            assert(found->data == i);
-        }
-        end = std::chrono::high_resolution_clock::now();
-        duration = std::chrono::duration_cast<std::chrono::milliseconds>(end - start).count();
-        
-        std::cout << "Time to search for elements: " << duration << "ms" << std::endl;
-        
-        // Sort the list
-        start = std::chrono::high_resolution_clock::now();
-        list.sort();
-        end = std::chrono::high_resolution_clock::now();
-        duration = std::chrono::duration_cast<std::chrono::milliseconds>(end - start).count();
-        
-        std::cout << "Time to sort " << SIZE << " elements: " << duration << "ms" << std::endl;
-        
-        std::cout << "All performance tests passed!" << std::endl;
-        return 0;
-    }
+    record_benchmarks(results_db, parse_timing_lines(stdout, 1000, prefix="performance."), "bench", record_property)
+
+# Test memory management
+def test_memory_management(test_results, record_property):
     """
+    Test that every operation allocates and frees exactly the nodes it should.
     
-    assert compile_test_program(test_code, "test_performance"), "Failed to compile performance test"
-    stdout, stderr, returncode = run_test_program("test_performance")
-    assert returncode == 0, f"Performance test failed with error: {stderr}"
-    assert "All performance tests passed!" in stdout, "Performance test did not pass"
+    This test verifies:
+    - Each insert allocates exactly one node
+    - Each delete frees exactly one node
+    - No nodes are left after clear()
+    - removeDuplicates and deleteValue free the nodes they remove
+    - The destructor frees every node and nothing leaks overall
+    """
+    result = test_results["memory"]
+    assert result.built, "Failed to compile memory test"
+    assert result.returncode == 0, f"Memory test failed with error: {failure_message(result)}"
+    assert "All memory tests passed!" in result.stdout, "Memory test did not pass"
+    
+    reports = parse_alloc_reports(result.stdout)
+    count = 100
+    node_bytes = reports["insertAtEnd"]["bytes"] // max(reports["insertAtEnd"]["allocations"], 1)
+    print(f"Memory per node: {node_bytes} bytes")
+    record_property("node_bytes", node_bytes)
+    
+    for op in ["insertAtBeginning", "insertAtEnd", "insertAtPosition"]:
+        assert reports[op]["allocations"] == count, \
+            f"{op} should allocate exactly one node per call ({reports[op]['allocations']} allocations for {count} calls)"
+        assert reports[op]["live_blocks"] == count, f"{op} freed memory it should keep"
+    
+    for op in ["deleteFromBeginning", "deleteFromEnd", "deleteFromPosition", "deleteValue"]:
+        assert reports[op]["live_blocks"] == -(count // 2), \
+            f"{op} should free exactly one node per call ({-reports[op]['live_blocks']} freed for {count // 2} calls)"
+    
+    assert reports["removeDuplicates"]["live_blocks"] == -count, \
+        f"removeDuplicates should free every duplicate node ({-reports['removeDuplicates']['live_blocks']} of {count} freed)"
+    assert reports["after_clear"]["live_blocks"] == 0, \
+        f"{reports['after_clear']['live_blocks']} blocks still allocated after clear()"
+    assert reports["lifetime"]["live_blocks"] == 0, \
+        f"{reports['lifetime']['live_blocks']} blocks leaked by the destructor"
+
+# Test that no scenario leaks memory
+def test_no_memory_leaks(test_results):
+    """
+    Test that every scenario frees all memory it allocates.
+    
+    Each scenario runs in its own process and ends with an allocation
+    report covering the whole scenario.
+    """
+    leaks = []
+    for scenario in SCENARIOS:
+        result = test_results[scenario.name]
+        if not result.built or result.returncode != 0:
+            continue
+        report = parse_alloc_reports(result.stdout).get(scenario.name)
+        assert report is not None, f"No allocation report for scenario {scenario.name}"
+        if report["live_blocks"] != 0:
+            leaks.append(f"{scenario.name} ({report['live_blocks']} blocks, {report['live_bytes']} bytes)")
+    assert not leaks, f"Memory leaked by: {', '.join(leaks)}"
+
+# Test random operation sequences against a reference model
+def test_differential_random_ops(required_signatures, record_property):
+    """
+    Test long random sequences of operations against a Python model.
+    
+    The implementation is built into a shared library and driven through
+    ctypes, so hundreds of thousands of operations are checked without
+    recompiling. Any difference in a return value, the size or the final
+    contents is shrunk to a minimal sequence of calls that reproduces it.
+    """
+    library, errors = build_library(LINKED_LIST_CPP)
+    assert library is not None, f"Failed to compile differential test library: {errors}"
+    
+    report = run_differential(library)
+    if report["ops_per_second"]:
+        print(f"Checked {report['ops']} operations ({report['ops_per_second']:.0f} ops/s)")
+        record_property("differential_ops_per_second", round(report["ops_per_second"]))
+    
+    failure = report["failure"]
+    assert failure is None, \
+        f"Implementation differs from the expected behaviour: {failure['message']}\n" \
+        f"Minimal reproduction:\n    " + "\n    ".join(failure["steps"])
+
+# Test replaying a large recorded workload
+def test_trace_replay(required_signatures, record_property):
+    """
+    Test a large mixed workload replayed from a binary trace.
+    
+    The workload (insertAtEnd, deleteFromBeginning and search on a list of
+    up to 1000 nodes) is written as a binary trace and replayed by a
+    generic driver, which reports throughput and latency percentiles per
+    operation.
+    """
+    with open(TRACE_REPLAY_CPP, "r") as f:
+        replay_code = f.read()
+    assert compile_test_program(replay_code, TRACE_EXECUTABLE, profile="bench"), \
+        "Failed to compile trace replay driver"
+    
+    trace_path = os.path.join(scratch_dir(TRACE_EXECUTABLE), "workload.trace")
+    workload = generate_workload(trace_path, TRACE_OPS)
+    
+    result = run_test_program(TRACE_EXECUTABLE, [trace_path])
+    assert result.returncode == 0, f"Trace replay failed with error: {failure_message(result)}"
+    report = parse_replay_report(result.stdout)
+    assert report is not None, "Trace replay did not print a report"
+    
+    print(f"Replayed {report['ops']} operations at {report['ops_per_second']:.0f} ops/s")
+    for op, stats in report["opcodes"].items():
+        print(f"{op}: {stats['count']} calls, p50 {stats['p50_ns']}ns, p99 {stats['p99_ns']}ns")
+    record_property("trace_ops_per_second", round(report["ops_per_second"]))
+    
+    assert report["ops"] == workload["ops"], "Trace replay did not run every operation"
+    assert report["final_size"] == workload["final_size"], \
+        f"List holds {report['final_size']} nodes after the workload, expected {workload['final_size']}"
+
+# Test display() on large lists, checking its output as it is printed
+def test_display_streaming(driver, record_property):
+    """
+    Test the order display() prints after building, reversing and sorting
+    a list of a million elements.
+    
+    The output is read through a pipe and compared element by element with
+    the expected sequence, in constant memory, and the program is stopped
+    at the first wrong element.
+    """
+    scenario = DISPLAY_STREAM_SCENARIO
+    executable = driver.executables.get(scenario.profile)
+    assert executable, "Failed to compile test driver"
+    
+    size = DISPLAY_STREAM_SIZE
+    # Any multiplier coprime with the size permutes 0..size-1
+    multiplier = next(m for m in range(7919, 7919 + size + 1) if math.gcd(m, size) == 1)
+    result = check_stream(
+        [executable, "--run", scenario.name, str(size), str(multiplier)],
+        display_sections(size, multiplier),
+        case_limits(scenario, memory_limited(scenario.profile)),
+    )
+    
+    print(f"Checked {result.elements} elements in {result.usage.get('wall_s', 0):.1f}s, "
+          f"holding at most {result.max_buffered} bytes of output")
+    record_property("display_stream", {
+        "size": size, "elements": result.elements, "outcome": result.outcome, "mismatch": result.mismatch,
+    })
+    
+    if result.mismatch is not None:
+        pytest.fail(f"display() printed the wrong output: {result.mismatch['message']}")
+    assert result.outcome == "ok", f"Display test failed with error: {failure_message(result)}"
+
+# Test how each operation scales with the size of the list
+@pytest.mark.benchmark
+def test_complexity_scaling(scaling_report, bench_runner, results_db, record_property):
+    """
+    Test the growth rate of each operation over a range of list sizes.
+    
+    This test runs every operation over a geometric range of sizes, fits
+    the measured times to the common complexity classes and fails if an
+    operation grows faster than expected, e.g. an O(n^2) sort.
+    """
+    assert scaling_report is not None, "Failed to compile benchmark driver"
+    report = scaling_report
+    
+    for op, result in report.items():
+        slope = "n/a" if result["slope"] is None else f"{result['slope']:.2f}"
+        print(f"{op}: inferred O({result['class']}), expected O({result['expected']}), slope {slope}")
+    
+    record_property("complexity", {op: result["class"] for op, result in report.items()})
+    record_benchmarks(results_db, bench_runner.results, "bench", record_property)
+    
+    exceeded = [
+        f"{op} (O({result['class']}), expected O({result['expected']}))"
+        for op, result in report.items() if result["exceeded"]
+    ]
+    assert not exceeded, f"Operations slower than expected: {', '.join(exceeded)}"
+
+# Test the scaling benchmark against the performance budgets
+@pytest.mark.benchmark
+def test_performance_budget(scaling_report, perf_budget, record_property):
+    """
+    Check every operation against its performance budget and record the
+    resulting tier (efficient, acceptable or over-budget).
+    
+    Exceeded budgets are reported but only fail the test when
+    LL_ENFORCE_PERF_BUDGET is set and a hard budget is exceeded; the review
+    pool update decides what an over-budget tier means for admission.
+    """
+    assert scaling_report is not None, "Failed to compile benchmark driver"
+    result = check_budget(perf_budget, scaling_report)
+    
+    for violation in result["violations"]:
+        kind = "Hard" if violation["hard"] else "Soft"
+        print(f"{kind} budget exceeded: {describe_violation(violation)}")
+    print(f"Performance tier: {result['tier']}")
+    record_property("performance", result)
+    
+    if ENFORCE_PERF_BUDGET:
+        hard = [describe_violation(v) for v in result["violations"] if v["hard"]]
+        assert not hard, f"Hard performance budgets exceeded: {'; '.join(hard)}"
+
+# Test how traversals slow down when the nodes are scattered in memory
+@pytest.mark.benchmark
+def test_locality(driver, results_db, record_property):
+    """
+    Compare traversals of a list built on a fresh heap with one built after
+    heap churn, at a size that fits in the L2 cache and one beyond the
+    last-level cache.
+    
+    The slowdown is reported rather than asserted, since it depends on the
+    machine; the test fails only if a measurement could not be taken.
+    """
+    assert driver.executables.get("bench"), "Failed to compile benchmark driver"
+    # Noisy measurements are not rerun, each one builds millions of nodes
+    runner = BenchmarkRunner(
+        driver.executables["bench"], warmup=LOCALITY_WARMUP, repetitions=LOCALITY_REPETITIONS, max_reruns=0
+    )
+    report = run_locality_benchmark(runner)
+    
+    for op, points in report.items():
+        for size, point in points.items():
+            sequential, fragmented = point["sequential"], point["fragmented"]
+            if point["ratio"] is None:
+                print(f"{op} at size {size}: measurement failed")
+            else:
+                print(f"{op} at size {size}: {sequential:.1f}ns/node sequential, "
+                      f"{fragmented:.1f}ns/node fragmented ({point['ratio']:.1f}x)")
+    
+    record_property("locality", report)
+    # Keep the layout in the operation name so both layouts are stored
+    measurements = [
+        dict(result, op=f"locality.{result['layout']}.{result['op']}") for result in runner.results
+    ]
+    record_benchmarks(results_db, measurements, "bench", record_property)
+    
+    failed = [
+        f"{op} at size {size}" for op, points in report.items()
+        for size, point in points.items() if point["ratio"] is None
+    ]
+    assert not failed, f"Locality measurements failed: {', '.join(failed)}"
+
+# Test sort, removeDuplicates and deleteValue on inputs that trip naive implementations
+@pytest.mark.benchmark
+def test_adversarial_inputs(driver, results_db, record_property):
+    """
+    Test that no input pattern is much slower than random input.
+    
+    Each operation is run on sorted, reverse-sorted, all-equal, few-unique,
+    sawtooth and random lists of up to a million elements, and fails if the
+    slowest pattern is more than ADVERSARIAL_MAX_RATIO times slower than
+    random input, or fails or times out where random input does not, e.g. a
+    quicksort pivoting on the head given sorted input. It also fails if
+    random input itself fails or times out before the largest size, e.g. a
+    removeDuplicates that is quadratic on every input.
+    """
+    assert driver.executables.get("bench"), "Failed to compile benchmark driver"
+    runner = BenchmarkRunner(
+        driver.executables["bench"],
+        warmup=ADVERSARIAL_WARMUP,
+        repetitions=ADVERSARIAL_REPETITIONS,
+        max_reruns=0,
+        timeout=ADVERSARIAL_TIMEOUT,
+    )
+    report = run_adversarial_benchmark(runner)
+    
+    for op, entry in report.items():
+        if entry["size"] is None:
+            print(f"{op}: random input failed at every size")
+            continue
+        if entry["failed"]:
+            print(f"{op} at size {entry['size']}: failed or timed out on {', '.join(entry['failed'])} input")
+        else:
+            print(f"{op} at size {entry['size']}: worst input {entry['worst']}, "
+                  f"{entry['ratio']:.1f}x random")
+        if entry["failed_at"] is not None:
+            print(f"{op}: random input failed or timed out at size {entry['failed_at']}")
+    
+    record_property("adversarial", {
+        op: {key: entry[key] for key in ("size", "worst", "ratio", "failed_at", "flagged")}
+        for op, entry in report.items()
+    })
+    # Keep the pattern in the operation name so every pattern is stored
+    measurements = [
+        dict(result, op=f"adversarial.{result['pattern']}.{result['op']}") for result in runner.results
+    ]
+    record_benchmarks(results_db, measurements, "bench", record_property)
+    
+    missing = [op for op, entry in report.items() if entry["size"] is None]
+    assert not missing, f"Could not benchmark random input for: {', '.join(missing)}"
+    flagged = []
+    for op, entry in report.items():
+        if not entry["flagged"]:
+            continue
+        if entry["failed"]:
+            flagged.append(f"{op} ({', '.join(entry['failed'])} input failed or timed out)")
+        elif entry["failed_at"] is not None:
+            flagged.append(f"{op} (random input failed or timed out at size {entry['failed_at']})")
+        else:
+            flagged.append(f"{op} ({entry['worst']} input, {entry['ratio']:.1f}x random)")
+    assert not flagged, f"Operations degrade on adversarial input: {', '.join(flagged)}"
+
+# Test throughput of independent lists on several threads at once
+@pytest.mark.benchmark
+def test_thread_scaling(driver, results_db, record_property):
+    """
+    Run one list per thread doing insert/delete/clear churn on 1 up to the
+    number of CPUs and report the aggregate throughput and parallel
+    efficiency of each thread count.
+    
+    Allocator contention shows up as efficiency falling with the thread
+    count; it depends on the machine, so it is reported, not asserted. The
+    test fails if a run fails or a thread's list loses nodes.
+    """
+    assert driver.executables.get("bench-nohooks"), "Failed to compile benchmark driver"
+    report = run_thread_scaling(driver.executables["bench-nohooks"])
+    
+    for point in report["curve"]:
+        efficiency = "n/a" if point["efficiency"] is None else f"{point['efficiency']:.0%}"
+        print(f"{point['threads']} threads: {point['throughput'] / 1e6:.1f}M ops/s, "
+              f"parallel efficiency {efficiency}")
+    
+    record_property("thread_scaling", {key: report[key] for key in ("size", "ops_per_thread", "cpus", "curve")})
+    measurements = [
+        dict(measurement, op=f"threads.{measurement['threads']}.churn") for measurement in report["measurements"]
+    ]
+    record_benchmarks(results_db, measurements, "bench-nohooks", record_property)
+    
+    assert not report["failed"], \
+        f"Thread scaling runs failed for {', '.join(str(t) for t in report['failed'])} threads"
+
+# Test detectLoop and getMiddleNode on large lists with injected cycles
+@pytest.mark.benchmark
+def test_cycle_detection(driver, results_db, record_property):
+    """
+    Test detectLoop on lists of up to ten million nodes with a cycle back to
+    the head, the middle or the tail and without one, and getMiddleNode on
+    the acyclic list.
+    
+    Fails if a call gives a wrong answer, fails or times out (an
+    implementation that never leaves the cycle), or allocates more heap
+    memory at the largest size than at the smallest one beyond
+    CYCLES_AUX_SLACK bytes, e.g. a hash set of visited nodes instead of
+    Floyd's two pointers.
+    """
+    assert driver.executables.get("bench"), "Failed to compile benchmark driver"
+    runner = BenchmarkRunner(
+        driver.executables["bench"],
+        warmup=CYCLES_WARMUP,
+        repetitions=CYCLES_REPETITIONS,
+        max_reruns=0,
+        timeout=CYCLES_TIMEOUT,
+    )
+    report = run_cycles_benchmark(runner)
+    
+    for name, entry in report.items():
+        for size, point in entry["points"].items():
+            print(f"{name} at size {size}: {point['ns'] / 1e6:.2f}ms per call, "
+                  f"{point['ns_per_node']:.2f}ns per node, {point['aux_bytes']} auxiliary bytes")
+        if entry["failed_at"] is not None:
+            print(f"{name} failed or timed out at size {entry['failed_at']}")
+    
+    record_property("cycles", report)
+    # Keep the cycle in the operation name so every case is stored
+    measurements = [
+        dict(result, op=f"cycles.{result['cycle']}.{result['op']}") for result in runner.results
+    ]
+    record_benchmarks(results_db, measurements, "bench", record_property)
+    
+    failed = [f"{name} at size {entry['failed_at']}" for name, entry in report.items()
+              if entry["failed_at"] is not None]
+    assert not failed, f"Wrong answer, failure or timeout: {', '.join(failed)}"
+    growing = [name for name, entry in report.items() if entry["aux_growth"]]
+    assert not growing, \
+        f"Auxiliary memory grows with the list (over {CYCLES_AUX_SLACK} bytes): {', '.join(growing)}"
 
 # Clean up after tests
 def test_cleanup():
@@ -422,13 +1115,5 @@ def test_cleanup():
     
     This should be run after all other tests to remove temporary files.
     """
-    # Remove temporary files
-    for file in ["temp_test.cpp", TEST_EXECUTABLE, "test_basic_ops", "test_adv_ops", "test_edge_cases", "test_performance"]:
-        if os.path.exists(file):
-            os.remove(file)
-    
-    # On Windows, also remove .exe files
-    if platform.system() == "Windows":
-        for file in [f"{TEST_EXECUTABLE}.exe", "test_basic_ops.exe", "test_adv_ops.exe", "test_edge_cases.exe", "test_performance.exe"]:
-            if os.path.exists(file):
-                os.remove(file)
+    # Every test program is built in a per-process scratch directory
+    cleanup_scratch()
@@ -0,0 +1,35 @@
+"""
+Tests of the benchmark runner (tests/harness/bench.py).
+"""
+
+import sys
+
+import pytest
+
+from harness.bench import BenchmarkRunner
+
+pytestmark = [pytest.mark.unit, pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script")]
+
+
+def fake_case(tmp_path, stdout):
+    """Return a runner of an executable that prints stdout and exits"""
+    path = tmp_path / "bench"
+    path.write_text(f"#!/bin/sh\ncat <<'EOF'\n{stdout}\nEOF\n")
+    path.chmod(0o755)
+    return BenchmarkRunner(str(path), warmup=0, repetitions=3, cpu=None, max_reruns=0)
+
+
+def test_output_is_the_last_json_line(tmp_path):
+    runner = fake_case(tmp_path, 'Building list\n{"samples_ns": [3, 1, 2]}')
+
+    assert runner.run_trials("bench", ["sort", 10]) == {"samples_ns": [3, 1, 2]}
+    assert runner.measure("sort", 10)["stats"]["median"] == 2
+
+
+@pytest.mark.parametrize("stdout", ["", "Segmentation fault avoided", '{"samples_ns": [1, 2', "[1, 2, 3]",
+                                    '{"samples_ns": [1]}\nDestructor called'])
+def test_missing_or_invalid_output_is_a_failed_run(tmp_path, stdout):
+    runner = fake_case(tmp_path, stdout)
+
+    assert runner.run_trials("bench", ["sort", 10]) is None
+    assert runner.measure("sort", 10) is None
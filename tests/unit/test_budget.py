@@ -0,0 +1,110 @@
+"""
+Tests of the performance budget check (tests/harness/budget.py).
+"""
+
+import json
+
+import pytest
+
+from harness.bench import geometric_sizes
+from harness.budget import PERF_BUDGET, TIERS, check_budget, describe_violation, load_budget
+from harness.complexity import fit_complexity
+
+pytestmark = pytest.mark.unit
+
+SIZES = geometric_sizes(100, 10 ** 6)
+
+BUDGET = {
+    "operations": {
+        "search": {"max_ns": {"1000000": 50000000}, "hard": False},
+        "sort": {"max_ns": {"1000000": 1000000000}, "hard": True},
+    },
+}
+
+
+def sweep_result(expected, per_call, stopped_at=None):
+    """A scaling benchmark result of times per_call(n), as sweep() returns it"""
+    points = [[n, per_call(n)] for n in SIZES if stopped_at is None or n < stopped_at]
+    fit = fit_complexity(points)
+    return {"points": points, "stopped_at": stopped_at, "expected": expected, **fit}
+
+
+def linear(n):
+    # 2ns per node in cache, 20ns per node once the list leaves it
+    return n * (2.0 if n < 10 ** 5 else 20.0)
+
+
+def n_log_n(n):
+    return 30.0 * n * (n.bit_length())
+
+
+def quadratic(n):
+    return 0.5 * n * n
+
+
+@pytest.mark.parametrize("report, tier", [
+    ({"search": sweep_result("n", linear), "sort": sweep_result("n log n", n_log_n)}, "efficient"),
+    # A soft time budget exceeded
+    ({"search": sweep_result("n", lambda n: 3 * linear(n)), "sort": sweep_result("n log n", n_log_n)}, "acceptable"),
+    # A soft class budget exceeded
+    ({"search": sweep_result("n", quadratic, stopped_at=10 ** 5), "sort": sweep_result("n log n", n_log_n)},
+     "acceptable"),
+    # A hard class budget exceeded, and the hard time budget not reached
+    ({"search": sweep_result("n", linear), "sort": sweep_result("n log n", quadratic, stopped_at=10 ** 5)},
+     "over-budget"),
+])
+def test_tiers(report, tier):
+    result = check_budget(BUDGET, report)
+
+    assert result["tier"] == tier
+    assert result["tier"] in TIERS
+    assert (tier == "efficient") == (result["violations"] == [])
+
+
+def test_violations():
+    report = {
+        "search": sweep_result("n", lambda n: 3 * linear(n)),
+        "sort": sweep_result("n log n", quadratic, stopped_at=10 ** 5),
+    }
+
+    violations = check_budget(BUDGET, report)["violations"]
+
+    assert violations == [
+        {"op": "search", "kind": "time", "hard": False, "limit": 50000000.0, "actual": 60000000.0, "size": 10 ** 6},
+        {"op": "sort", "kind": "class", "hard": True, "limit": "n log n", "actual": "n^2", "size": None},
+        {"op": "sort", "kind": "incomplete", "hard": True, "limit": 1000000000.0, "actual": None, "size": 10 ** 6},
+    ]
+    assert [describe_violation(v) for v in violations] == [
+        "search takes 60000000ns at size 1000000, budget 50000000ns",
+        "sort is O(n^2), budget O(n log n)",
+        "sort did not complete at size 1000000",
+    ]
+
+
+def test_operations_without_a_budget_are_only_measured():
+    report = {"reverse": sweep_result("1", linear)}
+
+    result = check_budget(BUDGET, report)
+
+    assert result["tier"] == "efficient"
+    assert result["metrics"] == {"reverse": {"class": "n", "size": 10 ** 6, "ns": linear(10 ** 6)}}
+
+
+def test_linear_search_with_a_cache_step_is_efficient_under_the_shipped_budget():
+    budget = load_budget(PERF_BUDGET)
+    report = {"search": sweep_result("n", linear), "sort": sweep_result("n log n", n_log_n)}
+
+    assert check_budget(budget, report)["tier"] == "efficient"
+
+
+@pytest.mark.parametrize("operations", [
+    {"sort": {"max_class": "n log n"}},
+    {"sort": {"max_ns": {"1000": 0}}},
+    {"sort": {"max_ns": {"-5": 100}}},
+])
+def test_invalid_budgets_are_rejected(tmp_path, operations):
+    path = tmp_path / "budget.json"
+    path.write_text(json.dumps({"operations": operations}))
+
+    with pytest.raises(ValueError):
+        load_budget(str(path))
@@ -0,0 +1,86 @@
+"""
+Tests of the complexity inference (tests/harness/complexity.py) on synthetic
+size sweeps.
+"""
+
+import math
+
+import pytest
+
+from harness.bench import geometric_sizes
+from harness.complexity import COMPLEXITY_CLASSES, exceeds, fit_complexity
+
+pytestmark = pytest.mark.unit
+
+SIZES = geometric_sizes(100, 10 ** 6)
+
+
+def sweep(f, step=1.0, step_at=None, sizes=SIZES):
+    """Times of f(n), multiplied by step from size step_at on"""
+    return [(n, f(n) * (step if step_at is not None and n >= step_at else 1.0)) for n in sizes]
+
+
+@pytest.mark.parametrize("name, inferred", [
+    ("1", "1"),
+    # A log factor is within the margin, so the slower class is inferred
+    ("log n", "1"),
+    ("n", "n"),
+    ("n log n", "n"),
+    ("n^2", "n^2"),
+    ("n^3", "n^3"),
+])
+def test_exact_classes(name, inferred):
+    fit = fit_complexity(sweep(COMPLEXITY_CLASSES[name]))
+
+    assert fit["class"] == inferred
+    assert not exceeds(fit["class"], name)
+
+
+@pytest.mark.parametrize("step", [4.0, 8.0, 12.0, 20.0])
+@pytest.mark.parametrize("step_at", [10 ** 4, 10 ** 5])
+def test_linear_with_a_cache_step_is_linear(step, step_at):
+    # Each node visited costs step times more once the list leaves the cache
+    fit = fit_complexity(sweep(lambda n: 2.0 * n, step, step_at))
+
+    assert fit["class"] == "n"
+    assert not exceeds(fit["class"], "n")
+
+
+def test_linear_with_a_gradual_cache_slowdown_is_linear():
+    # Per-node cost rising 10x from 10^4 to 10^6, as L2, L3 and memory are outgrown
+    points = [(n, n * min(max(1.0, (n / 10 ** 4) ** 0.5), 10.0)) for n in SIZES]
+
+    assert fit_complexity(points)["class"] == "n"
+
+
+def test_quadratic_with_a_cache_step_is_quadratic():
+    # A quadratic sort stopped early by the timeout
+    points = sweep(lambda n: float(n) ** 2, 10.0, 10 ** 4, SIZES[:6])
+
+    fit = fit_complexity(points)
+    assert fit["class"] == "n^2"
+    assert exceeds(fit["class"], "n log n")
+
+
+def test_constant_is_not_linear_with_noise():
+    points = [(n, 80.0 * (1.2 if i % 2 else 0.9)) for i, n in enumerate(SIZES)]
+
+    assert fit_complexity(points)["class"] == "1"
+
+
+def test_linear_is_not_constant():
+    fit = fit_complexity(sweep(lambda n: 0.5 * n))
+
+    assert exceeds(fit["class"], "1")
+
+
+def test_too_few_points():
+    assert fit_complexity([(100, 1.0), (1000, 10.0)])["class"] is None
+    assert fit_complexity([(100, 1.0), (1000, 0.0), (1, 5.0), (10000, 100.0)])["class"] is None
+
+
+def test_slope_is_reported():
+    fit = fit_complexity(sweep(lambda n: float(n) ** 2))
+
+    assert math.isclose(fit["slope"], 2.0)
+    assert math.isclose(fit["class_slopes"]["n"], 1.0)
@@ -0,0 +1,181 @@
+"""
+Tests of the results cache keys (tests/harness/results_cache.py).
+"""
+
+import importlib.util
+import os
+import textwrap
+
+import pytest
+
+from harness import results_cache
+from harness.results_cache import (UNKEYED_VARIABLES, base_key, key_for_test, settings, source_key,
+                                   submission_key)
+
+pytestmark = pytest.mark.unit
+
+TEST_MODULE = '''
+import pytest
+
+SIZE = 10
+LIMIT = 5
+UNUSED = 1
+
+
+def helper():
+    return SIZE * 2
+
+
+@pytest.fixture
+def data():
+    return [LIMIT]
+
+
+def test_uses_helper():
+    assert helper() == 20
+
+
+def test_uses_fixture(data):
+    assert data
+'''
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    """A student checkout and a tests directory with its own harness"""
+    student = tmp_path / "student"
+    tests = tmp_path / "tests"
+    write(str(student / "src" / "linked_list.cpp"), "int size() { return 0; }\n")
+    write(str(student / "src" / "linked_list.h"), "int size();\n")
+    write(str(tests / "conftest.py"), "")
+    write(str(tests / "perf_budget.json"), "{}")
+    write(str(tests / "test_linked_list.py"), "def test_a():\n    pass\n")
+    for name in ("driver.py", "alloc_hooks.cpp", "alloc_hooks.h", "notes.txt"):
+        write(str(tests / "harness" / name), "")
+
+    monkeypatch.setattr(results_cache, "TESTS_DIR", str(tests))
+    monkeypatch.setattr(results_cache, "HARNESS_DIR", str(tests / "harness"))
+    monkeypatch.setattr(results_cache, "toolchain_version", lambda: "g++ 1.0")
+    for name in list(os.environ):
+        if name.startswith("LL_"):
+            monkeypatch.delenv(name)
+    return student, tests
+
+
+@pytest.mark.parametrize("path", ["src/linked_list.cpp", "src/linked_list.h", "src/extra/node.cpp"])
+def test_source_changes_change_every_key(tree, path):
+    student, _ = tree
+    before = (source_key(str(student)), base_key(str(student)), submission_key(str(student)))
+
+    write(str(student / path), "// edited\n")
+
+    after = (source_key(str(student)), base_key(str(student)), submission_key(str(student)))
+    assert all(a != b for a, b in zip(before, after))
+
+
+@pytest.mark.parametrize("path, changes", [
+    ("harness/alloc_hooks.cpp", True),
+    ("harness/alloc_hooks.h", True),
+    ("harness/driver.py", True),
+    ("harness/trace_replay.cpp", True),
+    ("conftest.py", True),
+    ("perf_budget.json", True),
+    ("harness/notes.txt", False),
+    ("harness/__pycache__/driver.cpython-310.pyc", False),
+    ("README.md", False),
+])
+def test_harness_changes_change_the_base_key(tree, path, changes):
+    student, tests = tree
+    before = base_key(str(student))
+
+    write(str(tests / path), "// edited\n")
+
+    assert (base_key(str(student)) != before) == changes
+
+
+def test_test_modules_change_only_the_submission_key(tree):
+    student, tests = tree
+    base, submission = base_key(str(student)), submission_key(str(student))
+
+    write(str(tests / "test_linked_list.py"), "def test_a():\n    assert True\n")
+
+    assert base_key(str(student)) == base
+    assert submission_key(str(student)) != submission
+
+
+@pytest.mark.parametrize("name", ["LL_SANITIZE", "LL_BENCH_SIZES", "LL_EXPECTED_COMPLEXITY", "LL_NEW_SETTING"])
+def test_keyed_variables_change_the_key(tree, monkeypatch, name):
+    student, _ = tree
+    before = base_key(str(student))
+
+    monkeypatch.setenv(name, "1")
+
+    assert base_key(str(student)) != before
+
+
+@pytest.mark.parametrize("name", sorted(UNKEYED_VARIABLES))
+def test_unkeyed_variables_leave_the_key_unchanged(tree, monkeypatch, name):
+    student, _ = tree
+    before = base_key(str(student))
+
+    monkeypatch.setenv(name, "1")
+
+    assert base_key(str(student)) == before
+
+
+def test_budget_file_contents_are_keyed(tmp_path):
+    budget = tmp_path / "budget.json"
+    budget.write_text('{"search": {"class": "n"}}')
+    environ = {"LL_PERF_BUDGET": str(budget)}
+    before = settings(environ)
+
+    budget.write_text('{"search": {"class": "n log n"}}')
+
+    assert settings(environ) != before
+    assert settings({"LL_PERF_BUDGET": str(tmp_path / "missing.json")}) != before
+
+
+@pytest.fixture
+def test_module(tmp_path):
+    """A test module imported from a file, so its sources can be read"""
+    path = tmp_path / "test_synthetic.py"
+    path.write_text(textwrap.dedent(TEST_MODULE))
+    spec = importlib.util.spec_from_file_location("test_synthetic", str(path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_test_key_covers_the_names_it_references(test_module):
+    def key():
+        return key_for_test(test_module.test_uses_helper, "base")
+
+    before = key()
+    assert key_for_test(test_module.test_uses_helper, "other base") != before
+
+    test_module.UNUSED = 2
+    test_module.LIMIT = 6
+    assert key() == before
+
+    # SIZE is only referenced through helper()
+    test_module.SIZE = 11
+    assert key() != before
+
+
+def test_test_key_covers_its_fixtures(test_module):
+    def key():
+        return key_for_test(test_module.test_uses_fixture, "base", argnames=("data",))
+
+    before = key()
+
+    test_module.SIZE = 11
+    assert key() == before
+
+    test_module.LIMIT = 6
+    assert key() != before
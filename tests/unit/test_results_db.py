@@ -0,0 +1,75 @@
+"""
+Tests of the regression detection of the benchmark database
+(tests/harness/results_db.py).
+"""
+
+import pytest
+
+from harness.results_db import ResultsDB, is_regression
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = ResultsDB(str(tmp_path / "benchmarks.sqlite"))
+    yield db
+    db.close()
+
+
+def record(db, source, median, mad=0.0, branch="dev-alice", recorded_at=1.0):
+    measurement = {"op": "sort", "size": 1000, "stats": {"median": median, "mad": mad, "n": 5}}
+    return db.record([measurement], "bench", branch=branch, source=source, recorded_at=recorded_at)
+
+
+@pytest.mark.parametrize("median, mad, flagged", [
+    (200.0, 1.0, True),
+    # Not 1.5 times slower
+    (149.0, 1.0, False),
+    # Slower, but by less than 3 MADs
+    (200.0, 40.0, False),
+    (200.0, 30.0, True),
+])
+def test_is_regression(median, mad, flagged):
+    best = {"median_ns": 100.0, "mad_ns": 1.0}
+
+    assert is_regression({"median_ns": median, "mad_ns": mad}, best, factor=1.5, noise_mads=3.0) == flagged
+
+
+def test_result_below_the_resolution_is_never_a_regression():
+    assert not is_regression({"median_ns": 100.0, "mad_ns": 0.0}, {"median_ns": 0.0, "mad_ns": 0.0})
+
+
+def test_slower_submission_is_flagged(db):
+    assert record(db, "first", 100.0) == []
+    assert record(db, "second", 120.0, recorded_at=2.0) == []
+
+    regressions = record(db, "third", 200.0, recorded_at=3.0)
+
+    assert regressions == [{"op": "sort", "size": 1000, "profile": "bench", "median_ns": 200.0, "best_ns": 100.0,
+                            "ratio": 2.0}]
+    assert [row["source_hash"] for row in db.regressions("dev-alice")] == ["third"]
+
+
+def test_slowdown_within_the_noise_is_not_flagged(db):
+    record(db, "first", 100.0, mad=5.0)
+
+    assert record(db, "second", 200.0, mad=40.0, recorded_at=2.0) == []
+    assert db.regressions() == []
+
+
+def test_resubmission_is_not_compared_with_itself(db):
+    record(db, "first", 100.0)
+
+    # A slower rerun of the same sources replaces the earlier result
+    assert record(db, "first", 200.0, recorded_at=2.0) == []
+    assert [row["median_ns"] for row in db.history("dev-alice")] == [200.0]
+
+    # and is then the best a new submission is compared with
+    assert record(db, "second", 250.0, recorded_at=3.0) == []
+
+
+def test_other_branches_are_not_compared(db):
+    record(db, "first", 100.0, branch="dev-bob")
+
+    assert record(db, "second", 200.0, recorded_at=2.0) == []
@@ -0,0 +1,87 @@
+"""
+Tests of the binary operation traces (tests/harness/trace.py).
+"""
+
+import pytest
+
+from harness import trace
+from harness.trace import HEADER, OPCODES, RECORD, TraceWriter, generate_workload, read_trace
+
+pytestmark = pytest.mark.unit
+
+RECORDS = [(OPCODES["insertAtEnd"], 7), (OPCODES["search"], -3), (OPCODES["deleteFromBeginning"], 0)]
+
+
+@pytest.fixture
+def trace_path(tmp_path):
+    return str(tmp_path / "workload.trace")
+
+
+def write_trace(path, records):
+    with TraceWriter(path) as writer:
+        for opcode, operand in records:
+            writer.write(opcode, operand)
+
+
+def test_records_are_read_back(trace_path):
+    write_trace(trace_path, RECORDS)
+
+    assert list(read_trace(trace_path)) == RECORDS
+    with open(trace_path, "rb") as f:
+        assert len(f.read()) == HEADER.size + len(RECORDS) * RECORD.size
+
+
+def test_records_written_across_chunks_are_read_back(trace_path, monkeypatch):
+    monkeypatch.setattr(trace, "CHUNK_RECORDS", 4)
+    records = [(i % len(OPCODES), i - 5) for i in range(11)]
+
+    with TraceWriter(trace_path) as writer:
+        writer.write(*records[0])
+        writer.write_records([value for record in records[1:] for value in record])
+
+    assert list(read_trace(trace_path)) == records
+
+
+def test_empty_trace(trace_path):
+    write_trace(trace_path, [])
+
+    assert list(read_trace(trace_path)) == []
+
+
+def test_generated_workload_stays_within_its_size(trace_path):
+    result = generate_workload(trace_path, 5000, max_size=10, seed=3)
+
+    size = 0
+    for opcode, operand in read_trace(trace_path):
+        size += {OPCODES["insertAtEnd"]: 1, OPCODES["deleteFromBeginning"]: -1}.get(opcode, 0)
+        assert 0 <= size <= 10
+        assert 0 <= operand < 20
+    assert result == {"ops": 5000, "final_size": size}
+
+
+# Bytes cut from the end: part of a record, a record, all records and part
+# of the header
+@pytest.mark.parametrize("cut", [RECORD.size // 2, RECORD.size, len(RECORDS) * RECORD.size,
+                                 len(RECORDS) * RECORD.size + 4])
+def test_truncated_trace_is_rejected(trace_path, cut):
+    write_trace(trace_path, RECORDS)
+    with open(trace_path, "rb") as f:
+        data = f.read()
+    with open(trace_path, "wb") as f:
+        f.write(data[:-cut])
+
+    with pytest.raises(ValueError, match="truncated"):
+        list(read_trace(trace_path))
+
+
+@pytest.mark.parametrize("header", [
+    HEADER.pack(b"LLTX", trace.TRACE_VERSION, RECORD.size, 0),
+    HEADER.pack(trace.TRACE_MAGIC, trace.TRACE_VERSION + 1, RECORD.size, 0),
+    HEADER.pack(trace.TRACE_MAGIC, trace.TRACE_VERSION, RECORD.size * 2, 0),
+])
+def test_other_files_are_rejected(trace_path, header):
+    with open(trace_path, "wb") as f:
+        f.write(header)
+
+    with pytest.raises(ValueError, match="not a version"):
+        list(read_trace(trace_path))